@@ -8,6 +8,7 @@ import os
 import json
 from config import config
 from services.file_service import FileService
+from models.database.database import init_database
 from controllers.main_controller import main_bp
 from controllers.upload_controller import upload_bp
 from controllers.data_controller import processing_bp
@@ -26,7 +27,10 @@ def create_app(config_name='default'):
     app.config.from_object(config[config_name])
     
     # Upload klasörünü oluştur
-    FileService.ensure_directory('storage/uploads')
+    FileService.ensure_directory(app.config['UPLOAD_FOLDER'])
+    
+    # Eksik tabloları oluştur (mevcut tablolara dokunulmaz)
+    init_database()
     
     # Template ve static klasörlerini güncelle
     app.template_folder = '../views/templates'
@@ -0,0 +1,72 @@
+"""
+CategoryEncoder ile kolon başına LabelEncoder karşılaştırması
+
+Fit + transform süresini ve joblib ile kaydetme/yükleme süresini ve dosya
+boyutunu ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_category_encoder --rows 1000000 --cols 10 --cardinality 500
+"""
+import argparse
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from utils.preprocessing import CategoryEncoder
+
+def create_frame(rows, cols, cardinality, seed=42):
+    rng = np.random.default_rng(seed)
+    labels = np.array([f'kategori_{i:06d}' for i in range(cardinality)], dtype=object)
+    return pd.DataFrame({f'kolon_{j}': labels[rng.integers(0, cardinality, rows)] for j in range(cols)})
+
+def fit_label_encoders(df):
+    encoders = {}
+    for col in df.columns:
+        encoder = LabelEncoder()
+        encoder.fit_transform(df[col])
+        encoders[col] = encoder
+    return encoders
+
+def fit_category_encoder(df):
+    encoder = CategoryEncoder(max_label_categories=10 ** 9)
+    encoder.fit_transform(df, list(df.columns))
+    return encoder
+
+def measure(name, fit, df, repeats):
+    start = time.perf_counter()
+    obj = fit(df)
+    fit_time = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), f'{name}.pkl')
+    start = time.perf_counter()
+    for _ in range(repeats):
+        joblib.dump(obj, path)
+    save_time = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        joblib.load(path)
+    load_time = (time.perf_counter() - start) / repeats
+    size_kb = os.path.getsize(path) / 1024
+    os.remove(path)
+    print(f'{name:<16} {fit_time:>8.2f} {save_time * 1000:>10.2f} {load_time * 1000:>10.2f} {size_kb:>10.0f}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--cardinality', type=int, default=500)
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    df = create_frame(args.rows, args.cols, args.cardinality)
+    print(f'{args.rows} satır, {args.cols} kolon, kolon başına {args.cardinality} kategori')
+    print(f'{"encoder":<16} {"fit s":>8} {"kaydet ms":>10} {"yükle ms":>10} {"boyut KB":>10}')
+    measure('LabelEncoder', fit_label_encoders, df, args.repeats)
+    measure('CategoryEncoder', fit_category_encoder, df, args.repeats)
+
+if __name__ == '__main__':
+    main()
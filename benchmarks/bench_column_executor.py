@@ -0,0 +1,118 @@
+"""
+Kolon bazlı ön işleme adımlarının seri ve paralel (thread/process) karşılaştırması
+
+Geniş bir CSV dosyası (varsayılan 300 kolon) üretilir ve okunur; eksik veri
+doldurma, IQR kırpma, kategori kodlama ve kolon tipi tespiti her modda ölçülür.
+Paralel sonuçların seri sonuçlarla birebir aynı olduğu da kontrol edilir.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_column_executor --rows 100000 --cols 300
+    python -m benchmarks.bench_column_executor --workers 4 --backends thread process
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from config import Config
+from services.analysis_service import AnalysisService
+from utils.data_utils import handle_missing_data, handle_outliers, read_file_by_extension
+from utils.ml_utils import encoding_data
+from utils.parallel_utils import ColumnPartitionExecutor
+import utils.preprocessing as preprocessing
+import utils.sketch_utils as sketch_utils
+
+def create_csv(path, rows, cols, categorical_ratio, seed=42):
+    rng = np.random.default_rng(seed)
+    n_categorical = int(cols * categorical_ratio)
+    data = {}
+    for j in range(cols - n_categorical):
+        values = rng.standard_normal(rows) * (j + 1)
+        values[rng.random(rows) < 0.05] = np.nan
+        data[f'sayisal_{j}'] = values
+    labels = np.array([f'kategori_{i:04d}' for i in range(200)], dtype=object)
+    for j in range(n_categorical):
+        values = labels[rng.integers(0, 200, rows)]
+        values[rng.random(rows) < 0.05] = None
+        data[f'kategorik_{j}'] = values
+    pd.DataFrame(data).to_csv(path, index=False)
+
+def run_steps(df):
+    """Adım süreleri ve karşılaştırma için çıktılar"""
+    timings, outputs = {}, {}
+
+    start = time.perf_counter()
+    filled, imputer = handle_missing_data(df, method='median', return_imputer=True)
+    timings['doldurma'] = time.perf_counter() - start
+    outputs['doldurma'] = imputer.fill_values
+
+    start = time.perf_counter()
+    clipped, clipper = handle_outliers(filled, return_clipper=True)
+    timings['kırpma'] = time.perf_counter() - start
+    outputs['kırpma'] = (clipper.lower, clipper.upper)
+
+    start = time.perf_counter()
+    encoded, encoder = encoding_data(clipped)
+    timings['kodlama'] = time.perf_counter() - start
+    outputs['kodlama'] = encoded
+
+    start = time.perf_counter()
+    outputs['tip tespiti'] = AnalysisService.determine_column_types(df)
+    timings['tip tespiti'] = time.perf_counter() - start
+    return timings, outputs
+
+def same_outputs(left, right):
+    for name in left:
+        a, b = left[name], right[name]
+        if isinstance(a, pd.DataFrame):
+            if not a.equals(b):
+                return False
+        elif isinstance(a, tuple):
+            if not all(x.equals(y) for x, y in zip(a, b)):
+                return False
+        elif a != b:
+            return False
+    return True
+
+def use_executor(executor):
+    # Modüllerin kullandığı ortak executor ölçüm süresince değiştirilir
+    preprocessing.column_executor = executor
+    sketch_utils.column_executor = executor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=300)
+    parser.add_argument('--categorical-ratio', type=float, default=0.3)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backends', nargs='+', default=['thread', 'process'])
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'genis.csv')
+    create_csv(path, args.rows, args.cols, args.categorical_ratio)
+    df = read_file_by_extension(path, 'genis.csv')
+    os.remove(path)
+    print(f'{args.rows} satır, {args.cols} kolon, {args.workers} worker '
+          f'(CPU: {os.cpu_count()}, eşik: {Config.COLUMN_PARALLEL_MIN_COLUMNS} kolon)')
+
+    use_executor(ColumnPartitionExecutor(workers=1))
+    serial_timings, serial_outputs = run_steps(df)
+    results = [('seri', serial_timings, True)]
+    for backend in args.backends:
+        executor = ColumnPartitionExecutor(workers=args.workers, backend=backend, min_columns=2)
+        use_executor(executor)
+        run_steps(df.head(1000))   # havuz ısınması
+        timings, outputs = run_steps(df)
+        executor.shutdown()
+        results.append((backend, timings, same_outputs(serial_outputs, outputs)))
+
+    steps = list(serial_timings)
+    print(f'{"mod":<10}' + ''.join(f'{step:>13}' for step in steps) + f'{"toplam":>10} {"aynı":>6}')
+    for name, timings, identical in results:
+        print(f'{name:<10}' + ''.join(f'{timings[step]:>13.3f}' for step in steps)
+              + f'{sum(timings.values()):>10.3f} {"evet" if identical else "HAYIR":>6}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Excel okuma yollarının karşılaştırması
+
+Mevcut yol (pd.read_excel) ile read-only akış + kolonsal önbellek yolunu
+100k satırlık bir çalışma kitabı üzerinde ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_excel_ingest --rows 100000 --repeats 3
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import openpyxl
+import pandas as pd
+from utils.columnar_utils import convert_to_columnar, read_dataset
+from utils.data_utils import read_excel_streaming
+
+def create_workbook(path, rows, seed=42):
+    """Satış verisine benzeyen tek sayfalık bir çalışma kitabı üretir"""
+    rng = np.random.default_rng(seed)
+    cities = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya']
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Satislar')
+    worksheet.append(['tarih_gun', 'sehir', 'urun_id', 'adet', 'fiyat', 'indirim', 'ciro'])
+    for i in range(rows):
+        adet = int(rng.integers(1, 50))
+        fiyat = float(round(rng.uniform(10, 500), 2))
+        indirim = float(round(rng.uniform(0, 0.3), 2))
+        worksheet.append([i % 365, cities[i % len(cities)], int(rng.integers(1, 2000)),
+                          adet, fiyat, indirim, round(adet * fiyat * (1 - indirim), 2)])
+    workbook.save(path)
+
+def timed(func, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    return min(durations), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.xlsx')
+        create_workbook(path, args.rows)
+        filename = os.path.basename(path)
+
+        baseline, df_baseline = timed(lambda: pd.read_excel(path), args.repeats)
+        streaming, df_streaming = timed(lambda: read_excel_streaming(path, filename), args.repeats)
+        conversion, _ = timed(lambda: convert_to_columnar(path, filename), 1)
+        cached, df_cached = timed(lambda: read_dataset(path, filename), args.repeats)
+        projected, _ = timed(lambda: read_dataset(path, filename, columns=['sehir', 'ciro']), args.repeats)
+
+        assert df_baseline.shape == df_streaming.shape == df_cached.shape
+
+        print(f"Satır sayısı: {args.rows}  (en iyi {args.repeats} ölçüm)")
+        print(f"{'pd.read_excel (mevcut yol)':<40}{baseline:>10.3f} s")
+        print(f"{'read-only akış okuma':<40}{streaming:>10.3f} s")
+        print(f"{'tek seferlik Parquet dönüştürme':<40}{conversion:>10.3f} s")
+        print(f"{'kolonsal önbellekten okuma':<40}{cached:>10.3f} s")
+        print(f"{'kolonsal önbellek, 2 kolon':<40}{projected:>10.3f} s")
+        print(f"Tekrar açılışta hızlanma: {baseline / cached:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Memmap eğitim matrislerinin CV worker belleğine etkisi
+
+Aynı GridSearchCV'yi bellekteki dizilerle ve MatrixStore memmap'leriyle
+farklı n_jobs değerlerinde çalıştırır; ana süreç ve worker'ların tepe RSS
+değerlerini raporlar. Her ölçüm ayrı bir alt süreçte yapılır.
+RSS paylaşılan dosya sayfalarını her süreçte ayrıca saydığı için "toplam"
+sütunu memmap modunda gerçek kullanımın üst sınırıdır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_memmap_cv --rows 300000 --cols 30 --jobs 1 2 4
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from joblib.externals.loky import get_reusable_executor
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import GridSearchCV
+from utils.memmap_utils import MatrixStore
+
+def run_once(rows, cols, n_jobs, use_memmap):
+    """Tek bir ölçüm; sonuç JSON olarak stdout'a yazılır"""
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal((rows, cols))
+    y = x @ rng.standard_normal(cols) + rng.standard_normal(rows)
+
+    store = None
+    if use_memmap:
+        store = MatrixStore(tempfile.mkdtemp(), dtype='float64')
+        x, y = store.put('X_train', x), store.put('y_train', y)
+
+    start = time.perf_counter()
+    grid_search = GridSearchCV(Ridge(), {'alpha': [0.1, 1.0, 10.0, 100.0]},
+                               cv=3, scoring='r2', n_jobs=n_jobs)
+    grid_search.fit(x, y)
+    elapsed = time.perf_counter() - start
+
+    # Worker'lar kapanmadan RUSAGE_CHILDREN'a yansımaz
+    get_reusable_executor().shutdown(wait=True)
+    if store is not None:
+        store.cleanup()
+    # Linux'ta ru_maxrss KB cinsindendir; RUSAGE_CHILDREN sonlanmış worker'ların en büyüğüdür
+    self_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({'self_mb': self_mb, 'children_mb': children_mb, 'seconds': elapsed}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--single', choices=['memory', 'memmap'], help=argparse.SUPPRESS)
+    parser.add_argument('--n-jobs', type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_once(args.rows, args.cols, args.n_jobs, args.single == 'memmap')
+        return
+
+    data_mb = args.rows * args.cols * 8 / 1024 ** 2
+    print(f'{args.rows} x {args.cols} float64 (~{data_mb:.0f} MB)')
+    print(f'{"mod":<8} {"n_jobs":>6} {"ana RSS MB":>11} {"worker RSS MB":>14} '
+          f'{"toplam MB":>10} {"süre s":>7}')
+    for mode in ('memory', 'memmap'):
+        for n_jobs in args.jobs:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_memmap_cv', '--single', mode,
+                 '--n-jobs', str(n_jobs), '--rows', str(args.rows), '--cols', str(args.cols)],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            # Worker'ların hepsi benzer tepe değere ulaşır
+            workers = n_jobs if n_jobs > 1 else 0
+            total = result['self_mb'] + workers * result['children_mb']
+            print(f'{mode:<8} {n_jobs:>6} {result["self_mb"]:>11.0f} '
+                  f'{result["children_mb"]:>14.0f} {total:>10.0f} {result["seconds"]:>7.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+float64 ve float32 eğitim matrislerinin algoritma bazında karşılaştırması
+
+Her algoritma select_model ile varsayılan parametrelerle, aynı veri üzerinde
+iki hassasiyette eğitilir. Her ölçüm ayrı bir alt süreçte yapılır; "fit ek MB"
+veri oluşturulduktan sonra fit sırasında RSS'in ne kadar arttığını (kütüphanenin
+iç dönüşüm kopyaları dahil) gösterir.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_precision --rows 200000 --cols 20
+    python -m benchmarks.bench_precision --models ridge xgboost lightgbm
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from models.ml_models.model_selector import select_model
+
+DEFAULT_MODELS = ['linear_regression', 'ridge', 'lasso', 'elasticnet', 'decision_tree',
+                  'random_forest', 'xgboost', 'lightgbm', 'knn', 'svr']
+# Ölçeklenmesi karesel olan modeller daha küçük veriyle ölçülür
+SLOW_MODELS = {'svr': 20000, 'knn': 50000}
+
+def current_rss_mb():
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+def run_once(model_type, rows, cols, dtype):
+    """Tek bir ölçüm; sonuç JSON olarak stdout'a yazılır"""
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal((rows, cols)).astype(dtype)
+    y = x[:, :5].astype(np.float64) @ rng.standard_normal(5) + rng.standard_normal(rows)
+    split = int(rows * 0.8)
+    x_train, x_test, y_train, y_test = x[:split], x[split:], y[:split], y[split:]
+
+    before_mb = current_rss_mb()
+    start = time.perf_counter()
+    _, y_pred, score = select_model(x_train, y_train, x_test, y_test, model_type, {})
+    elapsed = time.perf_counter() - start
+    # Linux'ta ru_maxrss KB cinsindendir
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        'matrix_mb': x.nbytes / 1024 ** 2,
+        'fit_extra_mb': max(peak_mb - before_mb, 0.0),
+        'seconds': elapsed,
+        'score': score
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--models', nargs='+', default=DEFAULT_MODELS)
+    parser.add_argument('--single', help=argparse.SUPPRESS)
+    parser.add_argument('--dtype', default='float64', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_once(args.single, args.rows, args.cols, args.dtype)
+        return
+
+    print(f'{"model":<18} {"dtype":<8} {"satır":>7} {"matris MB":>10} {"fit ek MB":>10} '
+          f'{"süre s":>8} {"R2":>7}')
+    for model_type in args.models:
+        rows = min(args.rows, SLOW_MODELS.get(model_type, args.rows))
+        for dtype in ('float64', 'float32'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_precision', '--single', model_type,
+                 '--dtype', dtype, '--rows', str(rows), '--cols', str(args.cols)],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            print(f'{model_type:<18} {dtype:<8} {rows:>7} {result["matrix_mb"]:>10.1f} '
+                  f'{result["fit_extra_mb"]:>10.1f} {result["seconds"]:>8.2f} {result["score"]:>7.3f}')
+
+if __name__ == '__main__':
+    main()
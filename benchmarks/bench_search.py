@@ -0,0 +1,87 @@
+"""
+Tüm grid, successive halving ve bayes (TPE) aramalarının karşılaştırması
+
+Sentetik doğrusal olmayan bir regresyon verisinde (Friedman #1 + gürültü
+kolonları) her model, otomatik seçimdeki grid'lerle üç kez turnuvadan geçirilir:
+tüm grid ('grid'), Config bütçesiyle successive halving ('halving') ve
+BAYES_MAX_TRIALS denemeli TPE ('bayes'). CV fit sayısı, süre, en iyi CV skoru
+ve test R² karşılaştırılır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bench_search --rows 2000 --models decision_tree lightgbm
+    python -m benchmarks.bench_search --grid fast --max-fits 150 --factor 2
+    python -m benchmarks.bench_search --strategies halving bayes --max-trials 10
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.datasets import make_friedman1
+from sklearn.metrics import r2_score
+from config import Config
+from utils.auto_model_selector import DETAILED_PARAMS, FAST_PARAMS, create_models_config
+from utils.search_utils import SEARCH_STRATEGIES, plan_search
+from utils.tournament import Candidate, TournamentScheduler
+
+GRIDS = {'detailed': DETAILED_PARAMS, 'fast': FAST_PARAMS}
+
+def create_data(rows, features, seed=42):
+    x, y = make_friedman1(n_samples=int(rows * 1.25), n_features=features, noise=1.0, random_state=seed)
+    return x[:rows], y[:rows], x[rows:], y[rows:]
+
+def run_search(name, config, strategy, cv_folds, arrays, y_test):
+    plan = plan_search(config['params'], len(arrays['X_train']), cv_folds, strategy=strategy)
+    candidate = Candidate(name, config['model'], config['params'], cv_folds,
+                          search_data=('X_train', 'y_train'), final_data=[('X_train', 'y_train')],
+                          score_data=('X_train', 'y_train'), plan=plan)
+    scheduler = TournamentScheduler(arrays)
+    start = time.perf_counter()
+    scheduler.run([candidate])
+    elapsed = time.perf_counter() - start
+    if candidate.status != 'done':
+        return {'fits': plan.n_fits(cv_folds), 'time': elapsed, 'cv': np.nan, 'test': np.nan,
+                'params': candidate.error}
+    return {
+        'fits': plan.n_fits(cv_folds),
+        'rounds': len(plan.rounds),
+        'time': elapsed,
+        # Son turdaki (tam veri) ortalama CV skoru
+        'cv': float(np.nanmean(candidate.search_scores[candidate.best_index])),
+        'test': r2_score(y_test, candidate.final['predictions']),
+        'params': candidate.best_params
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--features', type=int, default=10)
+    parser.add_argument('--cv', type=int, default=5)
+    parser.add_argument('--grid', choices=list(GRIDS), default='detailed')
+    parser.add_argument('--models', nargs='+',
+                        default=['decision_tree', 'random_forest', 'lightgbm', 'xgboost'])
+    parser.add_argument('--max-fits', type=int, default=Config.SEARCH_MAX_FITS)
+    parser.add_argument('--factor', type=int, default=Config.HALVING_FACTOR)
+    parser.add_argument('--min-samples', type=int, default=Config.HALVING_MIN_SAMPLES)
+    parser.add_argument('--max-trials', type=int, default=Config.BAYES_MAX_TRIALS)
+    parser.add_argument('--strategies', nargs='+', choices=SEARCH_STRATEGIES, default=list(SEARCH_STRATEGIES))
+    args = parser.parse_args()
+
+    Config.SEARCH_MAX_FITS = args.max_fits
+    Config.HALVING_FACTOR = args.factor
+    Config.HALVING_MIN_SAMPLES = args.min_samples
+    Config.BAYES_MAX_TRIALS = args.max_trials
+
+    x_train, y_train, x_test, y_test = create_data(args.rows, args.features)
+    arrays = {'X_train': x_train, 'y_train': y_train, 'X_test': x_test}
+    models_config = create_models_config(GRIDS[args.grid])
+    print(f'{args.rows} satır, {args.features} kolon, {args.cv} fold, {args.grid} grid, '
+          f'bütçe {args.max_fits} fit, factor {args.factor}')
+    print(f'{"model":<15}{"mod":<9}{"fit":>7}{"tur":>5}{"süre (sn)":>11}{"CV R²":>9}{"test R²":>9}  en iyi parametreler')
+    for name in args.models:
+        for strategy in args.strategies:
+            result = run_search(name, models_config[name], strategy, args.cv, arrays, y_test)
+            print(f'{name:<15}{strategy:<9}{result["fits"]:>7}{result.get("rounds", 1):>5}'
+                  f'{result["time"]:>11.2f}{result["cv"]:>9.4f}{result["test"]:>9.4f}  {result["params"]}')
+
+if __name__ == '__main__':
+    main()
@@ -12,10 +12,47 @@ class Config:
     SECRET_KEY = 'your-secret-key-here'  # Güvenlik için değiştir
     
     # File upload settings
-    UPLOAD_FOLDER = 'uploads'
+    UPLOAD_FOLDER = 'storage/uploads'
     ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
     MAX_CONTENT_LENGTH = 256 * 1024 * 1024  # 256MB max file size
     
+    # Ayrıştırılmış veri setleri için süreç içi önbellek bütçesi
+    DATASET_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1GB
+    
+    # Bu boyutun üzerindeki dosyalar parça parça (out-of-core) işlenir
+    STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024  # 100MB
+    STREAMING_CHUNK_ROWS = 100000
+    # Seçilen kolonların tahmini boyutu bunu aşarsa eğitim ön işlemesi parça parça yapılır
+    CHUNKED_PREPROCESSING_MIN_BYTES = 512 * 1024 * 1024  # 512MB
+    
+    # Farklı değer oranı bu eşiğin altındaki metin kolonları kategorik sayılır
+    CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+    
+    # Bu satır sayısının üzerinde IQR sınırları örneklem üzerinden yaklaşık hesaplanır
+    OUTLIER_APPROX_MIN_ROWS = 1000000
+    OUTLIER_SAMPLE_ROWS = 200000
+    
+    # Bu sayıdan fazla kategorisi olan kolonlar etiket yerine 'frequency' veya 'target' ile kodlanır
+    CATEGORY_HIGH_CARDINALITY = 1000
+    HIGH_CARDINALITY_ENCODING = 'frequency'
+    TARGET_ENCODING_SMOOTHING = 10.0
+    
+    # Geniş veri setlerinde kolon bazlı adımlar (doldurma, kırpma, kodlama, tip tespiti)
+    # kolon bölümlerine ayrılıp paralel çalışır; 0 ise CPU sayısı, 1 ise seri
+    COLUMN_WORKERS = 0
+    # 'thread' veya 'process' (bkz. benchmarks/bench_column_executor.py)
+    COLUMN_EXECUTOR_BACKEND = 'thread'
+    # Bu sayıdan az kolonlu veri setleri seri işlenir
+    COLUMN_PARALLEL_MIN_COLUMNS = 64
+    
+    # Ön işleme adımlarının bellek kullanımını tracemalloc ile ölç (yavaşlatır)
+    TRACK_PREPROCESSING_MEMORY = False
+    
+    # Upload sonrası arka planda çalışan profilleme işleri
+    PROFILING_WORKERS = 2
+    # Profil hazır olana kadar gösterilecek örneklem profilinin satır sayısı
+    PROFILE_SAMPLE_ROWS = 10000
+    
     # Storage paths for ML models (otomatik klasör oluşturma)
     STORAGE_BASE_PATH = BASE_DIR / 'storage'
     
@@ -23,12 +60,69 @@ class Config:
     MODEL_FOLDER_NAME = 'models'
     ENCODER_FOLDER_NAME = 'encoders'
     SCALER_FOLDER_NAME = 'scalers'
-    
+    MATRIX_FOLDER_NAME = 'matrices'
+    PIPELINE_FOLDER_NAME = 'pipelines'
+    PREPROCESSED_CACHE_FOLDER_NAME = 'preprocessed'
+    STATISTICS_FOLDER_NAME = 'statistics'
+    SEARCH_TRIALS_FOLDER_NAME = 'search_trials'
+
     # Full paths
     MODEL_STORAGE_PATH = STORAGE_BASE_PATH / MODEL_FOLDER_NAME
     ENCODER_STORAGE_PATH = STORAGE_BASE_PATH / ENCODER_FOLDER_NAME
     SCALER_STORAGE_PATH = STORAGE_BASE_PATH / SCALER_FOLDER_NAME
+    MATRIX_STORAGE_PATH = STORAGE_BASE_PATH / MATRIX_FOLDER_NAME
+    PIPELINE_STORAGE_PATH = STORAGE_BASE_PATH / PIPELINE_FOLDER_NAME
+    PREPROCESSED_CACHE_PATH = STORAGE_BASE_PATH / PREPROCESSED_CACHE_FOLDER_NAME
+    # Satır eklemede artımlı güncellenen profil ve ön işleme istatistikleri
+    STATISTICS_STORAGE_PATH = STORAGE_BASE_PATH / STATISTICS_FOLDER_NAME
+    # Bayes aramasının veri seti başına deneme geçmişi (warm start)
+    SEARCH_TRIALS_STORAGE_PATH = STORAGE_BASE_PATH / SEARCH_TRIALS_FOLDER_NAME
+
+    # Eğitim matrisleri bir kez memmap .npy olarak yazılır, CV worker'ları kopyalamadan paylaşır
+    USE_MEMMAP_MATRICES = True
+    # Eğitim hassasiyeti: ön işleme pipeline'ı özellik matrisini bu dtype'ta bir kez üretir.
+    # 'float32' matrisleri yarıya indirir; ağaç modelleri ve XGBoost zaten float32 ile
+    # çalıştığından onların iç kopyası da ortadan kalkar (bkz. benchmarks/bench_precision.py)
+    MATRIX_DTYPE = 'float64'
     
+    # Aynı dosya/hedef/özellik/ayar kombinasyonu için ön işlenmiş bölmeler diskte saklanır
+    USE_PREPROCESSED_CACHE = True
+    # Önbelleğin disk bütçesi; aşılınca en uzun süredir kullanılmayan girdiler silinir
+    PREPROCESSED_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+    
+    # Otomatik model seçiminde tüm adayların fit'lerinin paylaştığı çekirdek (süreç) sayısı;
+    # 0 ise CPU sayısı
+    AUTO_SELECT_CORE_BUDGET = 0
+    # Bir modelin, diğer modellerin bekleyen işi varken kullanabileceği çekirdek sayısı;
+    # 0 ise bütçenin yarısı (yavaş bir model, örn. SVR, tüm çekirdekleri tutamaz)
+    AUTO_SELECT_MAX_CORES_PER_MODEL = 0
+    # Worker süreci başına bellek (adres alanı) sınırı, bayt; bellek eşlemeli matrislerin
+    # boyutu ayrıca eklenir. 0 ise fiziksel bellek / çekirdek bütçesi (en az 2 GB),
+    # None ise sınır yok
+    AUTO_SELECT_WORKER_MEMORY_BYTES = 0
+    
+    # Hiperparametre araması: 'grid' tüm kombinasyonları tam veriyle dener; 'halving'
+    # (successive halving) kombinasyonları önce küçük örneklemlerde dener, her turda
+    # en iyi 1/HALVING_FACTOR'u factor kat daha fazla satırla tekrar değerlendirir
+    # (bkz. benchmarks/bench_search.py)
+    HYPERPARAM_SEARCH = 'halving'
+    HALVING_FACTOR = 3
+    # İlk turdaki en az satır sayısı; daha küçük örneklemlerde skorlar eleme için güvenilmez
+    HALVING_MIN_SAMPLES = 500
+    # Halving'de model başına en fazla CV fit sayısı; grid daha büyükse kombinasyonlardan
+    # bu bütçeye sığacak kadarı rastgele seçilir (0 ise sınırsız)
+    SEARCH_MAX_FITS = 300
+    # 'bayes': grid'ler ayrık arama uzayı olarak okunur, kombinasyonlar TPE ile tek tek
+    # seçilir. Model başına en fazla BAYES_MAX_TRIALS yeni deneme veya BAYES_TIME_BUDGET
+    # saniye (0 ise süre sınırı yok); ilk BAYES_STARTUP_TRIALS deneme rastgele seçilir.
+    # Aynı veri setinde önceki denemeler tekrar fit edilmez (warm start)
+    BAYES_MAX_TRIALS = 20
+    BAYES_TIME_BUDGET = 0
+    BAYES_STARTUP_TRIALS = 5
+    # Büyük veri setlerinde otomatik seçim ULTRA_FAST_PARAMS yerine FAST_PARAMS uzayında
+    # bu kadar denemeyle arar
+    BAYES_LARGE_MAX_TRIALS = 8
+
     # Database configuration
     DATABASE_URL = 'sqlite:///sales_prediction.db'
     DATABASE_PATH = 'sales_prediction.db'
@@ -40,7 +134,12 @@ class Config:
             Config.STORAGE_BASE_PATH,
             Config.MODEL_STORAGE_PATH,
             Config.ENCODER_STORAGE_PATH,
-            Config.SCALER_STORAGE_PATH
+            Config.SCALER_STORAGE_PATH,
+            Config.MATRIX_STORAGE_PATH,
+            Config.PIPELINE_STORAGE_PATH,
+            Config.PREPROCESSED_CACHE_PATH,
+            Config.STATISTICS_STORAGE_PATH,
+            Config.SEARCH_TRIALS_STORAGE_PATH
         ]
         
         for directory in directories:
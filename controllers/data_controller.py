@@ -1,7 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-import os
-from services.data_service import DataService
-from config import DevelopmentConfig
+from services.file_service import FileService
+from services.profiling_job_service import ProfilingJobService
 
 processing_bp = Blueprint('processing', __name__)
 
@@ -10,11 +9,18 @@ def select_columns(filename):
     """
     Kolon seçimi sayfası - kullanıcı hangi kolonları analiz edeceğini seçer
     """
-    # Dosya yolunu oluştur
-    filepath = os.path.join(DevelopmentConfig.UPLOAD_FOLDER, filename)
+    # Dosya adını içerik adresli dosya yoluna çevir
+    filepath = FileService.resolve_upload_path(filename)
     
-    # DataService ile dosya analizi yap
-    result = DataService.analyze_file(filepath, filename)
+    # Excel dosyalarında kullanıcı farklı bir sayfa seçebilir
+    sheet_name = request.args.get('sheet')
+    if sheet_name and FileService.is_excel_file(filename):
+        sheet_result = FileService.select_excel_sheet(filepath, filename, sheet_name)
+        if not sheet_result['success']:
+            flash(sheet_result['message'], 'error')
+    
+    # Analiz arka plan profilinden sunulur, hazır değilse örneklem profili kullanılır
+    result = ProfilingJobService.get_analysis(filepath, filename)
     
     if not result['success']:
         flash(result['message'], 'error')
@@ -22,12 +28,18 @@ def select_columns(filename):
     
     # Başarılı analiz - session'a kaydet
     data = result['data']
+    if data['sampled']:
+        flash('Dosya profili hazırlanıyor; değerler ilk satırlardan tahmin edildi.', 'info')
     session['current_file'] = data['filename']
     session['file_columns'] = data['columns']
     session['column_types'] = data['column_types']
     
+    sheet_info = FileService.get_excel_sheet_info(filepath, filename)
+    
     return render_template('select_columns.html', 
                          filename=data['filename'],
+                         sheets=sheet_info['sheets'],
+                         current_sheet=sheet_info['current_sheet'],
                          columns=data['columns'],
                          column_types=data['column_types'],
                          preview_data=data['preview_data'],
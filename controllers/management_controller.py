@@ -3,7 +3,7 @@ import os
 from pathlib import Path
 from models.database.crud import get_all_models, get_model_by_id, delete_model
 from services.model_service import ModelService
-from config import Config
+from utils.file_utils import get_model_file_paths
 
 management_bp = Blueprint('management', __name__)
 
@@ -45,13 +45,7 @@ def delete_model_route(model_id):
         delete_model(model_id)
         
         # Model dosyalarını da sil
-        base_path = Config.STORAGE_BASE_PATH
-        
-        files_to_delete = [
-            base_path / 'models' / f'model_{model_id}.pkl',
-            base_path / 'encoders' / f'encoder_{model_id}.pkl',
-            base_path / 'scalers' / f'scaler_{model_id}.pkl'
-        ]
+        files_to_delete = list(get_model_file_paths(model_id).values())
         
         # Dosyaları sil (varsa)
         deleted_files = []
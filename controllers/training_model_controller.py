@@ -23,4 +23,5 @@ def train_model():
     # Başarılı sonucu göster
     return render_template('training_results.html', 
                          model_info=session['trained_model'],
-                         performance=result['performance'])
+                         performance=result['performance'],
+                         memory_report=result.get('memory_report'))
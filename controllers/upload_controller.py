@@ -20,3 +20,11 @@ def upload_file():
     else:
         flash(result['message'], 'error')
         return redirect(url_for('main.index'))
+
+@upload_bp.route('/append/<filename>', methods=['POST'])
+def append_rows(filename):
+    """Yüklü veri setine satır ekleme endpoint'i"""
+    result = FileService.append_to_dataset(filename, request.files.get('file'))
+
+    flash(result['message'], 'success' if result['success'] else 'error')
+    return redirect(url_for('processing.select_columns', filename=filename))
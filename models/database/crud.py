@@ -7,6 +7,12 @@ Functions:
 - get_model_by_id(): Get specific model details
 - delete_model(): Remove model and associated files
 - update_model_status(): Activate/deactivate models
+- save_uploaded_file(): Map an uploaded filename to its content hash
+- get_uploaded_file(): Resolve a filename to its content hash
+- save_dataset_profile(): Store a profiling job status or its result
+- get_dataset_profile(): Read a dataset profile by content hash
+- save_dataset_version(): Record that a dataset version was created by appending rows
+- get_dataset_version(): Read the parent version of an appended dataset
 """
 import json
 from datetime import datetime
@@ -67,4 +73,99 @@ def delete_model(model_id):
 
         cursor.execute("DELETE FROM trained_models WHERE id = ?", (model_id,))
 
-        conn.commit()
\ No newline at end of file
+        conn.commit()
+
+def save_uploaded_file(filename, content_hash, file_size):
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        # Aynı isimle yeni içerik yüklenirse isim yeni hash'e taşınır, eski blob korunur
+        cursor.execute("""
+            INSERT INTO uploaded_files (filename, content_hash, file_size, created_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(filename) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                file_size = excluded.file_size,
+                created_at = excluded.created_at
+        """, (filename, content_hash, file_size, now))
+
+        conn.commit()
+
+def get_uploaded_file(filename):
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM uploaded_files WHERE filename = ?", (filename,))
+
+        return cursor.fetchone()
+
+def save_dataset_profile(content_hash, status, sheet_name=None, profile=None, error=None):
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    profile = profile or {}
+    row_count, column_count = profile.get('shape', (None, None))
+
+    # Önizleme değerleri tarih vb. içerebilir; JSON'a çevrilemeyenler string olarak yazılır
+    def to_json(value):
+        return json.dumps(value, default=str) if value is not None else None
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO dataset_profiles
+            (content_hash, sheet_name, status, row_count, column_count, columns,
+             column_types, preview_data, missing_data, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (content_hash, sheet_name, status, row_count, column_count,
+              to_json(profile.get('columns')), to_json(profile.get('column_types')),
+              to_json(profile.get('preview_data')), to_json(profile.get('missing_data')),
+              error, now))
+
+        conn.commit()
+
+def get_dataset_profile(content_hash):
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM dataset_profiles WHERE content_hash = ?", (content_hash,))
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        profile = dict(row)
+        for key in ('columns', 'column_types', 'preview_data', 'missing_data'):
+            profile[key] = json.loads(profile[key]) if profile[key] else None
+        return profile
+
+def save_dataset_version(content_hash, parent_hash, parent_rows, appended_rows):
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        # Yeni sürümün ilk parent_rows satırı üst sürümle aynıdır
+        cursor.execute("""
+            INSERT OR REPLACE INTO dataset_versions
+            (content_hash, parent_hash, parent_rows, appended_rows, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (content_hash, parent_hash, parent_rows, appended_rows, now))
+
+        conn.commit()
+
+def get_dataset_version(content_hash):
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM dataset_versions WHERE content_hash = ?", (content_hash,))
+        row = cursor.fetchone()
+
+        return dict(row) if row is not None else None
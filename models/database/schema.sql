@@ -11,7 +11,9 @@ CREATE TABLE IF NOT EXISTS trained_models
     mae REAL,
     mse REAL,
     rmse REAL,
-    created_at TEXT
+    is_active INTEGER,
+    created_at TEXT,
+    model_params TEXT
 );
 
 CREATE TABLE IF NOT EXISTS model_files 
@@ -33,4 +35,39 @@ CREATE TABLE IF NOT EXISTS training_sessions
     handle_missing TEXT,
     created_at TEXT,
     FOREIGN KEY (model_id) REFERENCES trained_models(id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+CREATE TABLE IF NOT EXISTS uploaded_files
+(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL,
+    file_size INTEGER,
+    created_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_uploaded_files_hash ON uploaded_files(content_hash);
+
+CREATE TABLE IF NOT EXISTS dataset_profiles
+(
+    content_hash TEXT PRIMARY KEY,
+    sheet_name TEXT,
+    status TEXT NOT NULL,
+    row_count INTEGER,
+    column_count INTEGER,
+    columns TEXT,
+    column_types TEXT,
+    preview_data TEXT,
+    missing_data TEXT,
+    error TEXT,
+    updated_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS dataset_versions
+(
+    content_hash TEXT PRIMARY KEY,
+    parent_hash TEXT NOT NULL,
+    parent_rows INTEGER NOT NULL,
+    appended_rows INTEGER NOT NULL,
+    created_at TEXT
+);
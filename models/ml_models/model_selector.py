@@ -1,4 +1,3 @@
-from sklearn.model_selection import GridSearchCV
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor
@@ -6,17 +5,22 @@ from sklearn.neighbors import KNeighborsRegressor
 from sklearn.svm import SVR
 import xgboost as xgb
 import lightgbm as lgb
+from config import Config
 from .linear_models import linear_regression, ridge_regression, lasso_regression, elasticnet_regression
 from .tree_models import decision_tree, random_forest, xgboost, lightgbm
 from .other_models import knn_regression, svr_regression
+from utils.search_utils import build_search_cv, load_trial_history, save_trial_history
 
-def select_model(x_train, y_train, x_test, y_test, model_type, model_params, use_grid_search=False):
+def select_model(x_train, y_train, x_test, y_test, model_type, model_params, use_grid_search=False,
+                 dataset_key=None):
     """
     Model seçimi ve eğitimi yapan ana fonksiyon
+    dataset_key: Bayes aramasında önceki denemelerin okunup kaydedildiği veri seti anahtarı
     """
     
     if use_grid_search:
-        return _train_with_grid_search(x_train, y_train, x_test, y_test, model_type, model_params)
+        return _train_with_grid_search(x_train, y_train, x_test, y_test, model_type, model_params,
+                                       dataset_key=dataset_key)
     else:
         return _train_single_model(x_train, y_train, x_test, y_test, model_type, model_params)
 
@@ -45,7 +49,7 @@ def _train_single_model(x_train, y_train, x_test, y_test, model_type, model_para
     model_function = model_functions[model_type]
     return model_function(x_train, x_test, y_train, y_test, **model_params)
 
-def _train_with_grid_search(x_train, y_train, x_test, y_test, model_type, model_params):
+def _train_with_grid_search(x_train, y_train, x_test, y_test, model_type, model_params, dataset_key=None):
     """
     Grid search ile model eğitimi
     """
@@ -99,16 +103,22 @@ def _train_with_grid_search(x_train, y_train, x_test, y_test, model_type, model_
     
     config = model_configs[model_type]
     
-    # Grid search yap
-    grid_search = GridSearchCV(
-        config['model'], 
-        config['params'], 
-        cv=5, 
-        scoring='r2',
-        n_jobs=-1
+    # Grid search yap (Config.HYPERPARAM_SEARCH'e göre GridSearchCV, HalvingGridSearchCV
+    # veya aynı veri setindeki önceki denemelerden devam eden BayesSearchCV)
+    history = load_trial_history(dataset_key, 'grid') if Config.HYPERPARAM_SEARCH == 'bayes' else None
+    grid_search = build_search_cv(
+        config['model'],
+        config['params'],
+        cv=5,
+        n_samples=len(x_train),
+        n_jobs=-1,
+        history=history,
+        model_type=model_type
     )
     
     grid_search.fit(x_train, y_train)
+    if history is not None:
+        save_trial_history(dataset_key, 'grid', history)
     
     # En iyi modeli al ve tahmin yap
     best_model = grid_search.best_estimator_
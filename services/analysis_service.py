@@ -2,7 +2,10 @@
 
 import pandas as pd
 import os
-from utils.data_utils import read_file_by_extension
+from config import Config
+from utils.dataset_registry import dataset_registry
+from utils.sketch_utils import estimate_distinct_counts
+from utils.data_utils import estimate_memory_usage
 
 class AnalysisService:
     """Dosya analizi işlemlerini yöneten servis sınıfı"""
@@ -22,12 +25,24 @@ class AnalysisService:
             return []
     
     @staticmethod
-    def determine_column_types(df):
-        """Kolon tiplerini otomatik belirle"""
+    def determine_column_types(df, max_unique_ratio=None):
+        """
+        Kolon tiplerini otomatik belirle
+        
+        Sayısal olmayan kolonların farklı değer sayısı HyperLogLog ile tek geçişte tahmin edilir.
+        
+        Args:
+            df: DataFrame
+            max_unique_ratio: Bu oranın altındaki kolonlar kategorik sayılır
+                (None ise Config.CATEGORICAL_MAX_UNIQUE_RATIO)
+        """
+        if max_unique_ratio is None:
+            max_unique_ratio = Config.CATEGORICAL_MAX_UNIQUE_RATIO
+        
         column_types = {}
-        columns = df.columns.tolist()
+        text_columns = []
         
-        for col in columns:
+        for col in df.columns.tolist():
             try:
                 dtype = str(df[col].dtype)
                 # Numeric olmaya çalış
@@ -38,20 +53,28 @@ class AnalysisService:
                     try:
                         pd.to_numeric(df[col].dropna().head(10), errors='raise')
                         column_types[col] = 'sayısal'
-                    except:
-                        # Kategorik veri olarak kabul et
-                        unique_values = df[col].nunique()
-                        total_values = len(df[col].dropna())
-                        
-                        # Eğer unique değer sayısı toplam değerlerin %50'sinden azsa kategorik
-                        if unique_values < total_values * 0.5:
-                            column_types[col] = 'kategorik'
-                        else:
-                            column_types[col] = 'metin'  # Çok fazla unique değer varsa metin
+                    except (ValueError, TypeError):
+                        text_columns.append(col)
             except Exception:
                 column_types[col] = 'kategorik'  # Hata durumunda kategorik kabul et
         
-        return column_types
+        try:
+            estimates = estimate_distinct_counts(df, text_columns)
+        except Exception:
+            estimates = {}
+        
+        for col in text_columns:
+            if col not in estimates:
+                column_types[col] = 'kategorik'
+                continue
+            # Farklı değer oranı eşiğin altındaysa kategorik, değilse metin
+            if estimates[col]['estimate'] < estimates[col]['non_null'] * max_unique_ratio:
+                column_types[col] = 'kategorik'
+            else:
+                column_types[col] = 'metin'
+        
+        # Kolon sırasını koru
+        return {col: column_types[col] for col in df.columns.tolist()}
     
     @staticmethod
     def clean_dataframe(df):
@@ -65,7 +88,7 @@ class AnalysisService:
         """Dosyayı yükle ve temel DataFrame kontrolleri yap"""
         try:
             # Dosyayı oku
-            df = read_file_by_extension(filepath, filename)
+            df = dataset_registry.get(filepath, filename)
             
             # Boş DataFrame kontrolü
             if df.empty:
@@ -93,5 +116,6 @@ class AnalysisService:
             'columns': df.columns.tolist(),
             'dtypes': df.dtypes.to_dict(),
             'null_counts': df.isnull().sum().to_dict(),
-            'memory_usage': df.memory_usage(deep=True).sum()
+            'distinct_estimates': estimate_distinct_counts(df),
+            'memory_usage': estimate_memory_usage(df)
         }
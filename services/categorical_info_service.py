@@ -21,7 +21,10 @@ class CategoricalInfoService:
         categorical_values = {}
         
         try:
-            if model_objects and 'encoders' in model_objects:
+            if model_objects and model_objects.get('pipeline') is not None:
+                categorical_values = model_objects['pipeline'].get_categorical_values()
+                column_types = {col: 'categorical' for col in categorical_values}
+            elif model_objects and 'encoders' in model_objects:
                 encoders = model_objects['encoders']
                 for col_name, encoder in encoders.items():
                     if hasattr(encoder, 'classes_'):
@@ -1,8 +1,23 @@
 """Veri işleme servisleri"""
 
-from utils.data_utils import read_file_by_extension, handle_missing_data, handle_outliers
-from utils.ml_utils import encoding_data, scaling_data, data_split
+import os
+
+from utils.dataset_registry import dataset_registry
+from utils.columnar_utils import (
+    infer_dtype_map, is_large_file, count_columnar_rows, estimate_columns_bytes, iter_dataset_chunks,
+    get_columnar_sheet
+)
+from utils.profiling_utils import profile_dataset_streaming
+from utils.ml_utils import split_indices
+from utils.preprocessing import PreprocessingPipeline
+from utils.chunked_preprocessing import fit_transform_chunks, collect_statistics
+from utils.memmap_utils import MatrixStore
+from utils.memory_utils import StageMemoryTracker
+from utils.preprocessed_cache import preprocessed_cache
+from utils.statistics_store import load_or_build_state, state_kind
+from models.database.crud import get_dataset_version
 from services.analysis_service import AnalysisService
+from config import Config
 
 class DataService:
     """Veri işleme işlemlerini yöneten servis sınıfı"""
@@ -11,44 +26,166 @@ class DataService:
     def process_uploaded_file(filepath, filename, target_column, feature_columns, 
                             handle_missing='drop', test_size=0.2):
         """
-        Yüklenen dosyayı işler ve ML için hazırlar
+        Yüklenen dosyayı işler ve ML için hazırlar.
+        Aynı veri ve ayarlarla daha önce işlendiyse bölmeler ve pipeline önbellekten döner.
         """
-        # Dosyayı oku
-        df = read_file_by_extension(filepath, filename)
+        # Aynı anahtar, bayes aramasının önceki denemelerini de bu veri setine bağlar
+        dataset_key = preprocessed_cache.make_key(
+            filepath, target_column, feature_columns, handle_missing, test_size
+        )
+        cache_key = None
+        if Config.USE_PREPROCESSED_CACHE:
+            cache_key = dataset_key
+            cached = preprocessed_cache.get(cache_key, mmap=Config.USE_MEMMAP_MATRICES)
+            if cached is not None:
+                # Önbellek dosyaları önbelleğe aittir; eğitim sonunda silinmez
+                return {
+                    'X_train': cached['X_train'],
+                    'X_test': cached['X_test'],
+                    'y_train': cached['y_train'],
+                    'y_test': cached['y_test'],
+                    'pipeline': cached['pipeline'],
+                    'matrix_store': None,
+                    'memory_report': None,
+                    'cache_hit': True,
+                    'dataset_key': dataset_key
+                }
         
-        # Seçilen kolonları filtrele
+        tracker = StageMemoryTracker(enabled=Config.TRACK_PREPROCESSING_MEMORY).start()
         selected_columns = [target_column] + feature_columns
-        df_filtered = df[selected_columns].copy()
+        # Eksik veri, outlier, encoding ve scaling adımları tek pipeline'da fit edilir;
+        # aynı nesne tahminde de kullanılır
+        pipeline = PreprocessingPipeline(feature_columns, target_column, handle_missing=handle_missing,
+                                         dtype=Config.MATRIX_DTYPE)
         
-        # Eksik verileri işle
-        df_processed = handle_missing_data(
-            df_filtered, 
-            method=handle_missing
-        )
-        
-        # Outlier'ları işle
-        df_processed = handle_outliers(
-            df_processed,
-            columns=selected_columns
-        )
+        if DataService.should_preprocess_in_chunks(filepath, selected_columns):
+            # Veri belleğe alınmadan parça parça fit edilir, bölmeler doğrudan diske yazılır
+            make_chunks = lambda skip_rows=0: iter_dataset_chunks(
+                filepath, filename, Config.STREAMING_CHUNK_ROWS, columns=selected_columns,
+                skip_rows=skip_rows
+            )
+            matrix_store = MatrixStore(Config.MATRIX_STORAGE_PATH)
+            try:
+                # 1. geçiş: satır eklenmiş sürümde sadece yeni satırlar okunur
+                with tracker.stage('scan'):
+                    stats = DataService.load_chunk_statistics(filepath, selected_columns,
+                                                              handle_missing, make_chunks)
+                arrays = fit_transform_chunks(pipeline, make_chunks, matrix_store, test_size,
+                                              tracker, stats=stats)
+            except Exception:
+                matrix_store.cleanup()
+                raise
+            x_train, x_test = arrays['X_train'], arrays['X_test']
+            y_train, y_test = arrays['y_train'], arrays['y_test']
+        else:
+            x_train, x_test, y_train, y_test, matrix_store = DataService._preprocess_in_memory(
+                filepath, filename, selected_columns, pipeline, test_size, tracker
+            )
         
-        # Encoding ve scaling
-        df_processed, encoders = encoding_data(df_processed)
-        _, x, y, scaler = scaling_data(df_processed, feature_columns, target_column)
+        tracker.stop()
         
-        # Train-test split
-        x_train, x_test, y_train, y_test = data_split(x, y, test_size)
+        if cache_key is not None:
+            # Memmap klasörü kopyalanmadan önbelleğe taşınır; sahiplik önbelleğe geçer
+            cached = preprocessed_cache.put(
+                cache_key,
+                {'X_train': x_train, 'X_test': x_test, 'y_train': y_train, 'y_test': y_test},
+                pipeline,
+                source_directory=matrix_store.directory if matrix_store is not None else None
+            )
+            if cached and matrix_store is not None:
+                # Taşınan dosyalar yeni yollarından yeniden eşlenir; örneklem memmap'leri
+                # (memmap_like) referans dizinin klasörüne yazıldığından eski yol kullanılamaz
+                matrix_store = None
+                arrays = preprocessed_cache.load_arrays(cache_key)
+                x_train, x_test = arrays['X_train'], arrays['X_test']
+                y_train, y_test = arrays['y_train'], arrays['y_test']
         
         return {
             'X_train': x_train,
             'X_test': x_test,
             'y_train': y_train,
             'y_test': y_test,
-            'encoders': encoders,
-            'scaler': scaler,
-            'processed_df': df_processed
+            'pipeline': pipeline,
+            'matrix_store': matrix_store,
+            'memory_report': tracker.report(),
+            'cache_hit': False,
+            'dataset_key': dataset_key
         }
     
+    @staticmethod
+    def should_preprocess_in_chunks(filepath, columns):
+        """Seçilen kolonların tahmini boyutu eşiği aşıyorsa ön işleme parça parça yapılır"""
+        estimated = estimate_columns_bytes(filepath, columns)
+        if estimated is None:
+            estimated = os.path.getsize(filepath)
+        return estimated > Config.CHUNKED_PREPROCESSING_MIN_BYTES
+    
+    @staticmethod
+    def get_parent_version(filepath):
+        """
+        Dosya satır eklenerek oluşturulduysa üst sürüm bilgisini döner
+
+        Returns:
+            tuple or None: (üst sürüm hash'i, üst sürümdeki satır sayısı)
+        """
+        content_hash = dataset_registry.get_dataset_key(filepath)[0]
+        try:
+            version = get_dataset_version(content_hash)
+        except Exception:
+            version = None
+        if version is None:
+            return None
+        return version['parent_hash'], version['parent_rows']
+
+    @staticmethod
+    def load_chunk_statistics(filepath, columns, handle_missing, make_chunks):
+        """
+        Parçalı ön işlemenin 1. geçiş istatistiklerini sürüm bazında saklar.
+        Satır eklenmiş sürümde üst sürümün istatistikleri sadece yeni satırlarla güncellenir.
+        """
+        drop_missing = handle_missing == 'drop'
+        kind = state_kind('preprocessing', list(columns), drop_missing, Config.OUTLIER_SAMPLE_ROWS,
+                          get_columnar_sheet(filepath))
+        return load_or_build_state(
+            kind,
+            dataset_registry.get_dataset_key(filepath)[0],
+            build=lambda: collect_statistics(make_chunks(), columns, drop_missing),
+            update=lambda stats, skip_rows: collect_statistics(make_chunks(skip_rows), columns,
+                                                               drop_missing, stats=stats),
+            parent=DataService.get_parent_version(filepath)
+        )
+
+    @staticmethod
+    def _preprocess_in_memory(filepath, filename, selected_columns, pipeline, test_size, tracker):
+        """Seçilen kolonları belleğe alarak pipeline'ı fit eder ve train/test bölmelerini oluşturur"""
+        # Sadece seçilen kolonları dar dtype'larla kayıt defterinden al (sıcaksa dosya tekrar okunmaz)
+        with tracker.stage('load'):
+            dtypes = infer_dtype_map(filepath, filename, selected_columns)
+            df_filtered = dataset_registry.get(
+                filepath, filename, columns=selected_columns, dtypes=dtypes
+            )
+        
+        x, y = pipeline.fit_transform(df_filtered, tracker=tracker)
+        del df_filtered
+        
+        # Train-test split: matris sahipliği bölmeye devredilir, ardından serbest bırakılır
+        with tracker.stage('split'):
+            train_index, test_index = split_indices(len(x), test_size)
+            matrix_store = None
+            if Config.USE_MEMMAP_MATRICES:
+                # Bölümler diske parça parça yazılır, paralel fit'ler aynı dosyayı eşler.
+                # Matris zaten MATRIX_DTYPE'ta üretildiği için yazarken dönüşüm yapılmaz.
+                matrix_store = MatrixStore(Config.MATRIX_STORAGE_PATH)
+                x_train = matrix_store.put_rows('X_train', x, train_index)
+                x_test = matrix_store.put_rows('X_test', x, test_index)
+                y_train = matrix_store.put_rows('y_train', y, train_index)
+                y_test = matrix_store.put_rows('y_test', y, test_index)
+            else:
+                x_train, x_test = x[train_index], x[test_index]
+                y_train, y_test = y[train_index], y[test_index]
+            del x
+        return x_train, x_test, y_train, y_test, matrix_store
+    
     @staticmethod
     def analyze_missing_data(df, columns):
         """Eksik veri analizini yapar"""
@@ -62,40 +199,114 @@ class DataService:
         return missing_data
     
     @staticmethod
-    def analyze_file(filepath, filename):
+    def analyze_missing_data_streaming(filepath, filename, columns, max_rows=None):
+        """Eksik veri analizini dosyayı parça parça okuyarak yapar (max_rows ile örneklem üzerinde)"""
+        profile = profile_dataset_streaming(filepath, filename, columns=columns, preview_rows=0,
+                                            max_rows=max_rows)
+        return profile.missing_data(columns), profile.rows
+    
+    @staticmethod
+    def summarize_streaming_profile(profile, total_rows=None):
+        """Parça parça çıkarılan DatasetProfile'ı profil sözlüğüne çevirir"""
+        if profile.rows == 0:
+            raise ValueError('Dosya boş veya geçersiz!')
+        total_rows = total_rows or profile.rows
+        return {
+            'columns': profile.columns,
+            'column_types': profile.column_types(),
+            'preview_data': AnalysisService.get_preview_data(profile.preview_frame()),
+            'missing_data': profile.missing_data(),
+            'shape': (total_rows, len(profile.columns)),
+            'sampled': total_rows > profile.rows
+        }
+
+    @staticmethod
+    def build_incremental_profile(filepath, filename):
+        """
+        Tam profili sürüm bazında saklanan birleştirilebilir durumdan çıkarır.
+        Satır eklenmiş sürümde üst sürümün profili sadece yeni satırlarla güncellenir.
+        """
+        profile = load_or_build_state(
+            state_kind('profile', get_columnar_sheet(filepath)),
+            dataset_registry.get_dataset_key(filepath)[0],
+            build=lambda: profile_dataset_streaming(filepath, filename),
+            update=lambda state, skip_rows: profile_dataset_streaming(
+                filepath, filename, profile=state, skip_rows=skip_rows
+            ),
+            parent=DataService.get_parent_version(filepath)
+        )
+        return DataService.summarize_streaming_profile(profile)
+
+    @staticmethod
+    def build_profile(filepath, filename, sample_rows=None):
+        """
+        Dosyanın önizleme, kolon tipi, eksik veri ve boyut bilgilerini çıkarır
+        
+        Args:
+            filepath: Dosya yolu
+            filename: Dosya adı
+            sample_rows: Verilirse sadece ilk sample_rows satır profillenir (örneklem profili).
+                Satır sayısı mümkünse Parquet metadata'sından okunur.
+        
+        Returns:
+            dict: {'columns', 'column_types', 'preview_data', 'missing_data', 'shape', 'sampled'}
+        """
+        if sample_rows is not None or is_large_file(filepath):
+            # Büyük dosyalar ve örneklem profili sınırlı bellekle parça parça okunur
+            if sample_rows is None:
+                return DataService.build_incremental_profile(filepath, filename)
+            profile = profile_dataset_streaming(filepath, filename, max_rows=sample_rows)
+            return DataService.summarize_streaming_profile(
+                profile, total_rows=count_columnar_rows(filepath) or profile.rows
+            )
+        
+        # DataFrame yükle ve doğrula
+        validation = AnalysisService.load_dataframe(filepath, filename)
+        if not validation['valid']:
+            raise ValueError(validation['message'])
+        
+        # DataFrame al ve temizle
+        df = AnalysisService.clean_dataframe(validation['dataframe'])
+        columns = df.columns.tolist()
+        return {
+            'columns': columns,
+            'column_types': AnalysisService.determine_column_types(df),
+            'preview_data': AnalysisService.get_preview_data(df),
+            'missing_data': DataService.analyze_missing_data(df, columns),
+            'shape': df.shape,
+            'sampled': False
+        }
+    
+    @staticmethod
+    def profile_to_analysis(filepath, filename, profile):
+        """Profil sözlüğünü analyze_file sonuç formatına çevirir"""
+        rows, cols = profile['shape']
+        return {
+            'success': True,
+            'message': f'Dosya başarıyla analiz edildi! ({rows} satır, {cols} kolon)',
+            'data': {
+                'filename': filename,
+                'filepath': filepath,
+                'columns': profile['columns'],
+                'column_types': profile['column_types'],
+                'preview_data': profile['preview_data'],
+                'missing_data': profile['missing_data'],
+                'df_shape': tuple(profile['shape']),
+                'sampled': profile.get('sampled', False)
+            }
+        }
+    
+    @staticmethod
+    def analyze_file(filepath, filename, sample_rows=None):
         """Dosya analizi ve kolon tipi belirleme"""
         try:
-            # DataFrame yükle ve doğrula
-            validation = AnalysisService.load_dataframe(filepath, filename)
-            if not validation['valid']:
-                return {
-                    'success': False,
-                    'message': validation['message']
-                }
-            
-            # DataFrame al ve temizle
-            df = AnalysisService.clean_dataframe(validation['dataframe'])
-            columns = df.columns.tolist()
-            
-            # Preview data hazırla
-            preview_data = AnalysisService.get_preview_data(df)
-            
-            # Kolon tiplerini belirle
-            column_types = AnalysisService.determine_column_types(df)
-            
+            profile = DataService.build_profile(filepath, filename, sample_rows=sample_rows)
+            return DataService.profile_to_analysis(filepath, filename, profile)
+        except ValueError as e:
             return {
-                'success': True,
-                'message': f'Dosya başarıyla analiz edildi! ({df.shape[0]} satır, {df.shape[1]} kolon)',
-                'data': {
-                    'filename': filename,
-                    'filepath': filepath,
-                    'columns': columns,
-                    'column_types': column_types,
-                    'preview_data': preview_data,
-                    'df_shape': df.shape
-                }
+                'success': False,
+                'message': str(e)
             }
-            
         except Exception as e:
             return {
                 'success': False,
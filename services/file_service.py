@@ -1,7 +1,20 @@
 """Dosya işlemleri servisleri"""
 import os
+import uuid
 from werkzeug.utils import secure_filename
 from config import DevelopmentConfig
+from utils.columnar_utils import (
+    convert_to_columnar, get_columnar_columns, get_columnar_path, get_columnar_sheet,
+    get_columnar_sheet_names, is_columnar_fresh, count_columnar_rows, append_columnar_part,
+    link_columnar_copy
+)
+from utils.data_utils import (
+    list_excel_sheets, sniff_csv_dialect, iter_csv_chunks, read_file_by_extension
+)
+from utils.file_utils import store_content_addressed, append_content_addressed, get_blob_path
+from models.database.crud import save_uploaded_file, get_uploaded_file, save_dataset_version
+from utils.dataset_registry import dataset_registry
+from services.profiling_job_service import ProfilingJobService
 
 class FileService:
     """Dosya işlemlerini yöneten servis sınıfı"""
@@ -22,6 +35,105 @@ class FileService:
         """Upload dosyası için tam path döner"""
         return os.path.join(DevelopmentConfig.UPLOAD_FOLDER, filename)
     
+    @staticmethod
+    def get_file_extension(filename):
+        """Dosya uzantısını nokta ile birlikte küçük harf olarak döner"""
+        return os.path.splitext(filename)[1].lower()
+    
+    @staticmethod
+    def resolve_upload_path(filename):
+        """
+        Yüklenen dosya adını içerik hash'i ile adreslenen dosya yoluna çevirir
+        
+        Eşleme bulunamazsa (bu özellikten önce yüklenmiş dosyalar) eski isim tabanlı yol döner.
+        """
+        try:
+            record = get_uploaded_file(filename)
+        except Exception:
+            record = None
+        
+        if record is None:
+            return FileService.get_upload_path(filename)
+        
+        return get_blob_path(
+            DevelopmentConfig.UPLOAD_FOLDER,
+            record['content_hash'],
+            FileService.get_file_extension(filename)
+        )
+    
+    @staticmethod
+    def create_columnar_copy(filepath, filename):
+        """
+        Yüklenen dosyanın Parquet kopyasını oluşturur
+
+        Returns:
+            str or None: Kolonsal dosya yolu, dönüştürme başarısızsa None
+        """
+        try:
+            return convert_to_columnar(filepath, filename)['columnar_path']
+        except Exception:
+            # Dönüştürme başarısız olsa da upload geçerli, okumalar ham dosyadan yapılır
+            return None
+    
+    @staticmethod
+    def is_excel_file(filename):
+        """Dosyanın Excel çalışma kitabı olup olmadığını kontrol eder"""
+        return filename.lower().endswith(('.xlsx', '.xls'))
+    
+    @staticmethod
+    def get_excel_sheet_info(filepath, filename):
+        """
+        Excel dosyasının sayfalarını ve kolonsal kopyanın üretildiği sayfayı döner
+        
+        Returns:
+            dict: {'sheets': list, 'current_sheet': str or None}
+        """
+        if not FileService.is_excel_file(filename):
+            return {'sheets': [], 'current_sheet': None}
+        sheets = get_columnar_sheet_names(filepath)
+        if sheets is None:
+            # Sayfa adları kaydedilmeden dönüştürülmüş (veya dönüştürülememiş) dosyalar
+            try:
+                sheets = list_excel_sheets(filepath, filename)
+            except Exception:
+                sheets = []
+        current_sheet = get_columnar_sheet(filepath) or (sheets[0] if sheets else None)
+        return {'sheets': sheets, 'current_sheet': current_sheet}
+    
+    @staticmethod
+    def select_excel_sheet(filepath, filename, sheet_name):
+        """
+        Seçilen Excel sayfasını kolonsal kopyaya dönüştürür
+        
+        Returns:
+            dict: {'success': bool, 'message': str}
+        """
+        try:
+            sheets = get_columnar_sheet_names(filepath)
+            if sheets is None:
+                sheets = list_excel_sheets(filepath, filename)
+            if sheet_name not in sheets:
+                return {
+                    'success': False,
+                    'message': f'Sayfa bulunamadı: {sheet_name}'
+                }
+            
+            if get_columnar_sheet(filepath) != sheet_name:
+                convert_to_columnar(filepath, filename, sheet_name=sheet_name)
+                # Önceki sayfadan okunmuş veriler önbellekte kalmasın
+                dataset_registry.invalidate(filepath)
+                ProfilingJobService.enqueue(filepath, filename, force=True)
+            
+            return {
+                'success': True,
+                'message': f'{sheet_name} sayfası seçildi.'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Sayfa dönüştürme hatası: {str(e)}'
+            }
+    
     @staticmethod
     def handle_file_upload(file):
         """
@@ -55,17 +167,38 @@ class FileService:
             # Upload klasörü oluştur
             FileService.ensure_directory(DevelopmentConfig.UPLOAD_FOLDER)
             
-            # Dosyayı kaydet
+            # Dosyayı içerik hash'i adıyla parça parça kaydet
             filename = secure_filename(file.filename)
-            filepath = FileService.get_upload_path(filename)
-            file.save(filepath)
+            stored = store_content_addressed(
+                file.stream,
+                DevelopmentConfig.UPLOAD_FOLDER,
+                FileService.get_file_extension(filename)
+            )
+            filepath = stored['path']
+            save_uploaded_file(filename, stored['content_hash'], stored['size'])
+
+            # Aynı içerik daha önce yüklendiyse türetilmiş dosyalar yeniden üretilmez
+            if is_columnar_fresh(filepath):
+                columnar_path = get_columnar_path(filepath)
+            else:
+                columnar_path = FileService.create_columnar_copy(filepath, filename)
+            
+            # Önizleme, kolon tipleri ve eksik veri istatistikleri arka planda hesaplanır
+            try:
+                ProfilingJobService.enqueue(filepath, filename, stored['content_hash'])
+            except Exception:
+                # Profil kuyruğa alınamazsa sayfalar örneklem profiline düşer
+                pass
 
             return {
                 'success': True,
-                'message': 'Dosya başarıyla yüklendi!',
+                'message': 'Dosya zaten yüklü, mevcut kopya kullanılıyor.' if stored['is_duplicate']
+                           else 'Dosya başarıyla yüklendi!',
                 'data': {
                     'filename': filename,
-                    'filepath': filepath
+                    'filepath': filepath,
+                    'content_hash': stored['content_hash'],
+                    'columnar_path': columnar_path
                 }
             } 
         except Exception as e:
@@ -73,3 +206,164 @@ class FileService:
                 'success': False,
                 'message': f'Dosya yükleme hatası: {str(e)}'
             }
+
+    @staticmethod
+    def append_to_dataset(filename, file):
+        """
+        Yüklü bir CSV veri setinin sonuna yeni satırlar ekler
+
+        Eklenen satırlar yeni bir içerik adresli sürüm oluşturur; aynı içeriği
+        paylaşan diğer isimler etkilenmez. Kolonsal kopya yeniden yazılmaz, yeni
+        satırlar ayrı bir Parquet parçası olarak eklenir. Sürüm ilişkisi kaydedildiği
+        için profil ve ön işleme istatistikleri sadece yeni satırlar okunarak güncellenir.
+
+        Args:
+            filename: Satır eklenecek veri setinin adı
+            file: Flask request.files['file'] objesi (CSV veya Excel)
+
+        Returns:
+            dict: {
+                'success': bool,
+                'message': str,
+                'data': dict or None
+            }
+        """
+        try:
+            if not file or file.filename == '':
+                return {
+                    'success': False,
+                    'message': 'Dosya seçilmedi!'
+                }
+
+            if not FileService.allowed_file(file.filename):
+                return {
+                    'success': False,
+                    'message': 'Geçersiz dosya türü. Sadece XLSX, XLS, CSV dosyaları desteklenir.'
+                }
+
+            # Satır eklemek ham dosyaya byte eklemek demek; Excel çalışma kitaplarında mümkün değil
+            if FileService.get_file_extension(filename) != '.csv':
+                return {
+                    'success': False,
+                    'message': 'Satır ekleme sadece CSV veri setlerinde desteklenir.'
+                }
+
+            filepath = FileService.resolve_upload_path(filename)
+            if not os.path.exists(filepath):
+                return {
+                    'success': False,
+                    'message': 'Dosya bulunamadı!'
+                }
+
+            dialect = sniff_csv_dialect(filepath)
+            delta = FileService._read_appended_rows(file, dialect)
+            if len(delta) == 0:
+                return {
+                    'success': False,
+                    'message': 'Eklenecek satır bulunamadı!'
+                }
+
+            # Kolonlar adla (başlıksız dosyada sırayla) eşlenir
+            base_columns = get_columnar_columns(filepath)
+            if base_columns is None:
+                base_columns = list(next(iter_csv_chunks(filepath, dialect, 1)).columns)
+            if dialect['header'] and all(col in delta.columns for col in base_columns):
+                delta = delta[base_columns]
+            elif len(delta.columns) == len(base_columns):
+                delta.columns = base_columns
+            else:
+                missing = [col for col in base_columns if col not in delta.columns]
+                return {
+                    'success': False,
+                    'message': f'Eklenen dosyada eksik kolonlar: {", ".join(missing)}'
+                }
+
+            parent_rows = count_columnar_rows(filepath)
+            if parent_rows is None:
+                parent_rows = sum(len(chunk) for chunk in iter_csv_chunks(
+                    filepath, dialect, DevelopmentConfig.STREAMING_CHUNK_ROWS))
+
+            stored = append_content_addressed(
+                filepath,
+                FileService._encode_csv_rows(filepath, delta, dialect),
+                DevelopmentConfig.UPLOAD_FOLDER,
+                FileService.get_file_extension(filename)
+            )
+            new_filepath = stored['path']
+
+            if not stored['is_duplicate']:
+                try:
+                    if not is_columnar_fresh(filepath):
+                        raise ValueError('Kolonsal kopya yok')
+                    # Mevcut Parquet dosyaları paylaşılır, sadece yeni satırlar yazılır
+                    link_columnar_copy(filepath, new_filepath)
+                    append_columnar_part(new_filepath, delta)
+                except Exception:
+                    # Şema uyuşmazlığı vb.: yeni sürüm baştan dönüştürülür
+                    FileService.create_columnar_copy(new_filepath, filename)
+                save_dataset_version(stored['content_hash'], dataset_registry.get_dataset_key(filepath)[0],
+                                     parent_rows, len(delta))
+
+            save_uploaded_file(filename, stored['content_hash'], stored['size'])
+
+            try:
+                ProfilingJobService.enqueue(new_filepath, filename, stored['content_hash'])
+            except Exception:
+                pass
+
+            total_rows = parent_rows + len(delta)
+            return {
+                'success': True,
+                'message': f'{len(delta)} satır eklendi! (toplam {total_rows} satır)',
+                'data': {
+                    'filename': filename,
+                    'filepath': new_filepath,
+                    'content_hash': stored['content_hash'],
+                    'appended_rows': len(delta),
+                    'total_rows': total_rows
+                }
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Satır ekleme hatası: {str(e)}'
+            }
+
+    @staticmethod
+    def _read_appended_rows(file, dialect):
+        """Eklenecek satırları geçici bir dosyaya kaydedip okur"""
+        FileService.ensure_directory(DevelopmentConfig.UPLOAD_FOLDER)
+        delta_filename = secure_filename(file.filename)
+        tmp_path = os.path.join(
+            DevelopmentConfig.UPLOAD_FOLDER,
+            f'.{uuid.uuid4().hex}{FileService.get_file_extension(delta_filename)}.tmp'
+        )
+        try:
+            file.save(tmp_path)
+            delta_dialect = None
+            if delta_filename.lower().endswith('.csv'):
+                delta_dialect = sniff_csv_dialect(tmp_path)
+                # Başlıksız veri setine eklenen satırların ilki başlık sayılmamalı
+                if not dialect['header']:
+                    delta_dialect['header'] = False
+            return read_file_by_extension(tmp_path, delta_filename, dialect=delta_dialect)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _encode_csv_rows(filepath, df, dialect):
+        """Satırları mevcut dosyanın ayırıcı, tırnak ve encoding'i ile başlıksız CSV byte'larına çevirir"""
+        # BOM sadece dosyanın başında olabilir
+        encoding = 'utf-8' if dialect['encoding'].startswith('utf-8') else dialect['encoding']
+        text = df.to_csv(sep=dialect['sep'], quotechar=dialect['quotechar'],
+                         header=False, index=False, lineterminator='\n')
+
+        # Son satır satır sonu ile bitmiyorsa eklenen ilk satır ona yapışmasın
+        with open(filepath, 'rb') as source:
+            source.seek(0, os.SEEK_END)
+            if source.tell() > 0:
+                source.seek(-1, os.SEEK_END)
+                if source.read(1) not in (b'\n', b'\r'):
+                    text = '\n' + text
+        return text.encode(encoding)
@@ -1,9 +1,11 @@
 """Model konfigürasyon servisleri"""
 
-import pandas as pd
-import os
-from config import DevelopmentConfig
 from services.data_service import DataService
+from services.file_service import FileService
+from services.profiling_job_service import ProfilingJobService
+from config import Config
+from utils.dataset_registry import dataset_registry
+from utils.columnar_utils import is_large_file
 
 class ModelConfigurationService:
     """Model konfigürasyon işlemlerini yöneten servis sınıfı"""
@@ -29,23 +31,28 @@ class ModelConfigurationService:
         return {'valid': True}
     
     @staticmethod
-    def analyze_missing_data_for_columns(filepath, columns):
+    def analyze_missing_data_for_columns(filepath, filename, columns):
         """Belirtilen kolonlar için eksik veri analizi yapar"""
         try:
-            df = pd.read_csv(filepath)
-            missing_data = {}
-            
-            for col in columns:
-                missing_count = df[col].isnull().sum()
-                missing_data[col] = {
-                    'count': int(missing_count),
-                    'percentage': round((missing_count / len(df)) * 100, 2)
-                }
+            ready = ProfilingJobService.get_missing_data(filepath, filename, columns)
+            if ready is not None:
+                # Arka plan profili hazırsa dosya hiç okunmaz
+                missing_data, total_rows = ready
+            elif is_large_file(filepath):
+                # Profil hazırlanırken büyük dosyalarda ilk satırlardan tahmin edilir
+                missing_data, total_rows = DataService.analyze_missing_data_streaming(
+                    filepath, filename, columns, max_rows=Config.PROFILE_SAMPLE_ROWS
+                )
+            else:
+                # Excel dahil tüm formatlar kolonsal kopyadan, sadece gereken kolonlarla okunur
+                df = dataset_registry.get(filepath, filename, columns=columns)
+                missing_data = DataService.analyze_missing_data(df, columns)
+                total_rows = len(df)
             
             return {
                 'success': True,
                 'missing_data': missing_data,
-                'total_rows': len(df)
+                'total_rows': total_rows
             }
             
         except Exception as e:
@@ -58,14 +65,14 @@ class ModelConfigurationService:
     def prepare_configuration_data(filename, target_column, feature_columns):
         """Model konfigürasyonu için gerekli verileri hazırlar"""
         # Dosya yolu oluştur
-        filepath = os.path.join(DevelopmentConfig.UPLOAD_FOLDER, filename)
+        filepath = FileService.resolve_upload_path(filename)
         
         # Tüm seçilen kolonları birleştir
         all_columns = [target_column] + feature_columns
         
         # Eksik veri analizi yap
         analysis_result = ModelConfigurationService.analyze_missing_data_for_columns(
-            filepath, all_columns
+            filepath, filename, all_columns
         )
         
         if not analysis_result['success']:
@@ -90,8 +90,7 @@ class ModelLoadingService:
                 'success': True,
                 'data': {
                     'model': globals.CURRENT_MODEL,
-                    'encoders': globals.CURRENT_ENCODERS,
-                    'scaler': globals.CURRENT_SCALER
+                    'pipeline': globals.CURRENT_PIPELINE
                 },
                 'message': 'Global model objeleri kullanıldı'
             }
@@ -14,13 +14,14 @@ class ModelService:
     
     @staticmethod
     def train_single_model(x_train, y_train, x_test, y_test, model_type, 
-                          model_params, use_grid_search=False):
+                          model_params, use_grid_search=False, dataset_key=None):
         """
         Tek model eğitimi yapar
         """
         model, y_pred, score = select_model(
             x_train, y_train, x_test, y_test, 
-            model_type, model_params, use_grid_search
+            model_type, model_params, use_grid_search,
+            dataset_key=dataset_key
         )
         
         performance = analyze_model(y_test, y_pred)
@@ -35,13 +36,15 @@ class ModelService:
         }
     
     @staticmethod
-    def train_auto_model(x_train, y_train, x_test, y_test, feature_columns=None, detailed_mode=False):
+    def train_auto_model(x_train, y_train, x_test, y_test, feature_columns=None, detailed_mode=False,
+                         dataset_key=None):
         """
         Otomatik model seçimi yapar
         """
         best_result = auto_select_best_model(
             x_train, x_test, y_train, y_test, 
-            feature_columns=feature_columns
+            feature_columns=feature_columns,
+            dataset_key=dataset_key
         )
         
         # Performance hesaplama - y_test'i parametre olarak kullan
@@ -58,7 +61,7 @@ class ModelService:
     
     @staticmethod
     def save_trained_model_complete(model_result, target_column, feature_columns, 
-                                   filename, encoders, scaler):
+                                   filename, pipeline):
         """
         Eğitilmiş modeli veritabanına ve dosya sistemine kaydeder
         """
@@ -80,8 +83,7 @@ class ModelService:
         file_paths = save_model_files(
             model_id=model_id,
             model_obj=model_result['model'],
-            encoders_obj=encoders,
-            scaler_obj=scaler
+            pipeline_obj=pipeline
         )
         
         return model_id, file_paths
@@ -92,8 +94,7 @@ class ModelService:
         
         # Global değişkenleri temizle
         globals.CURRENT_MODEL = None
-        globals.CURRENT_ENCODERS = None
-        globals.CURRENT_SCALER = None
+        globals.CURRENT_PIPELINE = None
         
         # Database bağlantısı
         from config import Config
@@ -139,4 +140,10 @@ class ModelService:
             for file in scalers_path.glob('*.pkl'):
                 file.unlink()
         
+        # Pipelines klasörü
+        pipelines_path = storage_path / Config.PIPELINE_FOLDER_NAME
+        if pipelines_path.exists():
+            for file in pipelines_path.glob('*.pkl'):
+                file.unlink()
+        
         return deleted_count
@@ -15,7 +15,7 @@ class PredictionDataProcessingService:
         Args:
             prediction_data (dict): Ham tahmin verileri
             feature_columns (list): Özellik sütunları
-            model_objects (dict): Model objeleri (model, encoders, scaler)
+            model_objects (dict): Model objeleri (model ve pipeline, eski modellerde encoders ve scaler)
             
         Returns:
             dict: İşlenmiş veri veya hata
@@ -24,6 +24,15 @@ class PredictionDataProcessingService:
             # DataFrame oluştur
             input_df = pd.DataFrame([prediction_data])
             
+            if model_objects.get('pipeline') is not None:
+                # Eğitimdeki doldurma, kırpma, kodlama ve ölçekleme tek adımda uygulanır
+                scaled_data = model_objects['pipeline'].transform(input_df)
+                return {
+                    'success': True,
+                    'data': pd.DataFrame(scaled_data, columns=feature_columns),
+                    'message': 'Veri işleme başarılı'
+                }
+            
             # Kategorik kolonları encode et
             encoded_df = PredictionDataProcessingService._encode_categorical_columns(
                 input_df, model_objects['encoders']
@@ -2,7 +2,9 @@
 
 import pandas as pd
 import numpy as np
+import os
 from utils.file_utils import load_model_files
+from utils.dataset_registry import dataset_registry
 
 class PredictionService:
     """Tahmin işlemlerini yöneten servis sınıfı"""
@@ -15,12 +17,10 @@ class PredictionService:
         # Model dosyalarını yükle
         model_files = load_model_files(model_id)
         model = model_files['model']
-        encoders = model_files['encoders']
-        scaler = model_files['scaler']
         
         # Veriyi işle
         processed_data = PredictionService._preprocess_input(
-            input_data, encoders, scaler
+            pd.DataFrame([input_data]), model_files
         )
         
         # Tahmin yap
@@ -29,11 +29,17 @@ class PredictionService:
         return prediction
     
     @staticmethod
-    def _preprocess_input(input_data, encoders, scaler):
+    def _preprocess_input(df, model_files):
         """
-        Girdi verisini model için hazırlar
+        Girdi verisini (tek satır veya batch) model için hazırlar
         """
-        df = pd.DataFrame([input_data])
+        if model_files.get('pipeline') is not None:
+            return model_files['pipeline'].transform(df)
+        
+        # Eski modeller: ayrı encoder ve scaler
+        encoders = model_files['encoders']
+        scaler = model_files['scaler']
+        df = df.copy()
         
         # Kategorik verileri encode et
         for col, encoder in encoders.items():
@@ -50,25 +56,15 @@ class PredictionService:
         """
         Toplu tahmin yapar
         """
-        # Dosyayı oku
-        df = pd.read_csv(input_file_path)
+        # Dosyayı kayıt defterinden al
+        df = dataset_registry.get(input_file_path, os.path.basename(input_file_path))
         
         # Model dosyalarını yükle
         model_files = load_model_files(model_id)
         model = model_files['model']
-        encoders = model_files['encoders']
-        scaler = model_files['scaler']
         
-        # Veriyi işle
-        processed_df = df.copy()
-        
-        # Kategorik verileri encode et
-        for col, encoder in encoders.items():
-            if col in processed_df.columns:
-                processed_df[col] = encoder.transform(processed_df[col])
-        
-        # Scaling uygula
-        scaled_data = scaler.transform(processed_df.values)
+        # Veriyi işle - pipeline ile tüm batch birkaç vektörel adımda dönüştürülür
+        scaled_data = PredictionService._preprocess_input(df, model_files)
         
         # Tahmin yap
         predictions = model.predict(scaled_data)
@@ -75,14 +75,18 @@ class PredictionValidationService:
         Returns:
             dict: Doğrulama sonucu
         """
-        required_keys = ['model', 'encoders', 'scaler']
-        
         if not model_objects:
             return {
                 'valid': False,
                 'message': 'Model objeleri bulunamadı!'
             }
         
+        # Yeni modeller tek pipeline, eski modeller ayrı encoder/scaler taşır
+        if 'pipeline' in model_objects:
+            required_keys = ['model', 'pipeline']
+        else:
+            required_keys = ['model', 'encoders', 'scaler']
+        
         missing_keys = [key for key in required_keys if key not in model_objects]
         
         if missing_keys:
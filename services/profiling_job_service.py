@@ -0,0 +1,139 @@
+"""Arka plan veri seti profilleme servisleri"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.data_service import DataService
+from utils.columnar_utils import get_columnar_sheet
+from utils.dataset_registry import dataset_registry
+from models.database.crud import save_dataset_profile, get_dataset_profile
+
+# Profilleme işleri istek thread'lerinden bağımsız, sınırlı sayıda worker'da çalışır
+_profiling_executor = ThreadPoolExecutor(max_workers=Config.PROFILING_WORKERS,
+                                         thread_name_prefix='profiling')
+# Bu süreçte kuyruğa alınmış ya da çalışan işlerin hash'leri
+_active_jobs = set()
+_active_lock = threading.Lock()
+
+class ProfilingJobService:
+    """Upload sonrası profilleme işlerini kuyruğa alan ve sonuçlarını sunan servis sınıfı"""
+
+    @staticmethod
+    def enqueue(filepath, filename, content_hash=None, force=False):
+        """
+        Dosya için profilleme işini arka planda başlatır
+
+        Args:
+            filepath: Dosya yolu
+            filename: Dosya adı
+            content_hash: Dosyanın içerik hash'i (None ise hesaplanır)
+            force: Hazır profil olsa bile yeniden hesaplanır (ör. Excel sayfası değişince)
+
+        Returns:
+            bool: İş kuyruğa alındıysa True
+        """
+        content_hash = content_hash or dataset_registry.get_dataset_key(filepath)[0]
+        sheet_name = get_columnar_sheet(filepath)
+
+        if not force:
+            record = get_dataset_profile(content_hash)
+            if record is not None and record['status'] == 'ready' \
+                    and record['sheet_name'] == sheet_name:
+                return False
+
+        with _active_lock:
+            if content_hash in _active_jobs:
+                return False
+            _active_jobs.add(content_hash)
+
+        try:
+            save_dataset_profile(content_hash, 'pending', sheet_name=sheet_name)
+            _profiling_executor.submit(
+                ProfilingJobService._run_job, filepath, filename, content_hash, sheet_name
+            )
+        except Exception:
+            with _active_lock:
+                _active_jobs.discard(content_hash)
+            raise
+        return True
+
+    @staticmethod
+    def _run_job(filepath, filename, content_hash, sheet_name):
+        """Profili hesaplayıp veritabanına yazar (worker thread'inde çalışır)"""
+        try:
+            save_dataset_profile(content_hash, 'running', sheet_name=sheet_name)
+            if DataService.get_parent_version(filepath) is not None:
+                # Satır eklenmiş sürüm: üst sürümün profili yeni satırlarla güncellenir
+                profile = DataService.build_incremental_profile(filepath, filename)
+            else:
+                profile = DataService.build_profile(filepath, filename)
+            save_dataset_profile(content_hash, 'ready', sheet_name=sheet_name, profile=profile)
+        except Exception as e:
+            save_dataset_profile(content_hash, 'failed', sheet_name=sheet_name, error=str(e))
+        finally:
+            with _active_lock:
+                _active_jobs.discard(content_hash)
+
+    @staticmethod
+    def get_ready_profile(filepath):
+        """
+        Dosyanın hazır profilini döner
+
+        Returns:
+            dict or None: Profil henüz hazır değilse, başarısızsa veya başka
+                bir Excel sayfasına aitse None
+        """
+        content_hash = dataset_registry.get_dataset_key(filepath)[0]
+        record = get_dataset_profile(content_hash)
+        if record is None or record['status'] != 'ready':
+            return None
+        if record['sheet_name'] != get_columnar_sheet(filepath):
+            return None
+        return {
+            'columns': record['columns'],
+            'column_types': record['column_types'],
+            'preview_data': record['preview_data'],
+            'missing_data': record['missing_data'],
+            'shape': (record['row_count'], record['column_count']),
+            'sampled': False
+        }
+
+    @staticmethod
+    def get_analysis(filepath, filename):
+        """
+        Dosya analizini hazır profilden sunar; profil hazır değilse işi
+        (gerekirse yeniden) kuyruğa alıp örneklem profili döner
+
+        Returns:
+            dict: DataService.analyze_file ile aynı format
+        """
+        try:
+            profile = ProfilingJobService.get_ready_profile(filepath)
+        except Exception:
+            profile = None
+
+        if profile is not None:
+            return DataService.profile_to_analysis(filepath, filename, profile)
+
+        try:
+            # Sunucu yeniden başladıysa yarım kalan işler burada tekrar başlatılır
+            ProfilingJobService.enqueue(filepath, filename)
+        except Exception:
+            pass
+        return DataService.analyze_file(filepath, filename, sample_rows=Config.PROFILE_SAMPLE_ROWS)
+
+    @staticmethod
+    def get_missing_data(filepath, filename, columns):
+        """
+        Seçilen kolonların eksik veri bilgisini hazır profilden döner
+
+        Returns:
+            tuple or None: (missing_data, total_rows); profil hazır değilse None
+        """
+        try:
+            profile = ProfilingJobService.get_ready_profile(filepath)
+        except Exception:
+            return None
+
+        if profile is None or not all(col in profile['missing_data'] for col in columns):
+            return None
+        return {col: profile['missing_data'][col] for col in columns}, profile['shape'][0]
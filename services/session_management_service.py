@@ -3,6 +3,7 @@ Session Management Service - Session verilerini yönetme
 """
 import pandas as pd
 import os
+from services.file_service import FileService
 
 
 class SessionManagementService:
@@ -42,7 +43,7 @@ class SessionManagementService:
             }
         
         # Dosya varlığını kontrol et
-        filepath = os.path.join('storage/uploads', filename)
+        filepath = FileService.resolve_upload_path(filename)
         if not os.path.exists(filepath):
             return {
                 'valid': False,
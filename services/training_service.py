@@ -1,10 +1,9 @@
 """
 Training Service - Core model eğitimi işlemleri
 """
-import os
 from services.data_service import DataService
 from services.model_service import ModelService
-from utils.data_utils import read_file_by_extension
+from services.file_service import FileService
 from utils import globals
 
 
@@ -27,8 +26,7 @@ class TrainingService:
             dict: İşlenmiş veri
         """
         try:
-            filepath = os.path.join('storage/uploads', filename)
-            df = read_file_by_extension(filepath, filename)
+            filepath = FileService.resolve_upload_path(filename)
             
             # Veri işleme - DataService kullan
             processed_data = DataService.process_uploaded_file(
@@ -67,7 +65,8 @@ class TrainingService:
                 result = ModelService.train_auto_model(
                     processed_data['X_train'], processed_data['y_train'],
                     processed_data['X_test'], processed_data['y_test'],
-                    detailed_mode=training_params['use_detailed_mode']
+                    detailed_mode=training_params['use_detailed_mode'],
+                    dataset_key=processed_data.get('dataset_key')
                 )
                 # Auto seçimde model tipini güncelle
                 training_params['model_type'] = result['model_type']
@@ -77,13 +76,16 @@ class TrainingService:
                     processed_data['X_test'], processed_data['y_test'],
                     training_params['model_type'], 
                     training_params['model_params'], 
-                    training_params['use_grid_search']
+                    training_params['use_grid_search'],
+                    dataset_key=processed_data.get('dataset_key')
                 )
             
             return {
                 'success': True,
                 'result': result,
                 'model_type': training_params['model_type'],
+                # Ön işleme adımlarının ayırdığı ve tepe bellek (TRACK_PREPROCESSING_MEMORY)
+                'memory_report': processed_data.get('memory_report'),
                 'message': 'Model eğitimi başarılı'
             }
             
@@ -113,13 +115,12 @@ class TrainingService:
         try:
             # Global değişkenleri ayarla
             globals.CURRENT_MODEL = result['model']
-            globals.CURRENT_ENCODERS = processed_data['encoders']
-            globals.CURRENT_SCALER = processed_data['scaler']
+            globals.CURRENT_PIPELINE = processed_data['pipeline']
             
             # Model kaydetme - ModelService kullan
             model_id, file_paths = ModelService.save_trained_model_complete(
                 result, target_column, feature_columns, filename,
-                processed_data['encoders'], processed_data['scaler']
+                processed_data['pipeline']
             )
             
             return {
@@ -136,3 +137,15 @@ class TrainingService:
                 'file_paths': None,
                 'message': f'Model kaydetme hatası: {str(e)}'
             }
+    
+    @staticmethod
+    def release_training_data(processed_data):
+        """
+        Eğitim bittikten sonra memmap matris dosyalarını siler
+        
+        Args:
+            processed_data (dict): İşlenmiş veri
+        """
+        matrix_store = (processed_data or {}).get('matrix_store')
+        if matrix_store is not None:
+            matrix_store.cleanup()
@@ -55,29 +55,33 @@ class TrainingWorkflowService:
                 data_result['message'], 'configure_model.configure_model'
             )
         
-        # 6. Model eğit
-        training_result = TrainingService.train_model_with_parameters(
-            data_result['data'], training_params
-        )
-        
-        if not training_result['success']:
-            return TrainingWorkflowService._create_error_response(
-                training_result['message'], 'configure_model.configure_model'
+        try:
+            # 6. Model eğit
+            training_result = TrainingService.train_model_with_parameters(
+                data_result['data'], training_params
             )
-        
-        # 7. Sonuçları kaydet
-        save_result = TrainingService.save_training_results(
-            training_result['result'], 
-            session_params['target_column'], 
-            session_params['feature_columns'],
-            session_params['filename'], 
-            data_result['data']
-        )
-        
-        if not save_result['success']:
-            return TrainingWorkflowService._create_error_response(
-                save_result['message'], 'configure_model.configure_model'
+            
+            if not training_result['success']:
+                return TrainingWorkflowService._create_error_response(
+                    training_result['message'], 'configure_model.configure_model'
+                )
+            
+            # 7. Sonuçları kaydet
+            save_result = TrainingService.save_training_results(
+                training_result['result'], 
+                session_params['target_column'], 
+                session_params['feature_columns'],
+                session_params['filename'], 
+                data_result['data']
             )
+            
+            if not save_result['success']:
+                return TrainingWorkflowService._create_error_response(
+                    save_result['message'], 'configure_model.configure_model'
+                )
+        finally:
+            # Memmap matris dosyaları eğitim ve kayıttan sonra gerekmez
+            TrainingService.release_training_data(data_result['data'])
         
         # 8. Session verilerini hazırla
         session_updates = SessionManagementService.prepare_training_session_data(
@@ -95,6 +99,7 @@ class TrainingWorkflowService:
             'success': True,
             'session_updates': session_updates,
             'performance': training_result['result']['performance'],
+            'memory_report': training_result['memory_report'],
             'message': 'Model eğitimi başarıyla tamamlandı'
         }
     
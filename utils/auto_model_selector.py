@@ -3,7 +3,6 @@ Otomatik En İyi Model Seçici
 Tüm algoritmaları test ederek en iyi performansı veren modeli ve parametrelerini bulur.
 """
 
-from sklearn.model_selection import GridSearchCV, cross_val_score
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 from sklearn.neighbors import KNeighborsRegressor
@@ -13,15 +12,187 @@ from sklearn.ensemble import RandomForestRegressor
 import xgboost as xgb
 import lightgbm as lgb
 import numpy as np
-import pandas as pd
-import time
 import sys
 import io
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
 import signal
+from config import Config
+from utils.memmap_utils import memmap_like
+from utils.search_utils import load_trial_history, plan_search, save_trial_history
+from utils.tournament import Candidate, TournamentScheduler
 
+# ULTRA HIZLI mod parametre gridleri (massive dataset için)
+ULTRA_MINIMAL_PARAMS = {
+    'linear_regression': {'fit_intercept': [True]},
+    'ridge': {'alpha': [1.0]},
+    'lasso': {'alpha': [1.0]},
+    'elasticnet': {'alpha': [1.0], 'l1_ratio': [0.5]},
+    'knn': {'n_neighbors': [5]},
+    'svr': {'C': [1.0], 'gamma': ['scale']},
+    'decision_tree': {'max_depth': [10]},
+    'random_forest': {'n_estimators': [50], 'max_depth': [10]},
+    'xgboost': {'n_estimators': [50], 'learning_rate': [0.1], 'max_depth': [6]},
+    'lightgbm': {'n_estimators': [50], 'learning_rate': [0.1], 'max_depth': [10]}
+}
 
-def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=None, timeout_seconds=300):
+# Ultra hızlı mod parametre gridleri (büyük dataset için)
+ULTRA_FAST_PARAMS = {
+    'linear_regression': {'fit_intercept': [True, False]},
+    'ridge': {'alpha': [1.0, 10.0]},
+    'lasso': {'alpha': [1.0, 10.0]},
+    'elasticnet': {'alpha': [1.0], 'l1_ratio': [0.5, 0.7]},
+    'knn': {'n_neighbors': [5, 10]},
+    'svr': {'C': [1.0], 'gamma': ['scale']},
+    'decision_tree': {'max_depth': [10, 15]},
+    'random_forest': {'n_estimators': [50, 100], 'max_depth': [10]},
+    'xgboost': {'n_estimators': [50, 100], 'learning_rate': [0.1], 'max_depth': [6]},
+    'lightgbm': {'n_estimators': [50, 100], 'learning_rate': [0.1], 'max_depth': [10]}
+}
+
+# Hızlı mod parametre gridleri
+FAST_PARAMS = {
+    'linear_regression': {
+        'fit_intercept': [True, False],
+        'positive': [True, False]
+    },
+    'ridge': {
+        'alpha': [0.1, 1.0, 10.0, 100.0],
+        'solver': ['auto', 'svd', 'cholesky']
+    },
+    'lasso': {
+        'alpha': [0.1, 1.0, 10.0, 100.0],
+        'max_iter': [1000, 2000, 5000]
+    },
+    'elasticnet': {
+        'alpha': [0.1, 1.0, 10.0],
+        'l1_ratio': [0.1, 0.5, 0.7, 0.9]
+    },
+    'knn': {
+        'n_neighbors': [3, 5, 7, 10],
+        'weights': ['uniform', 'distance']
+    },
+    'svr': {
+        'C': [0.1, 1.0, 10.0],
+        'gamma': ['scale', 'auto']
+    },
+    'decision_tree': {
+        'max_depth': [None, 5, 10, 15],
+        'min_samples_leaf': [1, 2, 4, 8]
+    },
+    'random_forest': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [None, 5, 10, 15]
+    },
+    'xgboost': {
+        'n_estimators': [50, 100, 200],
+        'learning_rate': [0.01, 0.1, 0.2],
+        'max_depth': [3, 6, 9]
+    },
+    'lightgbm': {
+        'n_estimators': [50, 100, 200],
+        'learning_rate': [0.01, 0.1, 0.2],
+        'max_depth': [-1, 5, 10, 15]
+    }
+}
+
+# Detaylı mod parametre gridleri (daha kapsamlı)
+DETAILED_PARAMS = {
+    'linear_regression': {
+        'fit_intercept': [True, False],
+        'positive': [True, False]
+    },
+    'ridge': {
+        'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
+        'solver': ['auto', 'svd', 'cholesky', 'lsqr']
+    },
+    'lasso': {
+        'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
+        'max_iter': [1000, 2000, 3000, 5000, 8000]
+    },
+    'elasticnet': {
+        'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0],
+        'l1_ratio': [0.1, 0.3, 0.5, 0.7, 0.9, 0.95]
+    },
+    'knn': {
+        'n_neighbors': [3, 5, 7, 9, 11, 15, 20],
+        'weights': ['uniform', 'distance'],
+        'algorithm': ['auto', 'ball_tree', 'kd_tree']
+    },
+    'svr': {
+        'C': [0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
+        'gamma': ['scale', 'auto'],
+        'kernel': ['rbf', 'linear', 'poly']
+    },
+    'decision_tree': {
+        'max_depth': [None, 3, 5, 7, 10, 15, 20],
+        'min_samples_leaf': [1, 2, 4, 6, 8, 12],
+        'min_samples_split': [2, 5, 10, 15]
+    },
+    'random_forest': {
+        'n_estimators': [50, 100, 150, 200, 300, 400],
+        'max_depth': [None, 5, 10, 15, 20, 25],
+        'min_samples_leaf': [1, 2, 4, 6]
+    },
+    'xgboost': {
+        'n_estimators': [50, 100, 150, 200, 300, 400],
+        'learning_rate': [0.01, 0.05, 0.1, 0.15, 0.2, 0.3],
+        'max_depth': [3, 4, 5, 6, 7, 8, 9],
+        'subsample': [0.8, 0.9, 1.0]
+    },
+    'lightgbm': {
+        'n_estimators': [50, 100, 150, 200, 300, 400],
+        'learning_rate': [0.01, 0.05, 0.1, 0.15, 0.2, 0.3],
+        'max_depth': [-1, 5, 7, 10, 15, 20],
+        'num_leaves': [31, 50, 100, 150]
+    }
+}
+
+def create_models_config(param_grids):
+    """Tüm modeller ve verilen moddaki parametre gridleri"""
+    return {
+        'linear_regression': {
+            'model': LinearRegression(),
+            'params': param_grids['linear_regression']
+        },
+        'ridge': {
+            'model': Ridge(),
+            'params': param_grids['ridge']
+        },
+        'lasso': {
+            'model': Lasso(),
+            'params': param_grids['lasso']
+        },
+        'elasticnet': {
+            'model': ElasticNet(),
+            'params': param_grids['elasticnet']
+        },
+        'knn': {
+            'model': KNeighborsRegressor(),
+            'params': param_grids['knn']
+        },
+        'svr': {
+            'model': SVR(),
+            'params': param_grids['svr']
+        },
+        'decision_tree': {
+            'model': DecisionTreeRegressor(),
+            'params': param_grids['decision_tree']
+        },
+        'random_forest': {
+            'model': RandomForestRegressor(),
+            'params': param_grids['random_forest']
+        },
+        'xgboost': {
+            'model': xgb.XGBRegressor(),
+            'params': param_grids['xgboost']
+        },
+        'lightgbm': {
+            'model': lgb.LGBMRegressor(verbose=-1),
+            'params': param_grids['lightgbm']
+        }
+    }
+
+def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=None, timeout_seconds=300,
+                           dataset_key=None):
     """
     Tüm mevcut algoritmaları test ederek en iyi performansı veren modeli bulur.
     
@@ -33,6 +204,9 @@ def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=Non
         cv_folds: Cross-validation fold sayısı
         detailed_mode: Detaylı mod (daha fazla parametre kombinasyonu)
         max_time_per_model: Her model için maksimum süre (saniye)
+        timeout_seconds: Küçük ve orta boy veri setlerinde model başına süre sınırı
+        dataset_key: Veri seti ve ön işleme ayarlarının anahtarı; bayes aramasında
+            önceki çalıştırmaların denemeleri bu anahtarla okunur ve kaydedilir
     
     Returns:
         dict: En iyi model bilgileri
@@ -57,9 +231,11 @@ def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=Non
         cv_folds = 3
     elif is_large_dataset:
         detailed_mode = False
+        max_time_per_model = timeout_seconds
         cv_folds = 3
     else:
         detailed_mode = True
+        max_time_per_model = timeout_seconds
         cv_folds = 5
     
     # Sampling fonksiyonu
@@ -82,195 +258,43 @@ def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=Non
         x_train_work, y_train_work, x_test_work, y_test_work = smart_sample(
             x_train, y_train, x_test, y_test, sample_size=80000
         )
+        # Örneklem de ana matrislerin yanına memmap olarak yazılır; aksi halde joblib
+        # her GridSearchCV çağrısında örneklemi yeniden kopyalar
+        x_train_work = memmap_like(x_train_work, x_train, 'X_train_work')
+        y_train_work = memmap_like(y_train_work, x_train, 'y_train_work')
     else:
         x_train_work, y_train_work, x_test_work, y_test_work = x_train, y_train, x_test, y_test
     
-    # ULTRA HIZLI mod parametre gridleri (massive dataset için)
-    ultra_minimal_params = {
-        'linear_regression': {'fit_intercept': [True]},
-        'ridge': {'alpha': [1.0]},
-        'lasso': {'alpha': [1.0]},
-        'elasticnet': {'alpha': [1.0], 'l1_ratio': [0.5]},
-        'knn': {'n_neighbors': [5]},
-        'svr': {'C': [1.0], 'gamma': ['scale']},
-        'decision_tree': {'max_depth': [10]},
-        'random_forest': {'n_estimators': [50], 'max_depth': [10]},
-        'xgboost': {'n_estimators': [50], 'learning_rate': [0.1], 'max_depth': [6]},
-        'lightgbm': {'n_estimators': [50], 'learning_rate': [0.1], 'max_depth': [10]}
-    }
-    
-    # Ultra hızlı mod parametre gridleri (büyük dataset için)
-    ultra_fast_params = {
-        'linear_regression': {'fit_intercept': [True, False]},
-        'ridge': {'alpha': [1.0, 10.0]},
-        'lasso': {'alpha': [1.0, 10.0]},
-        'elasticnet': {'alpha': [1.0], 'l1_ratio': [0.5, 0.7]},
-        'knn': {'n_neighbors': [5, 10]},
-        'svr': {'C': [1.0], 'gamma': ['scale']},
-        'decision_tree': {'max_depth': [10, 15]},
-        'random_forest': {'n_estimators': [50, 100], 'max_depth': [10]},
-        'xgboost': {'n_estimators': [50, 100], 'learning_rate': [0.1], 'max_depth': [6]},
-        'lightgbm': {'n_estimators': [50, 100], 'learning_rate': [0.1], 'max_depth': [10]}
-    }
-    
-    # Hızlı mod parametre gridleri
-    fast_params = {
-        'linear_regression': {
-            'fit_intercept': [True, False],
-            'positive': [True, False]
-        },
-        'ridge': {
-            'alpha': [0.1, 1.0, 10.0, 100.0],
-            'solver': ['auto', 'svd', 'cholesky']
-        },
-        'lasso': {
-            'alpha': [0.1, 1.0, 10.0, 100.0],
-            'max_iter': [1000, 2000, 5000]
-        },
-        'elasticnet': {
-            'alpha': [0.1, 1.0, 10.0],
-            'l1_ratio': [0.1, 0.5, 0.7, 0.9]
-        },
-        'knn': {
-            'n_neighbors': [3, 5, 7, 10],
-            'weights': ['uniform', 'distance']
-        },
-        'svr': {
-            'C': [0.1, 1.0, 10.0],
-            'gamma': ['scale', 'auto']
-        },
-        'decision_tree': {
-            'max_depth': [None, 5, 10, 15],
-            'min_samples_leaf': [1, 2, 4, 8]
-        },
-        'random_forest': {
-            'n_estimators': [50, 100, 200],
-            'max_depth': [None, 5, 10, 15]
-        },
-        'xgboost': {
-            'n_estimators': [50, 100, 200],
-            'learning_rate': [0.01, 0.1, 0.2],
-            'max_depth': [3, 6, 9]
-        },
-        'lightgbm': {
-            'n_estimators': [50, 100, 200],
-            'learning_rate': [0.01, 0.1, 0.2],
-            'max_depth': [-1, 5, 10, 15]
-        }
-    }
-    
-    # Detaylı mod parametre gridleri (daha kapsamlı)
-    detailed_params = {
-        'linear_regression': {
-            'fit_intercept': [True, False],
-            'positive': [True, False]
-        },
-        'ridge': {
-            'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
-            'solver': ['auto', 'svd', 'cholesky', 'lsqr']
-        },
-        'lasso': {
-            'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
-            'max_iter': [1000, 2000, 3000, 5000, 8000]
-        },
-        'elasticnet': {
-            'alpha': [0.01, 0.1, 0.5, 1.0, 5.0, 10.0],
-            'l1_ratio': [0.1, 0.3, 0.5, 0.7, 0.9, 0.95]
-        },
-        'knn': {
-            'n_neighbors': [3, 5, 7, 9, 11, 15, 20],
-            'weights': ['uniform', 'distance'],
-            'algorithm': ['auto', 'ball_tree', 'kd_tree']
-        },
-        'svr': {
-            'C': [0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0],
-            'gamma': ['scale', 'auto'],
-            'kernel': ['rbf', 'linear', 'poly']
-        },
-        'decision_tree': {
-            'max_depth': [None, 3, 5, 7, 10, 15, 20],
-            'min_samples_leaf': [1, 2, 4, 6, 8, 12],
-            'min_samples_split': [2, 5, 10, 15]
-        },
-        'random_forest': {
-            'n_estimators': [50, 100, 150, 200, 300, 400],
-            'max_depth': [None, 5, 10, 15, 20, 25],
-            'min_samples_leaf': [1, 2, 4, 6]
-        },
-        'xgboost': {
-            'n_estimators': [50, 100, 150, 200, 300, 400],
-            'learning_rate': [0.01, 0.05, 0.1, 0.15, 0.2, 0.3],
-            'max_depth': [3, 4, 5, 6, 7, 8, 9],
-            'subsample': [0.8, 0.9, 1.0]
-        },
-        'lightgbm': {
-            'n_estimators': [50, 100, 150, 200, 300, 400],
-            'learning_rate': [0.01, 0.05, 0.1, 0.15, 0.2, 0.3],
-            'max_depth': [-1, 5, 7, 10, 15, 20],
-            'num_leaves': [31, 50, 100, 150]
-        }
-    }
-    
     # Parametre gridini seç - daha agresif
     if is_massive_dataset:
-        param_grids = ultra_minimal_params
+        param_grids = ULTRA_MINIMAL_PARAMS
         cv_folds = 2
         mode_text = "🔥 ULTRA MİNİMAL MOD (300K+ Dataset)"
     elif is_huge_dataset:
-        param_grids = ultra_fast_params
+        param_grids = ULTRA_FAST_PARAMS
         cv_folds = 3
         mode_text = "⚡ ULTRA HIZLI MOD (100K+ Dataset)"
     elif is_large_dataset:
-        param_grids = ultra_fast_params
+        param_grids = ULTRA_FAST_PARAMS
         cv_folds = 3
         mode_text = "🚀 HIZLI MOD (30K+ Dataset)"
     else:
-        param_grids = detailed_params if detailed_mode else fast_params
+        param_grids = DETAILED_PARAMS if detailed_mode else FAST_PARAMS
         mode_text = "📊 DETAYLI MOD" if detailed_mode else "⚡ STANDART MOD"
     
+    # Bayes aramasında büyük veri setleri sabit küçük grid'ler yerine geniş uzayda
+    # az sayıda seçilmiş deneme yapar
+    use_bayes = Config.HYPERPARAM_SEARCH == 'bayes'
+    max_trials = None
+    if use_bayes and is_large_dataset:
+        param_grids = FAST_PARAMS
+        max_trials = Config.BAYES_LARGE_MAX_TRIALS
+    # Aynı veri setindeki önceki denemeler; auto seçimde arama verisi örneklem olabileceği
+    # için 'grid' geçmişinden ayrı tutulur
+    history = load_trial_history(dataset_key, 'auto') if use_bayes else None
+    
     # Tüm modeller ve seçilen parametre gridleri
-    models_config = {
-        'linear_regression': {
-            'model': LinearRegression(),
-            'params': param_grids['linear_regression']
-        },
-        'ridge': {
-            'model': Ridge(),
-            'params': param_grids['ridge']
-        },
-        'lasso': {
-            'model': Lasso(),
-            'params': param_grids['lasso']
-        },
-        'elasticnet': {
-            'model': ElasticNet(),
-            'params': param_grids['elasticnet']
-        },
-        'knn': {
-            'model': KNeighborsRegressor(),
-            'params': param_grids['knn']
-        },
-        'svr': {
-            'model': SVR(),
-            'params': param_grids['svr']
-        },
-        'decision_tree': {
-            'model': DecisionTreeRegressor(),
-            'params': param_grids['decision_tree']
-        },
-        'random_forest': {
-            'model': RandomForestRegressor(),
-            'params': param_grids['random_forest']
-        },
-        'xgboost': {
-            'model': xgb.XGBRegressor(),
-            'params': param_grids['xgboost']
-        },
-        'lightgbm': {
-            'model': lgb.LGBMRegressor(verbose=-1),
-            'params': param_grids['lightgbm']
-        }
-    }
+    models_config = create_models_config(param_grids)
     
     # Akıllı model sıralaması - hızlı modeller önce
     model_order = [
@@ -286,163 +310,138 @@ def auto_select_best_model(x_train, x_test, y_train, y_test, feature_columns=Non
     ]
     
     # Erken durma için baseline belirleme
-    baseline_r2 = -float('inf')
     early_stop_threshold = 0.1  # R2 < 0.1 ise modeli atla
-    models_tested = 0
     max_models_to_test = 6 if is_massive_dataset else 8 if is_huge_dataset else 10
     
-    results = []
-    total_start_time = time.time()
-    
-    
-    def train_single_model(model_name, config):
-        """Tek model eğitimi - timeout ile"""
-        try:
-            start_time = time.time()
-            
-            # GridSearchCV ile en iyi parametreleri bul
-            grid_search = GridSearchCV(
-                config['model'],
-                config['params'],
-                cv=cv_folds,
-                scoring='r2',
-                n_jobs=-1,
-                verbose=0
-            )
-            
+    # Büyük dataset ise parametre araması örneklemde, final model tam veri ile eğitilir.
+    # Örneklemdeki ara eğitim final eğitimiyle ezileceği için yapılmaz; CV skorları
+    # arama verisinde hesaplandığından en iyi kombinasyonun arama fold'ları yeniden kullanılır
+    final_data = [('X_train', 'y_train')]
+    score_data = ('X_train_work', 'y_train_work')
+    
+    # Tüm adayların CV fit'leri tek çekirdek bütçesi altında aynı anda çalışır
+    candidates = [
+        Candidate(
+            model_name,
+            models_config[model_name]['model'],
+            models_config[model_name]['params'],
+            cv_folds,
+            search_data=('X_train_work', 'y_train_work'),
+            final_data=final_data,
+            score_data=score_data,
             # LGBMRegressor için DataFrame kullan
-            if model_name == 'lightgbm':
-                # DataFrame'e çevir
-                x_train_work_df = pd.DataFrame(x_train_work, columns=feature_columns)
-                y_train_work_df = pd.Series(y_train_work)
-                
-                grid_search.fit(x_train_work_df, y_train_work_df)
-                
-                # En iyi modeli test et
-                best_model = grid_search.best_estimator_
-                
-                # Büyük dataset ise final modeli tam veri ile eğit
-                if is_huge_dataset or is_massive_dataset:
-                    x_train_df = pd.DataFrame(x_train, columns=feature_columns)
-                    y_train_df = pd.Series(y_train)
-                    best_model.fit(x_train_df, y_train_df)
-                
-                x_test_df = pd.DataFrame(x_test, columns=feature_columns)
-                y_pred = best_model.predict(x_test_df)
-            else:
-                grid_search.fit(x_train_work, y_train_work)
-                
-                # En iyi modeli test et
-                best_model = grid_search.best_estimator_
-                
-                # Büyük dataset ise final modeli tam veri ile eğit
-                if is_huge_dataset or is_massive_dataset:
-                    best_model.fit(x_train, y_train)
-                
-                y_pred = best_model.predict(x_test)
-            
-            # Performans metrikleri hesapla
-            from sklearn.metrics import r2_score as r2_metric
-            r2 = r2_metric(y_test, y_pred)
+            columns=list(feature_columns) if model_name == 'lightgbm' and feature_columns is not None else None,
+            time_budget=max_time_per_model,
+            # Config.HYPERPARAM_SEARCH'e göre tüm grid, successive halving turları veya
+            # bayes denemeleri; bayes yeni deneme başlatmayı süre sınırının yarısında bırakır
+            plan=plan_search(models_config[model_name]['params'], len(x_train_work), cv_folds,
+                             max_trials=max_trials,
+                             time_budget=max_time_per_model / 2 if use_bayes and max_time_per_model else None,
+                             trials=history.for_model(model_name, cv_folds) if use_bayes else None)
+        )
+        for model_name in model_order if model_name in models_config
+    ]
+    
+    evaluated = {}
+    
+    def evaluate(candidate):
+        """Biten adayın test metrikleri"""
+        if candidate.name not in evaluated:
+            y_pred = candidate.final['predictions']
             mse = mean_squared_error(y_test, y_pred)
-            mae = mean_absolute_error(y_test, y_pred)
-            rmse = np.sqrt(mse)
-            
-            # Cross-validation skoru
-            if model_name == 'lightgbm':
-                cv_data_x = x_train_work_df if (is_huge_dataset or is_massive_dataset) else pd.DataFrame(x_train, columns=feature_columns)
-                cv_data_y = y_train_work_df if (is_huge_dataset or is_massive_dataset) else pd.Series(y_train)
-            else:
-                cv_data_x = x_train_work if (is_huge_dataset or is_massive_dataset) else x_train
-                cv_data_y = y_train_work if (is_huge_dataset or is_massive_dataset) else y_train
-            cv_scores = cross_val_score(best_model, cv_data_x, cv_data_y, cv=cv_folds, scoring='r2')
-            cv_mean = cv_scores.mean()
-            cv_std = cv_scores.std()
-            
-            elapsed_time = time.time() - start_time
-            
-            return {
-                'model_name': model_name,
-                'model': best_model,
-                'best_params': grid_search.best_params_,
-                'r2_score': r2,
+            evaluated[candidate.name] = {
+                'model_name': candidate.name,
+                'model': candidate.final['model'],
+                'best_params': candidate.best_params,
+                'r2_score': r2_score(y_test, y_pred),
                 'mse': mse,
-                'mae': mae,
-                'rmse': rmse,
-                'cv_mean': cv_mean,
-                'cv_std': cv_std,
-                'training_time': elapsed_time,
+                'mae': mean_absolute_error(y_test, y_pred),
+                'rmse': np.sqrt(mse),
+                'cv_mean': candidate.score_scores.mean(),
+                'cv_std': candidate.score_scores.std(),
+                'training_time': candidate.finished_at - candidate.started_at,
+                'n_fits': candidate.fits,
+                'n_fits_saved': candidate.fits_saved,
                 'predictions': y_pred,
                 'success': True
             }
-            
-        except Exception as e:
-            return {
-                'model_name': model_name,
-                'error': str(e),
-                'success': False
-            }
+        return evaluated[candidate.name]
     
-    # Modelleri sıralı olarak test et (erken durma ile)
-    for model_name in model_order:
-        if model_name not in models_config:
-            continue
-            
-        if models_tested >= max_models_to_test:
-            break
-            
-        config = models_config[model_name]
-        try:
-            
-            # Timeout ile model eğitimi
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(train_single_model, model_name, config)
-                try:
-                    result = future.result(timeout=max_time_per_model)
-                    
-                    if result['success']:
-                        r2_score = result['r2_score']
-                        
-                        # Erken durma kontrolü
-                        if r2_score < early_stop_threshold and models_tested > 2:
-                            continue
-                        
-                        results.append(result)
-                        models_tested += 1
-                        
-                        # Baseline güncelle
-                        if r2_score > baseline_r2:
-                            baseline_r2 = r2_score
-                        
-                        elapsed = result['training_time']
-                        
-                        # Çok iyi sonuç varsa erken bitir
-                        if r2_score > 0.95 and models_tested >= 3:
-                            break
-                            
-                    else:
-                        pass
-                        
-                except TimeoutError:
-                    future.cancel()
-                    continue
-                    
-        except Exception as e:
-            continue
-    
-    total_elapsed = time.time() - total_start_time
+    def accept_results(candidates):
+        """
+        Sıralı çalıştırmadaki erken durma kurallarını model sırasıyla uygular.
+        Sırada henüz bitmemiş bir aday varsa değerlendirme orada durur.
+        
+        Returns:
+            tuple: (kabul edilen sonuçlar, kalan adaylar iptal edilmeli mi)
+        """
+        accepted = []
+        for candidate in candidates:
+            if len(accepted) >= max_models_to_test:
+                return accepted, True
+            if not candidate.is_finished:
+                return accepted, False
+            if candidate.status != 'done':
+                continue
+            result = evaluate(candidate)
+            # Erken durma kontrolü
+            if result['r2_score'] < early_stop_threshold and len(accepted) > 2:
+                continue
+            accepted.append(result)
+            # Çok iyi sonuç varsa erken bitir
+            if result['r2_score'] > 0.95 and len(accepted) >= 3:
+                return accepted, True
+        return accepted, False
+    
+    scheduler = TournamentScheduler({
+        'X_train': x_train,
+        'y_train': y_train,
+        'X_test': x_test,
+        'X_train_work': x_train_work,
+        'y_train_work': y_train_work
+    })
+    # Erken durma eşiğinin altında kalan model, sıralı çalıştırmadaki gibi sayılmaz;
+    # yerine sıradaki model denenir
+    scheduler.run(candidates, should_stop=lambda candidates: accept_results(candidates)[1],
+                  max_admitted=max_models_to_test,
+                  is_rejected=lambda candidate: evaluate(candidate)['r2_score'] < early_stop_threshold)
+    results, _ = accept_results(candidates)
+    
+    if history is not None:
+        # Süresi dolan veya iptal edilen adayların tamamlanan denemeleri de saklanır
+        for candidate in candidates:
+            for params, fold_scores in candidate.new_trials():
+                history.add(candidate.name, params, fold_scores)
+        save_trial_history(dataset_key, 'auto', history)
     
     # Sonuçları R² skoruna göre sırala (en yüksekten en düşüğe)
     results.sort(key=lambda x: x['r2_score'], reverse=True)
     
     if not results:
-        raise Exception("Hiçbir model başarıyla eğitilemedi!")
+        errors = '; '.join(f'{candidate.name}: {candidate.error}' for candidate in candidates
+                           if candidate.status == 'failed')
+        raise Exception(f"Hiçbir model başarıyla eğitilemedi! {errors}".strip())
     
     best_result = results[0]
     
     
     # Tüm sonuçları da döndür (karşılaştırma için)
     best_result['all_results'] = results
+    # Çekirdek kullanımı: toplam CPU işi / (süre x çekirdek bütçesi) ve tekrar
+    # fit edilmeyen CV fit sayısı
+    best_result['tournament'] = scheduler.stats
+    # Süresi dolan, başarısız olan veya iptal edilen modeller ve yarıda kalan CV sonuçları
+    best_result['failed_models'] = [
+        {
+            'model_name': candidate.name,
+            'status': 'timeout' if candidate.timed_out else candidate.status,
+            'error': candidate.error,
+            'training_time': candidate.finished_at - candidate.started_at,
+            **candidate.partial_results()
+        }
+        for candidate in candidates
+        if candidate.status in ('failed', 'cancelled') and candidate.started_at is not None
+    ]
     
     return best_result
 
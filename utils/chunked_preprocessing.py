@@ -0,0 +1,272 @@
+"""
+Belleğe sığmayan veri setleri için parça parça (out-of-core) ön işleme
+
+1. geçiş: doldurma istatistikleri, kategori sözlükleri ve sayıları ile IQR
+   sınırları için sabit boyutlu bir örneklem toplanır
+   (gerekirse) hedef kodlama geçişi: kırpılmış hedefin kategori toplamları
+2. geçiş: parçalar dönüştürülür, StandardScaler.partial_fit ile ölçekleme
+   momentleri biriktirilir ve satırlar diskteki train/test dizilerine yazılır
+Son olarak diskteki diziler parça parça yerinde ölçeklenir.
+
+Sonuç, bellekte fit edilen PreprocessingPipeline ile aynı nesnedir; tahmin
+tarafı iki modu ayırt etmez. Bellek kullanımı parça ve örneklem boyutuyla
+sınırlıdır, satır sayısıyla büyümez (train/test indeksleri hariç).
+"""
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from config import Config
+from utils.ml_utils import split_indices
+from utils.preprocessing import UNKNOWN_CATEGORY, CategoryEncoder, is_categorical_column
+from utils.memmap_utils import WRITE_CHUNK_ROWS
+
+class ChunkStatistics:
+    """1. geçişte parçalardan birleştirilebilir istatistikler toplar"""
+
+    def __init__(self, drop_missing, sample_rows=None, random_state=42):
+        self.drop_missing = drop_missing
+        self.sample_rows = sample_rows or Config.OUTLIER_SAMPLE_ROWS
+        self.numeric = None
+        self.categorical = None
+        self.rows = 0
+        self.sums = None            # sayısal kolon -> toplam
+        self.counts = None          # sayısal kolon -> dolu değer sayısı
+        self.missing = None         # kolon -> eksik değer sayısı
+        self.value_counts = {}      # kategorik kolon -> değer sayıları
+        self.sample = None          # sayısal kolonların bottom-k örneklemi
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, chunk):
+        if self.numeric is None:
+            self.numeric = [col for col in chunk.columns if not is_categorical_column(chunk[col])]
+            self.categorical = [col for col in chunk.columns if col not in self.numeric]
+        chunk = coerce_chunk(chunk, self.numeric)
+        if self.drop_missing:
+            chunk = chunk.dropna()
+        if len(chunk) == 0:
+            return self
+
+        block = chunk[self.numeric]
+        missing = chunk.isna().sum()
+        if self.sums is None:
+            self.sums, self.counts, self.missing = block.sum(), block.count(), missing
+        else:
+            self.sums += block.sum()
+            self.counts += block.count()
+            self.missing += missing
+
+        for col in self.categorical:
+            counts = chunk[col].value_counts(dropna=True)
+            counts = counts[counts > 0]
+            previous = self.value_counts.get(col)
+            self.value_counts[col] = counts if previous is None else previous.add(counts, fill_value=0)
+
+        self._sample(block)
+        self.rows += len(chunk)
+        return self
+
+    def _sample(self, block):
+        """
+        Bottom-k örnekleme: her satıra rastgele bir anahtar verilir, en küçük
+        anahtarlı sample_rows satır tutulur (yerine koymadan düzgün örneklem)
+        """
+        keys = self._rng.random(len(block))
+        candidates = block.assign(_key=keys)
+        if self.sample is not None and len(self.sample) >= self.sample_rows:
+            candidates = candidates[keys < self.sample['_key'].max()]
+        combined = candidates if self.sample is None else pd.concat([self.sample, candidates])
+        self.sample = combined.nsmallest(self.sample_rows, '_key') if len(combined) > self.sample_rows else combined
+
+    def fill_values(self, method):
+        """MissingValueImputer.fit ile aynı kurallarla doldurma değerleri"""
+        if method not in ('mean', 'median', 'drop'):
+            return {}
+        fill_values = {}
+        for col in self.numeric:
+            if pd.api.types.is_bool_dtype(self.sample[col].dtype):
+                continue
+            if method == 'mean':
+                value = self.sums[col] / self.counts[col] if self.counts[col] else np.nan
+            else:
+                # Medyan örneklemden tahmin edilir
+                value = self.sample[col].median()
+            if pd.notna(value):
+                fill_values[col] = value
+        for col in self.categorical:
+            counts = self.value_counts.get(col)
+            if counts is None or len(counts) == 0:
+                fill_values[col] = UNKNOWN_CATEGORY
+                continue
+            # DataFrame.mode gibi eşitlikte en küçük değer
+            fill_values[col] = counts[counts == counts.max()].index.sort_values()[0]
+        return fill_values
+
+    def category_counts(self, col, fill_value=None):
+        """Doldurma sonrası sıralı kategoriler ve sayıları"""
+        counts = self.value_counts.get(col, pd.Series(dtype=np.float64))
+        missing = int(self.missing[col]) if self.missing is not None else 0
+        if fill_value is not None and missing:
+            counts = counts.add(pd.Series({fill_value: missing}), fill_value=0)
+        counts = counts.sort_index()
+        return counts.index.to_numpy(), counts.to_numpy()
+
+def coerce_chunk(chunk, numeric):
+    """Parçalar arası tip tutarlılığı: sayısal kolonlardaki metinler eksik sayılır"""
+    converted = {col: pd.to_numeric(chunk[col], errors='coerce')
+                 for col in numeric if not pd.api.types.is_numeric_dtype(chunk[col].dtype)}
+    return chunk.assign(**converted) if converted else chunk
+
+def _prepare_chunk(pipeline, chunk, numeric):
+    """Parçayı eğitimdeki doldurma adımından geçirir"""
+    chunk = coerce_chunk(chunk, numeric)
+    if pipeline.handle_missing == 'drop':
+        chunk = chunk.dropna()
+    return pipeline.imputer.transform(chunk)
+
+def _transform_target(pipeline, chunk):
+    y = chunk[pipeline.target_column]
+    if pipeline.target_encoder is not None:
+        return pipeline.target_encoder.transform_column(y, pipeline.target_column)
+    return pipeline.clipper.clip_column(y.to_numpy(dtype=np.float64, na_value=np.nan, copy=True),
+                                        pipeline.target_column)
+
+def collect_statistics(chunks, columns, drop_missing, stats=None):
+    """
+    Parçalardan 1. geçiş istatistiklerini toplar
+
+    Args:
+        chunks: Parça üreteci
+        columns: Kullanılacak kolonlar
+        drop_missing: Eksik değerli satırlar atılacaksa True
+        stats: Verilirse bu istatistikler yeni parçalarla güncellenir
+            (satır eklenmiş veri setinde sadece eklenen satırlar okunur)
+
+    Returns:
+        ChunkStatistics
+    """
+    stats = stats if stats is not None else ChunkStatistics(drop_missing=drop_missing)
+    for chunk in chunks:
+        stats.update(chunk[columns])
+    return stats
+
+def fit_transform_chunks(pipeline, make_chunks, store, test_size, tracker, stats=None):
+    """
+    Pipeline'ı parça akışı üzerinde fit eder ve train/test bölmelerini diske yazar
+
+    Args:
+        pipeline: Fit edilmemiş PreprocessingPipeline
+        make_chunks: Her çağrıda veri setini baştan okuyan parça üreteci döndüren fonksiyon
+        store: Bölmelerin yazılacağı MatrixStore
+        test_size: Test oranı
+        tracker: StageMemoryTracker
+        stats: Önceden toplanmış 1. geçiş istatistikleri (verilirse 1. geçiş okuması atlanır)
+
+    Returns:
+        dict: {'X_train', 'X_test', 'y_train', 'y_test'} salt okunur memmap'ler
+    """
+    columns = pipeline.feature_columns + [pipeline.target_column]
+    target = pipeline.target_column
+
+    with tracker.stage('statistics'):
+        if stats is None:
+            stats = collect_statistics(make_chunks(), columns, pipeline.handle_missing == 'drop')
+        if stats.rows == 0:
+            raise ValueError('Ön işleme sonrası veri kalmadı')
+
+        pipeline.imputer.fill_values = stats.fill_values(pipeline.handle_missing)
+        sample = stats.sample.drop(columns='_key')
+        sample = sample.fillna({col: value for col, value in pipeline.imputer.fill_values.items()
+                                if col in sample.columns})
+        pipeline.clipper.fit(sample)
+        pipeline.clipper.is_approximate = stats.rows > len(sample)
+
+        numeric_target = target in stats.numeric
+        if not numeric_target:
+            uniques, counts = stats.category_counts(target, pipeline.imputer.fill_values.get(target))
+            # Hedef sınıfları her zaman ayrı kalmalı: kardinaliteden bağımsız label encoding
+            pipeline.target_encoder = CategoryEncoder()
+            pipeline.target_encoder.fit_counts(target, uniques, counts=counts, encoding='label')
+
+        target_encoded = {}
+        for col in pipeline.feature_columns:
+            if col not in stats.categorical:
+                continue
+            uniques, counts = stats.category_counts(col, pipeline.imputer.fill_values.get(col))
+            encoding = pipeline.encoder.choose_encoding(len(uniques), has_target=numeric_target)
+            if encoding == 'target':
+                target_encoded[col] = (uniques, counts)
+            else:
+                pipeline.encoder.fit_counts(col, uniques, counts=counts, encoding=encoding)
+
+    if target_encoded:
+        # Hedef kodlaması kırpılmış hedefin toplamlarını ister; sınırlar ancak
+        # 1. geçişten sonra bilindiği için ek bir okuma yapılır
+        with tracker.stage('target_encoding'):
+            indexes = {col: pd.Index(uniques) for col, (uniques, _) in target_encoded.items()}
+            sums = {col: np.zeros(len(uniques)) for col, (uniques, _) in target_encoded.items()}
+            for chunk in make_chunks():
+                chunk = _prepare_chunk(pipeline, chunk[columns], stats.numeric)
+                y = _transform_target(pipeline, chunk)
+                for col, index in indexes.items():
+                    codes = index.get_indexer(chunk[col])
+                    valid = codes >= 0
+                    sums[col] += np.bincount(codes[valid], weights=y[valid], minlength=len(index))
+            for col, (uniques, counts) in target_encoded.items():
+                pipeline.encoder.fit_counts(col, uniques, counts=counts, sums=sums[col], encoding='target')
+
+    with tracker.stage('transform'):
+        n_rows, n_features = stats.rows, len(pipeline.feature_columns)
+        train_index, test_index = split_indices(n_rows, test_size)
+        # Satır i'nin bölmedeki konumu: in-memory x[train_index] sırasıyla birebir aynı
+        is_test = np.zeros(n_rows, dtype=bool)
+        is_test[test_index] = True
+        destination = np.empty(n_rows, dtype=np.int64)
+        destination[train_index] = np.arange(len(train_index))
+        destination[test_index] = np.arange(len(test_index))
+        del train_index, test_index
+
+        n_test = int(is_test.sum())
+        outputs = None
+
+        scaler = StandardScaler()
+        start = 0
+        for chunk in make_chunks():
+            chunk = _prepare_chunk(pipeline, chunk[columns], stats.numeric)
+            if len(chunk) == 0:
+                continue
+            y = _transform_target(pipeline, chunk)
+            x = pipeline._build_matrix(chunk)
+            scaler.partial_fit(x)
+
+            if outputs is None:
+                # Hedef dtype'ı (float64 veya kategori kodu) ilk dönüştürülen parçadan alınır
+                outputs = {
+                    'X_train': store.create('X_train', (n_rows - n_test, n_features), x.dtype),
+                    'X_test': store.create('X_test', (n_test, n_features), x.dtype),
+                    'y_train': store.create('y_train', (n_rows - n_test,), y.dtype),
+                    'y_test': store.create('y_test', (n_test,), y.dtype)
+                }
+
+            end = start + len(x)
+            test_mask = is_test[start:end]
+            rows = destination[start:end]
+            outputs['X_test'][rows[test_mask]] = x[test_mask]
+            outputs['X_train'][rows[~test_mask]] = x[~test_mask]
+            outputs['y_test'][rows[test_mask]] = y[test_mask]
+            outputs['y_train'][rows[~test_mask]] = y[~test_mask]
+            start = end
+
+    with tracker.stage('scale'):
+        # StandardScaler sabit kolonların ölçeğini 1 yapar (_fit_scale ile aynı davranış)
+        pipeline.scale_mean = scaler.mean_.astype(pipeline.dtype)
+        pipeline.scale_std = scaler.scale_.astype(pipeline.dtype)
+        for name in ('X_train', 'X_test'):
+            array = outputs[name]
+            for offset in range(0, len(array), WRITE_CHUNK_ROWS):
+                block = array[offset:offset + WRITE_CHUNK_ROWS]
+                block -= pipeline.scale_mean
+                block /= pipeline.scale_std
+            array.flush()
+
+    del outputs
+    return {name: store.load(name) for name in ('X_train', 'X_test', 'y_train', 'y_test')}
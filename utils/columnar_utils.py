@@ -0,0 +1,488 @@
+"""
+Kolonsal (Parquet) upload önbelleği için yardımcı fonksiyonlar
+Yüklenen CSV/Excel dosyası bir kez tiplenmiş Parquet dosyasına çevrilir,
+sonraki tüm okumalar bu dosyadan kolon projeksiyonu ile yapılır.
+Veri setine eklenen satırlar ana dosyanın yanına ayrı Parquet parçaları
+(<kopya>.part-0001 ...) olarak yazılır; okumalar parçaları sırayla birleştirir.
+"""
+import glob
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.data_utils import (
+    read_file_by_extension, sniff_csv_dialect, iter_csv_chunks, iter_excel_chunks, list_excel_sheets
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:     # pyarrow yoksa kolonsal kopya üretilmez, okumalar ham dosyadan yapılır
+    pa = pq = None
+
+COLUMNAR_SUFFIX = '.parquet'
+PART_SUFFIX = '.part-'
+
+# Benzersiz değer oranı bu eşiğin altındaki string kolonlar category olarak yüklenir
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+INTEGER_DTYPES = ['int8', 'int16', 'int32', 'int64']
+
+def get_columnar_path(filepath):
+    """Orijinal dosyanın yanındaki kolonsal kopyanın yolunu döner"""
+    return filepath + COLUMNAR_SUFFIX
+
+def is_columnar_fresh(filepath):
+    """Kolonsal kopya var ve orijinal dosyadan daha yeni mi kontrol eder"""
+    if pq is None:
+        return False
+    columnar_path = get_columnar_path(filepath)
+    if not os.path.exists(columnar_path):
+        return False
+    return os.path.getmtime(columnar_path) >= os.path.getmtime(filepath)
+
+def get_columnar_parts(filepath):
+    """Kolonsal kopyanın ana dosyası ve eklenen parçaları, okuma sırasıyla"""
+    columnar_path = get_columnar_path(filepath)
+    parts = sorted(glob.glob(glob.escape(columnar_path + PART_SUFFIX) + '[0-9]*'))
+    return [columnar_path] + [part for part in parts if not part.endswith('.tmp')]
+
+def _remove_columnar_parts(filepath):
+    for part in get_columnar_parts(filepath)[1:]:
+        os.remove(part)
+
+def count_columnar_rows(filepath):
+    """Satır sayısını Parquet metadata'sından okur; kolonsal kopya yoksa None döner"""
+    if not is_columnar_fresh(filepath):
+        return None
+    return sum(pq.ParquetFile(part).metadata.num_rows for part in get_columnar_parts(filepath))
+
+def estimate_columns_bytes(filepath, columns):
+    """
+    Seçilen kolonların sıkıştırılmamış boyutunu Parquet metadata'sından toplar
+    (bellekteki boyutun kaba bir alt sınırı); kolonsal kopya yoksa None döner
+    """
+    if not is_columnar_fresh(filepath):
+        return None
+    wanted = set(columns)
+    total = 0
+    for part in get_columnar_parts(filepath):
+        metadata = pq.ParquetFile(part).metadata
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                if column.path_in_schema in wanted:
+                    total += column.total_uncompressed_size
+    return total
+
+def _prepare_for_parquet(df):
+    """Parquet'in kabul etmediği karışık tipli object kolonları string'e çevirir"""
+    df.columns = [str(col).strip() for col in df.columns]
+    for col in df.select_dtypes(include=['object']).columns:
+        inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+        if inferred not in ('string', 'empty'):
+            # Boş değerler korunur, sadece dolu değerler string yapılır
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def is_large_file(filepath):
+    """Dosya akış (chunk) modunda işlenecek kadar büyük mü"""
+    return os.path.getsize(filepath) > Config.STREAMING_THRESHOLD_BYTES
+
+def _with_source_metadata(table, sheet_name, sheet_names=None):
+    """Kaynak Excel sayfasını ve çalışma kitabının sayfa adlarını Parquet şema metadata'sına yazar"""
+    if sheet_name is None and sheet_names is None:
+        return table
+    metadata = dict(table.schema.metadata or {})
+    if sheet_name is not None:
+        metadata[b'sheet_name'] = str(sheet_name).encode('utf-8')
+    if sheet_names is not None:
+        metadata[b'sheet_names'] = json.dumps([str(name) for name in sheet_names]).encode('utf-8')
+    return table.replace_schema_metadata(metadata)
+
+def _read_source_metadata(filepath):
+    if not is_columnar_fresh(filepath):
+        return {}
+    return pq.read_schema(get_columnar_path(filepath)).metadata or {}
+
+def get_columnar_columns(filepath):
+    """Kolon adlarını Parquet şemasından okur; kolonsal kopya yoksa None döner"""
+    if not is_columnar_fresh(filepath):
+        return None
+    return pq.read_schema(get_columnar_path(filepath)).names
+
+def get_columnar_sheet(filepath):
+    """Kolonsal kopyanın hangi Excel sayfasından üretildiğini döner"""
+    sheet_name = _read_source_metadata(filepath).get(b'sheet_name')
+    return sheet_name.decode('utf-8') if sheet_name else None
+
+def get_columnar_sheet_names(filepath):
+    """
+    Dönüştürmede kaydedilen çalışma kitabı sayfa adları; çalışma kitabı tekrar açılmaz
+
+    Returns:
+        list or None: Kolonsal kopya yoksa veya sayfa adları kaydedilmemişse None
+    """
+    sheet_names = _read_source_metadata(filepath).get(b'sheet_names')
+    return json.loads(sheet_names.decode('utf-8')) if sheet_names else None
+
+def _widen_type(current, new):
+    """İki parçada farklı çıkan kolon tipinin ikisini de kayıpsız tutan ortak tipi"""
+    if current == new or pa.types.is_null(new):
+        return current
+    if pa.types.is_null(current):
+        return new
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+           for t in (current, new)):
+        return pa.float64()
+    if all(pa.types.is_string(t) or pa.types.is_large_string(t) for t in (current, new)):
+        return current
+    return pa.string()
+
+def _widen_schema(schema, table):
+    """Yazıcı şemasını yeni parçanın tipleriyle genişletir; değişiklik yoksa aynı şemayı döner"""
+    fields = []
+    for field in schema:
+        index = table.schema.get_field_index(field.name)
+        new_type = table.schema.field(index).type if index >= 0 else field.type
+        fields.append(field.with_type(_widen_type(field.type, new_type)))
+    widened = pa.schema(fields, metadata=schema.metadata)
+    if widened.equals(schema):
+        return schema
+    # pandas metadata'sı ilk parçanın tiplerini tarif eder; genişletilen şemada geçersizdir
+    metadata = {key: value for key, value in (schema.metadata or {}).items() if key != b'pandas'}
+    return widened.with_metadata(metadata)
+
+def _rewrite_with_schema(path, schema, widened_path):
+    """
+    Yazılmış parçaları genişletilmiş şemayla yeni bir dosyaya yeniden yazar (Parquet
+    dosyasının şeması sonradan değiştirilemez) ve eski dosyayı siler
+
+    Returns:
+        tuple: (yeni dosyaya yazmaya devam eden yazıcı, yeni dosya yolu)
+    """
+    writer = pq.ParquetWriter(widened_path, schema)
+    try:
+        for batch in pq.ParquetFile(path).iter_batches():
+            writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+    except Exception:
+        writer.close()
+        os.remove(widened_path)
+        raise
+    os.remove(path)
+    return writer, widened_path
+
+def _write_chunks(chunks, tmp_path, sheet_name=None, sheet_names=None):
+    """
+    Parçaları belleğe tamamen almadan tek bir Parquet dosyasına yazar.
+    Parçalar arasında tip tutarlılığı için sayısal kolonlar float64 olarak saklanır.
+    Sonraki bir parçada kolon tipi farklı çıkarsa (ör. ilk parçada tamamen boş,
+    sonra dolu; sayısal, sonra metin) kolon ortak tipe genişletilir ve yazılmış
+    parçalar bu şemayla yeniden yazılır.
+
+    Returns:
+        tuple: (satır sayısı, kolon sayısı)
+    """
+    writer = None
+    path = tmp_path
+    n_widened = 0
+    rows, n_columns = 0, 0
+    try:
+        for chunk in chunks:
+            chunk = _prepare_for_parquet(chunk)
+            for col in chunk.select_dtypes(include=['number']).columns:
+                chunk[col] = chunk[col].astype('float64')
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                table = _with_source_metadata(table, sheet_name, sheet_names)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                schema = _widen_schema(writer.schema, table)
+                if schema is not writer.schema:
+                    writer.close()
+                    writer = None
+                    n_widened += 1
+                    writer, path = _rewrite_with_schema(path, schema, f'{tmp_path}.{n_widened}')
+                table = table.select(schema.names).cast(schema)
+            writer.write_table(table)
+            rows += len(chunk)
+            n_columns = len(chunk.columns)
+    finally:
+        if writer is not None:
+            writer.close()
+        if path != tmp_path and os.path.exists(path):
+            # Hata durumunda da convert_to_columnar tmp_path'i temizleyebilsin
+            os.replace(path, tmp_path)
+    return rows, n_columns
+
+def convert_to_columnar(filepath, filename, sheet_name=None):
+    """
+    Yüklenen dosyayı bir kez okuyup yanına Parquet olarak yazar.
+    Büyük CSV ve Excel dosyaları parça parça dönüştürülür; Excel için
+    seçilen sayfa dönüştürülür ve sonraki okumalar openpyxl'e hiç uğramaz.
+
+    Args:
+        filepath: Orijinal dosya yolu
+        filename: Dosya adı (uzantı kontrolü için)
+        sheet_name: Excel sayfa adı (None ise ilk sayfa)
+
+    Returns:
+        dict: {'columnar_path', 'dialect', 'shape'}
+    """
+    if pa is None:
+        raise ImportError('Kolonsal kopya için pyarrow gerekli')
+    columnar_path = get_columnar_path(filepath)
+    # Yarım kalan yazma işlemi bozuk bir önbellek bırakmasın
+    tmp_path = columnar_path + '.tmp'
+    is_excel = filename.lower().endswith(('.xlsx', '.xls'))
+    dialect = None
+    # Sayfa adları bir kez okunup kopyaya yazılır; sayfa seçimi ekranı çalışma kitabını açmaz
+    sheet_names = list_excel_sheets(filepath, filename) if is_excel else None
+
+    try:
+        if is_large_file(filepath) and is_excel:
+            chunks = iter_excel_chunks(filepath, filename, sheet_name=sheet_name,
+                                       chunk_size=Config.STREAMING_CHUNK_ROWS)
+            shape = _write_chunks(chunks, tmp_path, sheet_name=sheet_name, sheet_names=sheet_names)
+        elif is_large_file(filepath):
+            dialect = sniff_csv_dialect(filepath)
+            chunks = iter_csv_chunks(filepath, dialect, Config.STREAMING_CHUNK_ROWS)
+            shape = _write_chunks(chunks, tmp_path)
+        else:
+            df, dialect = read_file_by_extension(filepath, filename, return_dialect=True,
+                                                 sheet_name=sheet_name)
+            df = _prepare_for_parquet(df)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_table(_with_source_metadata(table, sheet_name, sheet_names), tmp_path)
+            shape = df.shape
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, columnar_path)
+    # Eski sürüme eklenmiş parçalar yeni kopyaya ait değildir
+    _remove_columnar_parts(filepath)
+
+    return {
+        'columnar_path': columnar_path,
+        'dialect': dialect,
+        'shape': shape
+    }
+
+def iter_dataset_chunks(filepath, filename, chunk_size, columns=None, skip_rows=0):
+    """
+    Veri setini sınırlı bellekle parça parça okur.
+    Kolonsal kopya varsa Parquet batch'leri, yoksa CSV parçaları kullanılır.
+
+    Args:
+        skip_rows: Baştan atlanacak satır sayısı (ör. sadece eklenen satırları okumak için).
+            Kolonsal kopyada tamamen atlanan parça dosyaları hiç açılmaz.
+
+    Yields:
+        DataFrame
+    """
+    if is_columnar_fresh(filepath):
+        chunks = _iter_columnar_chunks(filepath, chunk_size, columns, skip_rows)
+        skip_rows = 0
+    elif filename.lower().endswith('.csv'):
+        chunks = iter_csv_chunks(filepath, sniff_csv_dialect(filepath), chunk_size)
+    else:
+        chunks = iter_excel_chunks(filepath, filename, chunk_size=chunk_size)
+
+    for chunk in chunks:
+        if skip_rows >= len(chunk):
+            skip_rows -= len(chunk)
+            continue
+        if skip_rows:
+            chunk = chunk.iloc[skip_rows:]
+            skip_rows = 0
+        yield chunk[columns] if columns is not None else chunk
+
+def _iter_columnar_chunks(filepath, chunk_size, columns, skip_rows):
+    for part in get_columnar_parts(filepath):
+        parquet_file = pq.ParquetFile(part)
+        if skip_rows >= parquet_file.metadata.num_rows:
+            skip_rows -= parquet_file.metadata.num_rows
+            continue
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            if skip_rows >= batch.num_rows:
+                skip_rows -= batch.num_rows
+                continue
+            if skip_rows:
+                batch = batch.slice(skip_rows)
+                skip_rows = 0
+            yield batch.to_pandas()
+
+def append_columnar_part(filepath, df):
+    """
+    Yeni satırları kolonsal kopyaya ayrı bir Parquet parçası olarak ekler;
+    mevcut parçalar okunmaz ve yeniden yazılmaz
+
+    Args:
+        filepath: Orijinal dosya yolu (kolonsal kopyası güncel olmalı)
+        df: Eklenecek satırlar; kolonları kopyanın şemasıyla aynı olmalı
+
+    Returns:
+        str: Yazılan parçanın yolu
+    """
+    parts = get_columnar_parts(filepath)
+    schema = pq.read_schema(parts[0])
+    df = _prepare_for_parquet(df)
+    missing = [name for name in schema.names if name not in df.columns]
+    if missing:
+        raise ValueError(f'Eklenen veride eksik kolonlar: {", ".join(missing)}')
+
+    # Tip uyuşmazlığı (ör. sayısal kolonda metin) burada hata verir
+    table = pa.Table.from_pandas(df[schema.names], preserve_index=False).cast(schema)
+    part_path = f'{parts[0]}{PART_SUFFIX}{len(parts):04d}'
+    tmp_path = part_path + '.tmp'
+    try:
+        pq.write_table(table, tmp_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, part_path)
+    return part_path
+
+def link_columnar_copy(source_filepath, target_filepath):
+    """
+    Kaynak dosyanın kolonsal kopyasını (ana dosya ve parçalar) hedef dosya için
+    hard link ile paylaşır; Parquet dosyaları hiç değiştirilmediği için güvenlidir.
+    Link desteklenmiyorsa dosyalar kopyalanır.
+    """
+    source_columnar = get_columnar_path(source_filepath)
+    target_columnar = get_columnar_path(target_filepath)
+    _remove_columnar_parts(target_filepath)
+    for part in get_columnar_parts(source_filepath):
+        target = target_columnar + part[len(source_columnar):]
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(part, target)
+        except OSError:
+            shutil.copyfile(part, target)
+    # Tazelik kontrolü kopyanın orijinal dosyadan yeni olmasına bakar
+    os.utime(target_columnar)
+
+def _ensure_columnar(filepath, filename):
+    """Kolonsal kopyayı hazırlar, oluşturulamazsa False döner"""
+    if is_columnar_fresh(filepath):
+        return True
+    try:
+        convert_to_columnar(filepath, filename)
+        return True
+    except Exception:
+        return False
+
+def _narrowest_integer_dtype(min_value, max_value):
+    for dtype in INTEGER_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return dtype
+    return 'int64'
+
+def _column_min_max(metadata, column_index):
+    """Parquet row group istatistiklerinden kolonun min/max değerlerini toplar"""
+    min_value, max_value = None, None
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column_index).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None, None
+        min_value = statistics.min if min_value is None else min(min_value, statistics.min)
+        max_value = statistics.max if max_value is None else max(max_value, statistics.max)
+    return min_value, max_value
+
+def infer_dtype_map(filepath, filename, columns, category_max_ratio=CATEGORY_MAX_UNIQUE_RATIO):
+    """
+    Seçilen kolonlar için bellek dostu bir dtype haritası çıkarır.
+    Tam sayılar Parquet istatistiklerine göre en dar güvenli tipe indirilir,
+    düşük kardinaliteli string kolonlar category olarak işaretlenir.
+    Ondalıklı kolonlar kayıpsız daraltılamayacağı için olduğu gibi bırakılır.
+
+    Returns:
+        dict: {kolon: dtype}
+    """
+    if not _ensure_columnar(filepath, filename):
+        return {}
+
+    parts = [pq.ParquetFile(part) for part in get_columnar_parts(filepath)]
+    parquet_file = parts[0]
+    schema = parquet_file.schema_arrow
+    metadata = parquet_file.metadata
+    dtype_map = {}
+    string_columns = []
+
+    for col in columns:
+        index = schema.get_field_index(col)
+        if index < 0:
+            continue
+        field_type = schema.field(index).type
+        if pa.types.is_integer(field_type):
+            bounds = [_column_min_max(part.metadata, index) for part in parts]
+            min_value = None if any(low is None for low, _ in bounds) else min(low for low, _ in bounds)
+            max_value = None if min_value is None else max(high for _, high in bounds)
+            if min_value is not None:
+                dtype_map[col] = _narrowest_integer_dtype(min_value, max_value)
+        elif pa.types.is_string(field_type) or pa.types.is_large_string(field_type):
+            string_columns.append(col)
+
+    if string_columns and metadata.num_row_groups > 0:
+        # Kardinalite ilk row group üzerinden tahmin edilir
+        sample = parquet_file.read_row_group(0, columns=string_columns)
+        for col in string_columns:
+            values = sample.column(col)
+            non_null = len(values) - values.null_count
+            if non_null and len(values.unique()) <= non_null * category_max_ratio:
+                dtype_map[col] = 'category'
+
+    return dtype_map
+
+def _apply_dtype_map(table, dtypes):
+    """Dtype haritasını pandas'a dönüştürmeden önce Arrow tablosu üzerinde uygular"""
+    for name, dtype in dtypes.items():
+        index = table.schema.get_field_index(name)
+        if index < 0:
+            continue
+        column = table.column(index)
+        if dtype == 'category':
+            # Dictionary kodlama ile string'ler Python objesine hiç dönüşmeden Categorical olur
+            column = column.dictionary_encode()
+        else:
+            column = column.cast(pa.from_numpy_dtype(np.dtype(dtype)))
+        table = table.set_column(index, name, column)
+    return table
+
+def read_dataset(filepath, filename, columns=None, dtypes=None):
+    """
+    Veri setini kolonsal kopyadan okur, kopya yoksa veya eskiyse önce oluşturur
+
+    Args:
+        filepath: Orijinal dosya yolu
+        filename: Dosya adı
+        columns: Okunacak kolonlar (None ise tümü)
+        dtypes: {kolon: dtype} haritası, okuma sırasında uygulanır
+
+    Returns:
+        DataFrame
+    """
+    if not _ensure_columnar(filepath, filename):
+        # Parquet yazılamıyorsa ham dosyadan oku
+        df = read_file_by_extension(filepath, filename)
+        if columns is not None:
+            df = df[columns]
+        if dtypes:
+            df = df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+        return df
+
+    parts = get_columnar_parts(filepath)
+    table = pq.read_table(parts[0], columns=columns)
+    if len(parts) > 1:
+        # Parçalar aynı şemayla yazıldığından birleştirme kopyasızdır
+        table = pa.concat_tables([table] + [pq.read_table(part, columns=columns) for part in parts[1:]])
+    if dtypes:
+        table = _apply_dtype_map(table, dtypes)
+    return table.to_pandas()
@@ -2,119 +2,325 @@
 Veri analizi ve işleme fonksiyonları
 Bu dosya sizin veri analizi kodlarınız için hazırlanmıştır.
 """
+import codecs
+import csv
+import openpyxl
 import pandas as pd
+from utils.preprocessing import MissingValueImputer, OutlierClipper
 
-def read_file_by_extension(filepath, filename):
-    """Dosya uzantısına göre dosyayı okur ve hata yönetimi yapar"""
+# Sniffing için okunacak maksimum byte sayısı (dosyanın tamamı okunmaz)
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+# Sırası önemli: latin-1 her byte dizisini çözebildiği için en sonda denenir
+CSV_ENCODINGS = ['utf-8', 'cp1252', 'latin-1']
+CSV_DELIMITERS = [',', ';', '\t', '|']
+
+# Excel akış okumasında parça başına satır sayısı
+EXCEL_CHUNK_ROWS = 50000
+
+def _decode_sample(raw):
+    """Byte önekini çözebilen ilk encoding'i ve metni döner"""
+    if raw.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig', raw[len(codecs.BOM_UTF8):].decode('utf-8', errors='ignore')
+
+    for encoding in CSV_ENCODINGS:
+        try:
+            # Önek çok byte'lı bir karakterin ortasında bitebilir, final=False ile yarım kalan byte'lar bekletilir
+            decoder = codecs.getincrementaldecoder(encoding)()
+            return encoding, decoder.decode(raw, final=False)
+        except UnicodeDecodeError:
+            continue
+
+    return 'latin-1', raw.decode('latin-1')
+
+def _is_number(value):
     try:
-        if filename.lower().endswith('.csv'):
-            # CSV için farklı encoding ve separator denemeleri yapalım
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            separators = [',', ';', '\t']
-            
-            for encoding in encodings:
-                for sep in separators:
-                    try:
-                        df = pd.read_csv(filepath, encoding=encoding, sep=sep)
-                        # Eğer tek kolon geliyorsa ve virgül varsa, virgül ayıracı dene
-                        if len(df.columns) == 1 and ',' in str(df.iloc[0, 0]):
-                            df = pd.read_csv(filepath, encoding=encoding, sep=',')
-                        
-                        # Eğer veri başarıyla okunduysa
-                        if len(df.columns) > 1 and len(df) > 0:
-                            return df
-                    except Exception as e:
-                        continue
-            
-            # Hiçbiri çalışmazsa varsayılan
-            return pd.read_csv(filepath)
-            
-        elif filename.lower().endswith(('.xlsx', '.xls')):
-            return pd.read_excel(filepath)
+        float(value.strip())
+        return True
+    except (ValueError, AttributeError):
+        return False
+
+def _detect_delimiter(lines):
+    """Satırlar arasında en tutarlı ve en çok kolon üreten ayırıcıyı seçer"""
+    best_sep, best_score = ',', (0, 0)
+    for sep in CSV_DELIMITERS:
+        counts = [len(row) for row in csv.reader(lines, delimiter=sep)]
+        if not counts or counts[0] < 2:
+            continue
+        consistent = sum(1 for count in counts if count == counts[0])
+        score = (consistent, counts[0])
+        if score > best_score:
+            best_sep, best_score = sep, score
+    return best_sep
+
+def _detect_header(first_row):
+    """
+    İlk satırın başlık olup olmadığını belirler.
+    Tüm alanları sayısal olan bir ilk satır kolon adı olamaz; diğer durumlarda başlık kabul edilir.
+    """
+    values = [value for value in first_row if value.strip()]
+    return not (values and all(_is_number(value) for value in values))
+
+def sniff_csv_dialect(filepath, sample_bytes=SNIFF_SAMPLE_BYTES):
+    """
+    CSV dosyasının sınırlı bir byte önekini tek seferde okuyarak
+    encoding, ayırıcı, tırnak karakteri ve başlık bilgisini tespit eder
+
+    Args:
+        filepath: Dosya yolu
+        sample_bytes: Okunacak maksimum byte sayısı
+
+    Returns:
+        dict: {'encoding', 'sep', 'quotechar', 'header'}
+    """
+    with open(filepath, 'rb') as file:
+        raw = file.read(sample_bytes)
+
+    encoding, sample = _decode_sample(raw)
+    lines = sample.splitlines()
+    # Önek dosyanın ortasında bittiyse son satır yarım kalmış olabilir
+    if len(raw) == sample_bytes and len(lines) > 1:
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+
+    dialect = {
+        'encoding': encoding,
+        'sep': ',',
+        'quotechar': '"',
+        'header': True
+    }
+    if not lines:
+        return dialect
+
+    try:
+        sniffed = csv.Sniffer().sniff('\n'.join(lines), delimiters=''.join(CSV_DELIMITERS))
+        sep = sniffed.delimiter
+        dialect['quotechar'] = sniffed.quotechar or '"'
+    except csv.Error:
+        sep = None
+
+    # Sniffer tek kolonlu sonuç verdiyse veya başarısız olduysa sayarak seç
+    if sep is None or len(next(csv.reader(lines[:1], delimiter=sep))) < 2:
+        sep = _detect_delimiter(lines)
+    dialect['sep'] = sep
+
+    first_row = next(csv.reader(lines[:1], delimiter=sep, quotechar=dialect['quotechar']))
+    dialect['header'] = _detect_header(first_row)
+    return dialect
+
+def read_csv_with_dialect(filepath, dialect, **kwargs):
+    """Tespit edilmiş dialect ile CSV dosyasını tek geçişte okur"""
+    read_kwargs = {
+        'sep': dialect['sep'],
+        'quotechar': dialect['quotechar'],
+        'header': 0 if dialect['header'] else None,
+        **kwargs
+    }
+    try:
+        df = pd.read_csv(filepath, encoding=dialect['encoding'], **read_kwargs)
+    except UnicodeDecodeError:
+        # Önek UTF-8 görünse de dosyanın devamında farklı byte'lar olabilir
+        dialect['encoding'] = 'cp1252' if dialect['encoding'].startswith('utf-8') else 'latin-1'
+        df = pd.read_csv(filepath, encoding=dialect['encoding'], encoding_errors='replace', **read_kwargs)
+
+    if not dialect['header'] and 'names' not in kwargs:
+        df.columns = [f'Kolon_{i + 1}' for i in range(len(df.columns))]
+    elif dialect['header']:
+        # Parça okuyucu ve Parquet kopyasıyla aynı kolon adları
+        df.columns = [str(col).strip() for col in df.columns]
+    return df
+
+def iter_csv_chunks(filepath, dialect, chunk_size):
+    """
+    CSV dosyasını tespit edilmiş dialect ile parça parça okur
+
+    Args:
+        filepath: Dosya yolu
+        dialect: sniff_csv_dialect çıktısı
+        chunk_size: Parça başına satır sayısı
+
+    Yields:
+        DataFrame: Kolon adları temizlenmiş parça
+    """
+    reader = pd.read_csv(
+        filepath,
+        encoding=dialect['encoding'],
+        # Akış ortasında geri dönüp farklı encoding denenemeyeceği için hatalı byte'lar değiştirilir
+        encoding_errors='replace',
+        sep=dialect['sep'],
+        quotechar=dialect['quotechar'],
+        header=0 if dialect['header'] else None,
+        chunksize=chunk_size
+    )
+    with reader:
+        for chunk in reader:
+            if dialect['header']:
+                chunk.columns = [str(col).strip() for col in chunk.columns]
+            else:
+                chunk.columns = [f'Kolon_{i + 1}' for i in range(len(chunk.columns))]
+            yield chunk
+
+def list_excel_sheets(filepath, filename):
+    """Çalışma kitabındaki sayfa adlarını döner (.xlsx read-only modda açılır)"""
+    if filename.lower().endswith('.xls'):
+        return pd.ExcelFile(filepath).sheet_names
+    workbook = openpyxl.load_workbook(filepath, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def _excel_header(header):
+    """Boş ve tekrarlanan başlıkları pandas'ın read_excel davranışına göre adlandırır"""
+    columns, seen = [], {}
+    for i, value in enumerate(header):
+        name = str(value).strip() if value is not None else f'Unnamed: {i}'
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
         else:
-            raise ValueError(f"Desteklenmeyen dosya formatı: {filename}")
-            
-    except Exception as e:
-        raise
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def _excel_rows_to_frame(rows, columns):
+    width = len(columns)
+    rows = [row[:width] if len(row) >= width else row + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame(rows, columns=columns)
+
+def iter_excel_chunks(filepath, filename, sheet_name=None, chunk_size=EXCEL_CHUNK_ROWS):
+    """
+    Excel sayfasını parça parça okur.
+    .xlsx dosyaları openpyxl read-only modunda satır satır akıtılır; çalışma kitabının
+    tüm nesne modeli belleğe kurulmaz. .xls dosyaları için pandas kullanılır.
+
+    Args:
+        filepath: Dosya yolu
+        filename: Dosya adı
+        sheet_name: Sayfa adı (None ise ilk sayfa)
+        chunk_size: Parça başına satır sayısı
+
+    Yields:
+        DataFrame
+    """
+    if filename.lower().endswith('.xls'):
+        df = pd.read_excel(filepath, sheet_name=sheet_name or 0)
+        df.columns = [str(col).strip() for col in df.columns]
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+        return
+
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _excel_header(header)
+
+        batch = []
+        for row in rows:
+            # Read-only modda sayfa boyutu hatalıysa sonda boş satırlar gelebilir
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield _excel_rows_to_frame(batch, columns)
+                batch = []
+        if batch:
+            yield _excel_rows_to_frame(batch, columns)
+    finally:
+        workbook.close()
+
+def read_excel_streaming(filepath, filename, sheet_name=None):
+    """Excel sayfasını akış modunda okuyup tek DataFrame olarak döner"""
+    chunks = list(iter_excel_chunks(filepath, filename, sheet_name=sheet_name))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+def read_file_by_extension(filepath, filename, dialect=None, return_dialect=False, sheet_name=None):
+    """
+    Dosya uzantısına göre dosyayı okur
+
+    Args:
+        filepath: Dosya yolu
+        filename: Dosya adı (uzantı kontrolü için)
+        dialect: Daha önce tespit edilmiş CSV dialect'i (verilirse sniffing atlanır)
+        return_dialect: True ise (DataFrame, dialect) döner
+        sheet_name: Excel dosyaları için sayfa adı (None ise ilk sayfa)
+
+    Returns:
+        DataFrame veya (DataFrame, dialect)
+    """
+    if filename.lower().endswith('.csv'):
+        if dialect is None:
+            dialect = sniff_csv_dialect(filepath)
+        df = read_csv_with_dialect(filepath, dialect)
+
+    elif filename.lower().endswith(('.xlsx', '.xls')):
+        df = read_excel_streaming(filepath, filename, sheet_name=sheet_name)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya formatı: {filename}")
+
+    if return_dialect:
+        return df, dialect
+    return df
 
-def handle_missing_data(df, method='drop'):
+def estimate_memory_usage(df, sample_rows=1000):
+    """
+    DataFrame'in bellek kullanımını tahmin eder.
+    Object kolonlarda memory_usage(deep=True) tüm Python objelerini dolaştığı için
+    derin ölçüm sadece bir örneklem üzerinde yapılıp satır sayısına ölçeklenir.
+    """
+    total = int(df.memory_usage(deep=False, index=True).sum())
+    object_columns = df.select_dtypes(include=['object']).columns
+    if len(df) == 0 or len(object_columns) == 0:
+        return total
+
+    sample = df[object_columns]
+    if len(sample) > sample_rows:
+        sample = sample.sample(n=sample_rows, random_state=42)
+    deep_per_row = (sample.memory_usage(deep=True, index=False).sum()
+                    - sample.memory_usage(deep=False, index=False).sum()) / len(sample)
+    return total + int(deep_per_row * len(df))
+
+def handle_missing_data(df, method='drop', return_imputer=False):
     """
     Eksik verileri belirtilen yönteme göre işler
 
     Args:
         df: DataFrame
         method: 'drop', 'mean', 'median'
+        return_imputer: True ise fit edilmiş MissingValueImputer da döner
     
     Returns:
-        İşlenmiş DataFrame
+        İşlenmiş DataFrame veya (DataFrame, MissingValueImputer)
     """
-    df_processed = df.copy()
-    
-    if method == 'drop': # eksik satırları sil
-        df_processed = df_processed.dropna()
-        
-    elif method == 'mean': 
-        # sayısal kolonlar için ortalama ile doldurma
-        numeric_columns = df_processed.select_dtypes(include=['number']).columns
-        
-        for col in numeric_columns:
-            if df_processed[col].isnull().any():
-                mean_value = df_processed[col].mean()
-                df_processed[col].fillna(mean_value, inplace=True)
-        
-        # kategorik kolonlar için mod ile doldurma
-        categorical_columns = df_processed.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            if df_processed[col].isnull().any():
-                mode_values = df_processed[col].mode()
-                if len(mode_values) > 0:
-                    mode_value = mode_values.iloc[0]
-                else:
-                    mode_value = 'Unknown'
-                df_processed[col].fillna(mode_value, inplace=True)
-                
-    elif method == 'median':
-        # sayısal kolonlar için medyan ile doldurma
-        numeric_columns = df_processed.select_dtypes(include=['number']).columns
-        
-        for col in numeric_columns:
-            if df_processed[col].isnull().any():
-                median_value = df_processed[col].median()
-                df_processed[col].fillna(median_value, inplace=True)
-        
-        # kategorik kolonlar için mod ile doldurma
-        categorical_columns = df_processed.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            if df_processed[col].isnull().any():
-                mode_values = df_processed[col].mode()
-                if len(mode_values) > 0:
-                    mode_value = mode_values.iloc[0]
-                else:
-                    mode_value = 'Unknown'
-                df_processed[col].fillna(mode_value, inplace=True)
+    imputer = MissingValueImputer(method)
+    df_processed = imputer.fit_transform(df)
     
+    if return_imputer:
+        return df_processed, imputer
     return df_processed
 
-def handle_outliers(df, columns=None): #Inter Quantile Range (IQR)
-    df_processed = df.copy()
-
-    if columns is None:
-        columns = df_processed.select_dtypes(include=['number']).columns
-    else:
-        numeric_columns = df_processed.select_dtypes(include=['number']).columns
-        columns = [col for col in columns if col in numeric_columns]
-
-    for col in columns:
-        q1 = df_processed[col].quantile(0.25)
-        q3 = df_processed[col].quantile(0.75)
-        IQR = q3 - q1
-
-        lower_limit = q1 - (1.5 * IQR)
-        upper_limit = q3 + (1.5 * IQR)
-
-        outlier_count = len(df_processed[(df_processed[col] < lower_limit) | (df_processed[col] > upper_limit)])
-
-        if outlier_count > 0:
-            df_processed[col] = df_processed[col].clip(lower_limit, upper_limit)
+def handle_outliers(df, columns=None, approximate=None, return_clipper=False): #Inter Quantile Range (IQR)
+    """
+    Sayısal kolonları IQR sınırlarına kırpar
 
+    Args:
+        df: DataFrame
+        columns: Kırpılacak kolonlar (None ise tüm sayısal kolonlar)
+        approximate: Çeyrekleri örneklemden tahmin et (None ise satır sayısına göre)
+        return_clipper: True ise fit edilmiş OutlierClipper da döner
+    
+    Returns:
+        İşlenmiş DataFrame veya (DataFrame, OutlierClipper)
+    """
+    clipper = OutlierClipper(columns=columns, approximate=approximate)
+    df_processed = clipper.fit_transform(df)
+    
+    if return_clipper:
+        return df_processed, clipper
     return df_processed
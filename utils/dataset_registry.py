@@ -0,0 +1,143 @@
+"""
+Süreç genelinde paylaşılan veri seti kayıt defteri
+Ayrıştırılmış DataFrame'leri dosya içerik hash'i ve mtime ile anahtarlayarak
+bellek bütçeli bir LRU önbellekte tutar.
+"""
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from config import Config
+from utils.columnar_utils import read_dataset
+from utils.data_utils import estimate_memory_usage
+from utils.file_utils import compute_file_hash, get_blob_hash
+
+class DatasetRegistry:
+    """Ayrıştırılmış DataFrame'leri hafıza bütçesi altında LRU olarak önbellekler"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> {'df', 'nbytes', 'complete'}
+        self._hashes = {}               # (path, mtime, size) -> content hash
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_dataset_key(self, filepath):
+        """
+        Dosya için (içerik hash'i, mtime) anahtarını döner.
+        Upload blob'larının hash'i dosya adıdır; diğer dosyalarda hash her dosya
+        sürümü için yalnızca bir kez hesaplanır.
+        """
+        stat = os.stat(filepath)
+        content_hash = get_blob_hash(filepath, Config.UPLOAD_FOLDER)
+        if content_hash is not None:
+            return content_hash, stat.st_mtime_ns
+        version = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            content_hash = self._hashes.get(version)
+        if content_hash is None:
+            content_hash = compute_file_hash(filepath)
+            with self._lock:
+                self._hashes[version] = content_hash
+        return content_hash, stat.st_mtime_ns
+
+    def get(self, filepath, filename, columns=None, dtypes=None):
+        """
+        Veri setini önbellekten döner, yoksa okuyup önbelleğe ekler
+
+        Args:
+            filepath: Dosya yolu
+            filename: Dosya adı
+            columns: İstenen kolonlar (None ise tümü)
+            dtypes: Okuma sırasında uygulanacak {kolon: dtype} haritası.
+                Farklı dtype haritaları ayrı girdiler olarak tutulur.
+
+        Returns:
+            DataFrame: Sığ kopya; çağıran taraf değerleri yerinde değiştirmemelidir
+        """
+        dtype_signature = tuple(sorted(dtypes.items())) if dtypes else None
+        key = self.get_dataset_key(filepath) + (dtype_signature,)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                cached = entry['df']
+                if columns is None and entry['complete']:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached.copy(deep=False)
+                if columns is not None and all(col in cached.columns for col in columns):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached[columns]
+            self.misses += 1
+
+        if entry is None:
+            df = read_dataset(filepath, filename, columns=columns, dtypes=dtypes)
+            complete = columns is None
+        else:
+            # Önbellekteki kolonlara sadece eksik olanları ekle
+            cached = entry['df']
+            if columns is None:
+                missing = None
+            else:
+                missing = [col for col in columns if col not in cached.columns]
+            extra = read_dataset(filepath, filename, columns=missing, dtypes=dtypes)
+            extra = extra[[col for col in extra.columns if col not in cached.columns]]
+            df = pd.concat([cached, extra], axis=1)
+            complete = columns is None or entry['complete']
+
+        self._store(key, df, complete)
+        if columns is None:
+            return df.copy(deep=False)
+        return df[columns]
+
+    def _store(self, key, df, complete):
+        nbytes = estimate_memory_usage(df)
+        with self._lock:
+            self._entries.pop(key, None)
+            if nbytes > self.max_bytes:
+                # Bütçeden büyük veri seti önbelleğe alınmaz
+                return
+            self._entries[key] = {'df': df, 'nbytes': nbytes, 'complete': complete}
+            while self.current_bytes > self.max_bytes:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def current_bytes(self):
+        return sum(entry['nbytes'] for entry in self._entries.values())
+
+    def invalidate(self, filepath):
+        """Dosyaya ait tüm önbellek girdilerini siler"""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            hashes = {h for (p, _, _), h in self._hashes.items() if p == path}
+            hashes.add(get_blob_hash(filepath, Config.UPLOAD_FOLDER))
+            for key in [k for k in self._entries if k[0] in hashes]:
+                del self._entries[key]
+
+    def clear(self):
+        """Önbelleği ve sayaçları sıfırlar"""
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Hit/miss sayaçları ve bellek kullanımı"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Tüm servislerin paylaştığı tekil kayıt defteri
+dataset_registry = DatasetRegistry(Config.DATASET_CACHE_MAX_BYTES)
@@ -1,18 +1,134 @@
 """
 Dosya işlemleri için yardımcı fonksiyonlar
 """
+import hashlib
+import os
+import re
+import uuid
 import joblib
 from config import DevelopmentConfig
 
-def save_model_files(model_id, model_obj, encoders_obj, scaler_obj):
+HASH_CHUNK_SIZE = 1024 * 1024
+BLOB_NAME_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+def compute_file_hash(filepath, chunk_size=HASH_CHUNK_SIZE):
+    """Dosyanın SHA-256 içerik hash'ini parça parça okuyarak hesaplar"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_blob_path(directory, content_hash, extension):
+    """İçerik hash'i ile adreslenen dosyanın yolunu döner"""
+    return os.path.join(directory, f'{content_hash}{extension}')
+
+def get_blob_hash(filepath, directory):
+    """
+    İçerik hash'i ile adreslenen dosyanın hash'ini adından okur (dosya tekrar okunmaz)
+
+    Returns:
+        str or None: Dosya klasördeki bir blob değilse None
+    """
+    if os.path.dirname(os.path.abspath(filepath)) != os.path.abspath(directory):
+        return None
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    return name if BLOB_NAME_PATTERN.match(name) else None
+
+def _copy_stream(stream, target, chunk_size, digest=None):
+    size = 0
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        if digest is not None:
+            digest.update(chunk)
+        target.write(chunk)
+        size += len(chunk)
+    return size
+
+def store_content_addressed(stream, directory, extension, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Yüklenen dosya akışını içerik hash'i adıyla diske kaydeder
+
+    Akış geri sarılabiliyorsa önce sadece hash hesaplanır; aynı içerik zaten
+    kayıtlıysa diske hiç yazılmaz. Geri sarılamıyorsa akış parça parça geçici
+    dosyaya yazılırken hash hesaplanır.
+
+    Args:
+        stream: Okunabilir binary akış (ör. FileStorage.stream)
+        directory: Kayıt klasörü
+        extension: Dosya uzantısı ('.csv' gibi)
+        chunk_size: Parça boyutu (byte)
+
+    Returns:
+        dict: {'content_hash', 'path', 'size', 'is_duplicate'}
+    """
+    digest = hashlib.sha256()
+
+    if stream.seekable():
+        start = stream.tell()
+        size = 0
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+        content_hash = digest.hexdigest()
+        path = get_blob_path(directory, content_hash, extension)
+        if os.path.exists(path):
+            return {'content_hash': content_hash, 'path': path, 'size': size, 'is_duplicate': True}
+
+        stream.seek(start)
+        tmp_path = os.path.join(directory, f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'wb') as target:
+            _copy_stream(stream, target, chunk_size)
+    else:
+        tmp_path = os.path.join(directory, f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'wb') as target:
+            size = _copy_stream(stream, target, chunk_size, digest)
+        content_hash = digest.hexdigest()
+        path = get_blob_path(directory, content_hash, extension)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return {'content_hash': content_hash, 'path': path, 'size': size, 'is_duplicate': True}
+
+    os.replace(tmp_path, path)
+    return {'content_hash': content_hash, 'path': path, 'size': size, 'is_duplicate': False}
+
+def append_content_addressed(source_path, extra_bytes, directory, extension, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Kaynak dosyanın sonuna byte'lar eklenmiş halini yeni bir içerik adresli dosya
+    olarak kaydeder; kaynak dosya değişmez (aynı blob'u paylaşan isimler etkilenmez)
+
+    Args:
+        source_path: Mevcut dosya
+        extra_bytes: Sona eklenecek byte'lar
+        directory: Kayıt klasörü
+        extension: Dosya uzantısı
+
+    Returns:
+        dict: {'content_hash', 'path', 'size', 'is_duplicate'}
+    """
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(directory, f'.{uuid.uuid4().hex}.tmp')
+    with open(source_path, 'rb') as source, open(tmp_path, 'wb') as target:
+        size = _copy_stream(source, target, chunk_size, digest)
+        digest.update(extra_bytes)
+        target.write(extra_bytes)
+        size += len(extra_bytes)
+
+    content_hash = digest.hexdigest()
+    path = get_blob_path(directory, content_hash, extension)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return {'content_hash': content_hash, 'path': path, 'size': size, 'is_duplicate': True}
+    os.replace(tmp_path, path)
+    return {'content_hash': content_hash, 'path': path, 'size': size, 'is_duplicate': False}
+
+def save_model_files(model_id, model_obj, pipeline_obj):
     """
-    Model objelerini dosyaya kaydet
+    Model objesini ve ön işleme pipeline'ını dosyaya kaydet
     
     Args:
         model_id (int): Database'deki model ID'si
         model_obj: Eğitilmiş model objesi
-        encoders_obj: Encoder objeleri
-        scaler_obj: Scaler objesi
+        pipeline_obj: Fit edilmiş PreprocessingPipeline
     
     Returns:
         dict: Kaydedilen dosya yolları
@@ -20,34 +136,42 @@ def save_model_files(model_id, model_obj, encoders_obj, scaler_obj):
     # Storage klasörleri oluştur (yoksa)
     base_path = DevelopmentConfig.STORAGE_BASE_PATH
     models_path = base_path / DevelopmentConfig.MODEL_FOLDER_NAME
-    encoders_path = base_path / DevelopmentConfig.ENCODER_FOLDER_NAME
-    scalers_path = base_path / DevelopmentConfig.SCALER_FOLDER_NAME
+    pipelines_path = base_path / DevelopmentConfig.PIPELINE_FOLDER_NAME
     
     # Klasörleri oluştur
     models_path.mkdir(parents=True, exist_ok=True)
-    encoders_path.mkdir(parents=True, exist_ok=True)  
-    scalers_path.mkdir(parents=True, exist_ok=True)
+    pipelines_path.mkdir(parents=True, exist_ok=True)
     
     # Dosya yolları
     model_file = models_path / f'model_{model_id}.pkl'
-    encoder_file = encoders_path / f'encoder_{model_id}.pkl'
-    scaler_file = scalers_path / f'scaler_{model_id}.pkl'
+    pipeline_file = pipelines_path / f'pipeline_{model_id}.pkl'
     
     # Dosyaları kaydet
     joblib.dump(model_obj, model_file)
-    joblib.dump(encoders_obj, encoder_file)  
-    joblib.dump(scaler_obj, scaler_file)
+    pipeline_obj.save(pipeline_file)
     
     return {
         'model_path': str(model_file),
-        'encoder_path': str(encoder_file),
-        'scaler_path': str(scaler_file)
+        'pipeline_path': str(pipeline_file)
+    }
+
+def get_model_file_paths(model_id):
+    """Modele ait tüm olası dosya yolları (eski encoder/scaler dosyaları dahil)"""
+    base_path = DevelopmentConfig.STORAGE_BASE_PATH
+    return {
+        'model': base_path / DevelopmentConfig.MODEL_FOLDER_NAME / f'model_{model_id}.pkl',
+        'pipeline': base_path / DevelopmentConfig.PIPELINE_FOLDER_NAME / f'pipeline_{model_id}.pkl',
+        'encoders': base_path / DevelopmentConfig.ENCODER_FOLDER_NAME / f'encoder_{model_id}.pkl',
+        'scaler': base_path / DevelopmentConfig.SCALER_FOLDER_NAME / f'scaler_{model_id}.pkl'
     }
 
 def load_model_files(model_id):
     """
     Kaydedilmiş model dosyalarını yükler
     
+    Pipeline dosyası yoksa (bu özellikten önce eğitilmiş modeller) ayrı
+    encoder ve scaler dosyaları yüklenir.
+    
     Args:
         model_id (int): Database'deki model ID'si
     
@@ -55,27 +179,26 @@ def load_model_files(model_id):
         dict: Yüklenmiş model objeleri veya None
     """
     try:
-        base_path = DevelopmentConfig.STORAGE_BASE_PATH
-        
-        # Dosya yolları
-        model_file = base_path / DevelopmentConfig.MODEL_FOLDER_NAME / f'model_{model_id}.pkl'
-        encoder_file = base_path / DevelopmentConfig.ENCODER_FOLDER_NAME / f'encoder_{model_id}.pkl'  
-        scaler_file = base_path / DevelopmentConfig.SCALER_FOLDER_NAME / f'scaler_{model_id}.pkl'
+        paths = get_model_file_paths(model_id)
         
-        # Dosyaların varlığını kontrol et
-        if not all([model_file.exists(), encoder_file.exists(), scaler_file.exists()]):
+        if not paths['model'].exists():
             return None
         
-        # Dosyaları yükle
-        model_obj = joblib.load(model_file)
-        encoders_obj = joblib.load(encoder_file)
-        scaler_obj = joblib.load(scaler_file)
+        if paths['pipeline'].exists():
+            return {
+                'model': joblib.load(paths['model']),
+                'pipeline': joblib.load(paths['pipeline'])
+            }
+        
+        # Eski format: encoder ve scaler ayrı dosyalarda
+        if not all([paths['encoders'].exists(), paths['scaler'].exists()]):
+            return None
         
         return {
-            'model': model_obj,
-            'encoders': encoders_obj,
-            'scaler': scaler_obj
+            'model': joblib.load(paths['model']),
+            'encoders': joblib.load(paths['encoders']),
+            'scaler': joblib.load(paths['scaler'])
         }
         
     except Exception as e:
-        return None
\ No newline at end of file
+        return None
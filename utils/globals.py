@@ -5,5 +5,4 @@ Shared across all controllers
 
 # Current model state - shared across all controllers
 CURRENT_MODEL = None
-CURRENT_ENCODERS = None
-CURRENT_SCALER = None
+CURRENT_PIPELINE = None
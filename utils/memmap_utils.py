@@ -0,0 +1,107 @@
+"""
+Eğitim matrislerinin bellek eşlemeli (memory-mapped) .npy dosyaları
+Matrisler bir kez diske yazılır; GridSearchCV/joblib worker'ları kopyalanmış
+diziler yerine aynı dosyanın sıfır kopyalı görünümlerini alır.
+"""
+import os
+import shutil
+import uuid
+import numpy as np
+
+# Satır alt kümesi diske yazılırken tek seferde kopyalanan satır sayısı
+WRITE_CHUNK_ROWS = 65536
+
+class MatrixStore:
+    """Bir eğitim oturumunun matrislerini tek bir klasörde .npy dosyaları olarak tutar"""
+
+    def __init__(self, base_directory, dtype=None):
+        """
+        Args:
+            base_directory: Oturum klasörlerinin oluşturulacağı ana klasör
+            dtype: Ondalıklı matrislerin yazılacağı tip (None ise olduğu gibi)
+        """
+        self.directory = os.path.join(str(base_directory), uuid.uuid4().hex)
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def put(self, name, array):
+        """
+        Diziyi C-contiguous olarak diske yazar ve salt okunur memmap olarak döner
+
+        Returns:
+            np.memmap
+        """
+        array = np.asarray(array)
+        dtype = self.dtype if self.dtype is not None and array.dtype.kind == 'f' else array.dtype
+        # Object dizileri (ör. string hedef) eşlenemez, bellekte kalır
+        if dtype.kind == 'O':
+            return array
+        return _write_npy(os.path.join(self.directory, f'{name}.npy'),
+                          np.ascontiguousarray(array, dtype=dtype))
+
+    def put_rows(self, name, array, rows, chunk_rows=WRITE_CHUNK_ROWS):
+        """
+        array[rows] alt kümesini bellekte tam kopyasını oluşturmadan parça parça
+        diske yazar (ör. train/test bölmesi) ve salt okunur memmap olarak döner
+        """
+        dtype = self.dtype if self.dtype is not None and array.dtype.kind == 'f' else array.dtype
+        if dtype.kind == 'O':
+            return array[rows]
+        path = os.path.join(self.directory, f'{name}.npy')
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        output = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype,
+                                           shape=(len(rows),) + array.shape[1:])
+        for start in range(0, len(rows), chunk_rows):
+            output[start:start + chunk_rows] = array[rows[start:start + chunk_rows]]
+        output.flush()
+        del output
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode='r')
+
+    def create(self, name, shape, dtype):
+        """
+        Parça parça doldurulacak yazılabilir bir .npy memmap oluşturur.
+        Doldurma bitince load ile salt okunur olarak yeniden açılmalıdır.
+        """
+        path = os.path.join(self.directory, f'{name}.npy')
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.dtype(dtype), shape=shape)
+
+    def load(self, name):
+        """Klasördeki diziyi salt okunur memmap olarak açar"""
+        return np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+
+    def cleanup(self):
+        """Oturum klasörünü siler; açık eşlemeler POSIX'te geçerliliğini korur"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def _write_npy(path, array):
+    # Yarım yazılmış dosya eşlenmesin diye önce geçici dosyaya yazılır; geçici ad
+    # benzersizdir çünkü önbellek girdisi klasörüne eşzamanlı yazılabilir
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'wb') as file:
+        np.save(file, array)
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode='r')
+
+def get_memmap_path(array):
+    """Dizi bir .npy dosyasına eşlenmişse dosya yolunu, değilse None döner"""
+    while array is not None:
+        if isinstance(array, np.memmap) and getattr(array, 'filename', None):
+            return array.filename
+        array = getattr(array, 'base', None)
+    return None
+
+def memmap_like(array, reference, name):
+    """
+    Diziyi, referans dizinin eşlendiği klasöre yazıp memmap olarak döner.
+    Referans bellekte ise dizi olduğu gibi döner; böylece fonksiyonlar
+    memmap modu açık olsun olmasın aynı şekilde çağrılabilir.
+    """
+    reference_path = get_memmap_path(reference)
+    if reference_path is None or get_memmap_path(array) is not None:
+        return array
+    array = np.asarray(array)
+    if array.dtype.kind == 'O':
+        return array
+    path = os.path.join(os.path.dirname(reference_path), f'{name}.npy')
+    return _write_npy(path, np.ascontiguousarray(array))
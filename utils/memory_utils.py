@@ -0,0 +1,65 @@
+"""
+Ön işleme adımlarının bellek muhasebesi
+tracemalloc ile her adımın net ayırdığı ve adım içindeki tepe bellek ölçülür.
+NumPy veri buffer'larını tracemalloc'a bildirdiği için dizi ayırmaları da sayılır.
+"""
+import tracemalloc
+from contextlib import contextmanager
+
+class StageMemoryTracker:
+    """Adım adım ayrılan ve tepe bellek miktarlarını toplar"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        self.peak_bytes = 0
+        self._baseline = 0
+        self._started_tracing = False
+
+    def start(self):
+        if not self.enabled:
+            return self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Kullanım:
+            with tracker.stage('impute'):
+                ...
+        """
+        if not self.enabled or not tracemalloc.is_tracing():
+            yield
+            return
+
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.stages.append({
+                'name': name,
+                'allocated_bytes': current - before,
+                'peak_bytes': peak - before
+            })
+            self.peak_bytes = max(self.peak_bytes, peak - self._baseline)
+
+    def report(self):
+        """
+        Returns:
+            dict: {'stages': [{'name', 'allocated_bytes', 'peak_bytes'}], 'peak_bytes'}
+        """
+        return {
+            'stages': list(self.stages),
+            'peak_bytes': self.peak_bytes
+        }
@@ -1,40 +1,36 @@
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import ShuffleSplit
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+from utils.preprocessing import CategoryEncoder, is_categorical_column
 
 # kategorik verileri sayısal hale getir
-# label encoding ve one-hot encoding
+# tüm kategorik kolonlar tek bir CategoryEncoder ile int32 kodlara çevrilir
 def encoding_data(df):
-    df_processed = df.copy()
-    encoders = {}
-    
-    categorical_columns = df_processed.select_dtypes(include=['object']).columns
-    for col in categorical_columns:
-        encoder = LabelEncoder()
-        df_processed[col] = encoder.fit_transform(df_processed[col])
-        encoders[col] = encoder
-    # label encoding ile kategorik veriler sayısal değerlere çevrildi
-    return df_processed, encoders
+    categorical_columns = [col for col in df.columns if is_categorical_column(df[col])]
+    encoder = CategoryEncoder()
+    df_processed = encoder.fit_transform(df, categorical_columns)
+    return df_processed, encoder
 
 def scaling_data(df, feature_columns, target_column):
 
-    df_processed = df.copy()
-
     scaler = StandardScaler() # standardScaller ile her sütunun ortalaması 0, standart sapması 1 yapılır
-    x = df_processed[feature_columns].values
-    y = df_processed[target_column].values
+    x = df[feature_columns].to_numpy(dtype=np.float64)
+    y = df[target_column].to_numpy()
 
     x = scaler.fit_transform(x) # feature kolonlarını scale ediyorum
-    
-    data = np.hstack((x, np.reshape(y, (-1, 1)))) # feature kolonu ile target kolonunu birleştiriyorum
 
-    return data, x, y, scaler
+    return x, y, scaler
+
+def split_indices(n_samples, test_size, random_state=42):
+    """train_test_split ile aynı karıştırmayı yapan eğitim/test satır indeksleri"""
+    splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+    train_index, test_index = next(splitter.split(np.empty((n_samples, 1))))
+    return train_index, test_index
 
 def data_split(x, y, test_size):
-    x_train, x_test, y_train, y_test = train_test_split(
-    x, y, test_size=test_size, random_state=42)
-    return x_train, x_test, y_train, y_test
+    train_index, test_index = split_indices(len(x), test_size)
+    return x[train_index], x[test_index], y[train_index], y[test_index]
 
 
 def analyze_model(y_test, y_pred):
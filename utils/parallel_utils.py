@@ -0,0 +1,120 @@
+"""
+Geniş veri setlerinde kolon bazlı işlerin paralel çalıştırılması
+Kolonlar sırayı koruyan ardışık bölümlere ayrılır, her bölüm bir worker'da
+işlenir ve sonuçlar kolon sırasıyla birleştirilir. Kolonlar birbirinden
+bağımsız işlendiği için sonuç seri çalıştırmayla birebir aynıdır.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from config import Config
+
+BACKENDS = ('thread', 'process')
+
+def partition_columns(columns, n_partitions):
+    """Kolonları sırayı koruyarak yaklaşık eşit boyutlu ardışık bölümlere ayırır"""
+    columns = list(columns)
+    n_partitions = max(1, min(n_partitions, len(columns)))
+    size, extra = divmod(len(columns), n_partitions)
+    partitions, start = [], 0
+    for index in range(n_partitions):
+        end = start + size + (1 if index < extra else 0)
+        partitions.append(columns[start:end])
+        start = end
+    return partitions
+
+class ColumnPartitionExecutor:
+    """
+    Kolon bölümlerini thread veya process havuzunda çalıştırır
+
+    - 'thread': numpy/pandas çekirdekleri GIL'i bıraktığı ölçüde paralelleşir,
+      veri kopyalanmaz; yerinde yazma (ör. ortak matris) sadece bu modda yapılabilir
+    - 'process': saf Python ağırlıklı işler için; bölümler worker'a kopyalanır
+
+    Ayarlar verilmezse her çağrıda Config'den okunur.
+    """
+
+    def __init__(self, workers=None, backend=None, min_columns=None):
+        """
+        Args:
+            workers: Worker sayısı (0 ise CPU sayısı, 1 ise seri)
+            backend: 'thread' veya 'process'
+            min_columns: Bu sayıdan az kolonlu işler seri çalışır (havuz maliyeti kazancı aşar)
+        """
+        self.workers = workers
+        self.backend = backend
+        self.min_columns = min_columns
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    @property
+    def n_workers(self):
+        workers = Config.COLUMN_WORKERS if self.workers is None else self.workers
+        return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+    def is_parallel(self, n_columns):
+        min_columns = Config.COLUMN_PARALLEL_MIN_COLUMNS if self.min_columns is None else self.min_columns
+        return self.n_workers > 1 and n_columns >= max(min_columns, 2)
+
+    def _get_pool(self, backend):
+        backend = backend or self.backend or Config.COLUMN_EXECUTOR_BACKEND
+        if backend not in BACKENDS:
+            raise ValueError(f'Geçersiz kolon executor türü: {backend}')
+        n_workers = self.n_workers
+        with self._lock:
+            pool, pool_workers = self._pools.get(backend, (None, 0))
+            if pool is None or pool_workers != n_workers:
+                if pool is not None:
+                    pool.shutdown(wait=False)
+                if backend == 'thread':
+                    pool = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix='columns')
+                else:
+                    # Flask thread'leri varken fork güvenli değil; forkserver temiz süreçler açar
+                    pool = ProcessPoolExecutor(max_workers=n_workers,
+                                               mp_context=multiprocessing.get_context('forkserver'))
+                self._pools[backend] = (pool, n_workers)
+            return pool
+
+    def map_partitions(self, func, columns, backend=None):
+        """
+        func(bölümdeki kolonlar) çağrılarını çalıştırır
+
+        Returns:
+            list: Bölüm sırasıyla sonuçlar (seri modda tek eleman)
+        """
+        columns = list(columns)
+        if not columns:
+            return []
+        if not self.is_parallel(len(columns)):
+            return [func(columns)]
+        partitions = partition_columns(columns, self.n_workers)
+        return list(self._get_pool(backend).map(func, partitions))
+
+    def map_columns(self, func, df, columns, backend=None):
+        """
+        func(DataFrame bölümü) -> {kolon: sonuç} fonksiyonunu kolon bölümlerinde çalıştırır.
+        Process modunda func modül seviyesinde tanımlı (pickle edilebilir) olmalıdır.
+
+        Returns:
+            dict: Kolon sırasıyla {kolon: sonuç}
+        """
+        columns = list(columns)
+        if not columns:
+            return {}
+        if not self.is_parallel(len(columns)):
+            results = func(df[columns])
+        else:
+            blocks = [df[partition] for partition in partition_columns(columns, self.n_workers)]
+            results = {}
+            for partial_results in self._get_pool(backend).map(func, blocks):
+                results.update(partial_results)
+        return {col: results[col] for col in columns if col in results}
+
+    def shutdown(self):
+        with self._lock:
+            for pool, _ in self._pools.values():
+                pool.shutdown(wait=True)
+            self._pools = {}
+
+column_executor = ColumnPartitionExecutor()
@@ -0,0 +1,198 @@
+"""
+Ön işlenmiş veri seti önbelleği
+Train/test bölmesi ve fit edilmiş pipeline, veri hash'i ve ön işleme ayarlarıyla
+anahtarlanarak diskte tutulur. Aynı ayarlarla yapılan sonraki eğitimler okuma,
+eksik veri, outlier, encoding, scaling ve bölme adımlarını atlar.
+Toplam disk kullanımı bütçeyi aşınca en uzun süredir kullanılmayan girdiler silinir.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import numpy as np
+from config import Config
+from utils.columnar_utils import get_columnar_sheet
+from utils.dataset_registry import dataset_registry
+from utils.preprocessing import PreprocessingPipeline
+
+# Ön işleme çıktısının biçimi değişirse artırılır; eski girdiler kullanılmaz hale gelir
+CACHE_FORMAT_VERSION = 2
+
+ARRAY_NAMES = ('X_train', 'X_test', 'y_train', 'y_test')
+PIPELINE_FILE = 'pipeline.pkl'
+META_FILE = 'meta.json'
+
+class PreprocessedDataCache:
+    """Ön işlenmiş bölmeleri disk bütçesi altında LRU olarak önbellekler"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, filepath, target_column, feature_columns, handle_missing, test_size):
+        """
+        Veri içeriği ve ön işleme ayarlarından önbellek anahtarı üretir.
+        Özellik sırası matris kolon sırasını belirlediği için korunur.
+        """
+        content_hash, _ = dataset_registry.get_dataset_key(filepath)
+        signature = json.dumps({
+            'version': CACHE_FORMAT_VERSION,
+            'content_hash': content_hash,
+            # Aynı çalışma kitabının farklı sayfaları farklı veri setleridir
+            'sheet_name': get_columnar_sheet(filepath),
+            'target_column': target_column,
+            'feature_columns': list(feature_columns),
+            'handle_missing': handle_missing,
+            'test_size': float(test_size),
+            'dtype': str(Config.MATRIX_DTYPE),
+            # Pipeline'ın kodlama ve outlier sınırları da bu ayarlara bağlıdır
+            'category_high_cardinality': Config.CATEGORY_HIGH_CARDINALITY,
+            'high_cardinality_encoding': Config.HIGH_CARDINALITY_ENCODING,
+            'target_encoding_smoothing': Config.TARGET_ENCODING_SMOOTHING,
+            'outlier_approx_min_rows': Config.OUTLIER_APPROX_MIN_ROWS,
+            'outlier_sample_rows': Config.OUTLIER_SAMPLE_ROWS
+        }, sort_keys=True)
+        return hashlib.sha256(signature.encode('utf-8')).hexdigest()
+
+    def get(self, key, mmap=True):
+        """
+        Girdiyi döner, yoksa None
+
+        Args:
+            key: make_key ile üretilen anahtar
+            mmap: True ise diziler salt okunur memmap, değilse bellekte döner
+
+        Returns:
+            dict: {'X_train', 'X_test', 'y_train', 'y_test', 'pipeline'} veya None
+        """
+        entry_path = os.path.join(self.directory, key)
+        meta_path = os.path.join(entry_path, META_FILE)
+        if not os.path.exists(meta_path):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            data = self.load_arrays(key, mmap=mmap)
+            data['pipeline'] = PreprocessingPipeline.load(os.path.join(entry_path, PIPELINE_FILE))
+        except (OSError, ValueError, EOFError):
+            # Yarım kalmış veya bozulmuş girdi: silinir, veri yeniden işlenir
+            shutil.rmtree(entry_path, ignore_errors=True)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Son kullanım zamanı LRU sıralaması için meta dosyasının mtime'ıdır
+        os.utime(meta_path)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def load_arrays(self, key, mmap=True):
+        """Girdinin dizilerini sayaçları ve LRU sırasını değiştirmeden yükler"""
+        entry_path = os.path.join(self.directory, key)
+        return {
+            name: np.load(os.path.join(entry_path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+            for name in ARRAY_NAMES
+        }
+
+    def put(self, key, arrays, pipeline, source_directory=None):
+        """
+        Bölmeleri ve pipeline'ı önbelleğe ekler
+
+        Args:
+            key: make_key ile üretilen anahtar
+            arrays: {'X_train', 'X_test', 'y_train', 'y_test'} dizileri
+            pipeline: Fit edilmiş PreprocessingPipeline
+            source_directory: Diziler zaten bu klasördeki .npy dosyalarına eşlenmişse
+                klasör kopyalanmadan önbelleğe taşınır (MatrixStore klasörü)
+
+        Returns:
+            bool: Girdi eklendiyse True. True dönerse source_directory artık
+                önbelleğe aittir, çağıran taraf silmemelidir.
+        """
+        # Object dizileri (ör. string hedef) .npy olarak eşlenemez
+        if any(np.asarray(arrays[name]).dtype.kind == 'O' for name in ARRAY_NAMES):
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        entry_path = os.path.join(self.directory, key)
+        tmp_path = os.path.join(self.directory, f'.{key}.{uuid.uuid4().hex}.tmp')
+
+        if source_directory is not None:
+            os.rename(source_directory, tmp_path)
+        else:
+            os.makedirs(tmp_path)
+        try:
+            for name in ARRAY_NAMES:
+                array_path = os.path.join(tmp_path, f'{name}.npy')
+                if not os.path.exists(array_path):
+                    np.save(array_path, np.ascontiguousarray(arrays[name]))
+            pipeline.save(os.path.join(tmp_path, PIPELINE_FILE))
+            with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as file:
+                json.dump({'created_at': time.time()}, file)
+        except OSError:
+            # Disk dolu vb.: yarım girdi bırakılmaz, eğitim önbelleksiz devam eder
+            if source_directory is not None:
+                os.rename(tmp_path, source_directory)
+            else:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+
+        try:
+            os.rename(tmp_path, entry_path)
+        except OSError:
+            # Aynı anahtar başka bir eğitim tarafından yazılmış; mevcut girdi kullanılır.
+            # Taşınan dosyalar silinse de açık eşlemeler POSIX'te geçerli kalır.
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return source_directory is not None
+
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """Toplam boyut bütçenin altına inene kadar en eski kullanılan girdileri siler"""
+        with self._lock:
+            entries = []
+            total_bytes = 0
+            for entry in os.scandir(self.directory) if os.path.isdir(self.directory) else []:
+                meta_path = os.path.join(entry.path, META_FILE)
+                if not entry.is_dir() or not os.path.exists(meta_path):
+                    continue
+                size = _directory_size(entry.path)
+                entries.append((os.path.getmtime(meta_path), entry.name, entry.path, size))
+                total_bytes += size
+
+            for _, name, path, size in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                total_bytes -= size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+def _directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+preprocessed_cache = PreprocessedDataCache(Config.PREPROCESSED_CACHE_PATH,
+                                           Config.PREPROCESSED_CACHE_MAX_BYTES)
@@ -0,0 +1,460 @@
+"""
+Eğitim ve tahminde ortak kullanılan ön işleme pipeline'ı
+Eksik veri doldurma değerleri, aykırı değer sınırları, kategori tabloları ve
+ölçekleme parametreleri tek bir nesnede tutulur ve tek dosya olarak saklanır.
+"""
+from functools import partial
+import joblib
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.memory_utils import StageMemoryTracker
+from utils.parallel_utils import column_executor
+
+UNKNOWN_CATEGORY = 'Unknown'
+
+def is_categorical_column(series):
+    """Sayısal veya boolean olmayan kolonlar kategori olarak kodlanır"""
+    return not (pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype))
+
+class MissingValueImputer:
+    """
+    Eksik değer doldurma istatistiklerini sayısal ve kategorik bloklar üzerinde
+    tek geçişte hesaplar ve tahminde aynı doldurmayı uygulamak için saklar.
+
+    method='drop' ile eğitimde eksik satırlar silinir; tahmin girdileri için
+    kalan veriden medyan/mod yedek değerleri yine de hesaplanır.
+    """
+
+    def __init__(self, method='drop'):
+        self.method = method
+        self.fill_values = {}   # kolon -> doldurma değeri
+
+    def fit(self, df):
+        numeric = [col for col in df.columns if not is_categorical_column(df[col])
+                   and not pd.api.types.is_bool_dtype(df[col].dtype)]
+        categorical = [col for col in df.columns if is_categorical_column(df[col])]
+
+        self.fill_values = {}
+        if numeric:
+            # Geniş veri setlerinde kolon bölümleri paralel işlenir (bkz. ColumnPartitionExecutor)
+            stats = column_executor.map_columns(partial(_numeric_fill_values, method=self.method),
+                                                df, numeric)
+            self.fill_values.update({col: value for col, value in stats.items() if pd.notna(value)})
+        if categorical:
+            modes = column_executor.map_columns(_mode_values, df, categorical)
+            for col in categorical:
+                value = modes[col]
+                self.fill_values[col] = value if pd.notna(value) else UNKNOWN_CATEGORY
+        return self
+
+    def transform(self, df):
+        """Saklanan değerlerle tek bir dict tabanlı fillna uygular"""
+        values = {col: value for col, value in self.fill_values.items() if col in df.columns}
+        missing_categories = {
+            col: df[col].cat.add_categories([value])
+            for col, value in values.items()
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and value not in df[col].cat.categories
+        }
+        if missing_categories:
+            df = df.assign(**missing_categories)
+        return df.fillna(values)
+
+    def fit_transform(self, df):
+        if self.method == 'drop':
+            df = df.dropna()
+            self.fit(df)
+            return df
+        if self.method not in ('mean', 'median'):
+            return df
+        return self.fit(df).transform(df)
+
+def _numeric_fill_values(block, method):
+    stats = block.mean() if method == 'mean' else block.median()
+    return dict(stats.items())
+
+def _mode_values(block):
+    # DataFrame.mode tüm blok için tek çağrı; eşitlikte en küçük değer seçilir
+    modes = block.mode(dropna=True)
+    return {col: modes[col].iloc[0] if len(modes) > 0 else np.nan for col in block.columns}
+
+class OutlierClipper:
+    """
+    IQR tabanlı kırpma sınırlarını tüm sayısal kolonlar için tek quantile
+    çağrısıyla hesaplar; tahmin girdilerine aynı sınırlar uygulanır.
+
+    Büyük veri setlerinde çeyrekler sabit boyutlu rastgele bir örneklemden
+    tahmin edilir, böylece sıralama maliyeti satır sayısıyla büyümez.
+    """
+
+    def __init__(self, columns=None, factor=1.5, approximate=None,
+                 sample_rows=None, random_state=42):
+        """
+        Args:
+            columns: Kırpılacak kolonlar (None ise tüm sayısal kolonlar)
+            factor: IQR çarpanı
+            approximate: True/False; None ise satır sayısına göre otomatik seçilir
+            sample_rows: Yaklaşık modda kullanılacak örneklem büyüklüğü
+        """
+        self.columns = columns
+        self.factor = factor
+        self.approximate = approximate
+        self.sample_rows = sample_rows or Config.OUTLIER_SAMPLE_ROWS
+        self.random_state = random_state
+        self.lower = pd.Series(dtype=np.float64)
+        self.upper = pd.Series(dtype=np.float64)
+        self.is_approximate = False
+
+    def _numeric_columns(self, df):
+        numeric = df.select_dtypes(include=['number']).columns
+        if self.columns is None:
+            return list(numeric)
+        return [col for col in self.columns if col in numeric]
+
+    def fit(self, df):
+        numeric = self._numeric_columns(df)
+        if not numeric:
+            return self
+
+        approximate = self.approximate
+        if approximate is None:
+            approximate = len(df) > Config.OUTLIER_APPROX_MIN_ROWS
+        self.is_approximate = bool(approximate) and len(df) > self.sample_rows
+
+        block = df[numeric]
+        if self.is_approximate:
+            # Satır örneklemi kolon bölümlemesinden önce alınır; tüm kolonlar aynı satırları görür
+            block = block.sample(n=self.sample_rows, random_state=self.random_state)
+        quartiles = pd.DataFrame(column_executor.map_columns(_quartiles, block, numeric),
+                                 index=[0.25, 0.75], dtype=np.float64)
+        iqr = quartiles.loc[0.75] - quartiles.loc[0.25]
+        self.lower = quartiles.loc[0.25] - self.factor * iqr
+        self.upper = quartiles.loc[0.75] + self.factor * iqr
+        return self
+
+    @property
+    def bounds(self):
+        """kolon -> (alt sınır, üst sınır)"""
+        return {col: (self.lower[col], self.upper[col]) for col in self.lower.index}
+
+    def transform(self, df):
+        """Tüm sayısal blok tek bir vektörel clip ile kırpılır"""
+        numeric = [col for col in self.lower.index if col in df.columns]
+        if not numeric:
+            return df
+        clipped = df[numeric].clip(self.lower[numeric], self.upper[numeric], axis=1)
+        return df.assign(**{col: clipped[col] for col in numeric})
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def clip_column(self, values, col):
+        """Tek kolonun numpy dizisini yerinde kırpar (yazılabilir dizi beklenir)"""
+        if col in self.lower.index:
+            np.clip(values, self.lower[col], self.upper[col], out=values)
+        return values
+
+def _quartiles(block):
+    quartiles = block.quantile([0.25, 0.75])
+    return {col: quartiles[col].to_numpy() for col in block.columns}
+
+class CategoryEncoder:
+    """
+    Kategorik kolonları hash tablosu (pd.Index) aramasıyla kodlar.
+
+    - 'label': eğitimdeki sıralı kategorinin int32 kodu; eğitimde görülmeyen
+      değerler ayrı bir "bilinmeyen" koduna (kategori sayısı) düşer
+    - 'frequency': kategorinin eğitimdeki göreli sıklığı (bilinmeyen = 0)
+    - 'target': hedefin düzleştirilmiş kategori ortalaması (bilinmeyen = genel ortalama)
+
+    Kategori tabloları mümkünse sabit genişlikli numpy string dizisi olarak
+    saklanır; böylece artifact tek bir buffer olarak hızlı yazılıp okunur.
+    """
+
+    def __init__(self, max_label_categories=None, high_cardinality_encoding=None,
+                 smoothing=None):
+        self.max_label_categories = max_label_categories or Config.CATEGORY_HIGH_CARDINALITY
+        self.high_cardinality_encoding = high_cardinality_encoding or Config.HIGH_CARDINALITY_ENCODING
+        self.smoothing = Config.TARGET_ENCODING_SMOOTHING if smoothing is None else smoothing
+        self.categories = {}    # kolon -> sıralı kategori dizisi
+        self.encodings = {}     # kolon -> 'label' | 'frequency' | 'target'
+        self.values = {}        # kolon -> kategori başına değer (frequency/target), sonda bilinmeyen değeri
+        self._indexes = {}      # kolon -> pd.Index (hash tablosu, kaydedilmez)
+
+    @property
+    def columns(self):
+        return list(self.categories)
+
+    def fit(self, df, columns, y=None):
+        """
+        Args:
+            df: DataFrame
+            columns: Kodlanacak kolonlar
+            y: Sayısal hedef (target encoding için, opsiyonel)
+        """
+        y = None if y is None else np.asarray(y, dtype=np.float64)
+        # Kolonların factorize ve sayım işleri bölümler halinde paralel, tablolar ise sırayla kurulur
+        stats = column_executor.map_columns(partial(_category_statistics, encoder=self, y=y),
+                                            df, columns)
+        for col in columns:
+            uniques, counts, sums, encoding = stats[col]
+            self.fit_counts(col, uniques, counts=counts, sums=sums, encoding=encoding)
+        return self
+
+    def choose_encoding(self, n_categories, has_target=False):
+        """Kategori sayısına göre 'label', 'frequency' veya 'target' seçer"""
+        if n_categories <= self.max_label_categories:
+            return 'label'
+        if self.high_cardinality_encoding == 'target' and not has_target:
+            return 'frequency'
+        return self.high_cardinality_encoding
+
+    def fit_counts(self, col, uniques, counts=None, sums=None, encoding='label'):
+        """
+        Kolonu önceden toplanmış istatistiklerden fit eder (parça parça okuma için)
+
+        Args:
+            uniques: Sıralı kategori değerleri
+            counts: Kategori başına satır sayısı ('frequency'/'target' için)
+            sums: Kategori başına hedef toplamı ('target' için)
+        """
+        self.categories[col] = _compact_categories(uniques)
+        self._indexes.pop(col, None)
+        self.encodings[col] = encoding
+        if encoding == 'label':
+            return self
+
+        counts = np.asarray(counts, dtype=np.float64)
+        if encoding == 'frequency':
+            self.values[col] = np.append(counts / max(counts.sum(), 1), 0.0)
+        else:
+            sums = np.asarray(sums, dtype=np.float64)
+            prior = sums.sum() / max(counts.sum(), 1)
+            smoothed = (sums + self.smoothing * prior) / (counts + self.smoothing)
+            self.values[col] = np.append(smoothed, prior)
+        return self
+
+    def _index(self, col):
+        index = self._indexes.get(col)
+        if index is None:
+            index = self._indexes[col] = pd.Index(self.categories[col])
+        return index
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_indexes'] = {}
+        return state
+
+    def transform_column(self, series, col):
+        """
+        Tek kolonu kodlar
+
+        Returns:
+            np.ndarray: 'label' için int32 kodlar, diğerleri için float64 değerler
+        """
+        categories = self.categories[col]
+        if categories.dtype.kind == 'U' and series.dtype == object:
+            series = series.astype(str)
+        codes = self._index(col).get_indexer(series)
+        # Bilinmeyen değerler son (ayrılmış) koda gider
+        codes = np.where(codes < 0, len(categories), codes).astype(np.int32)
+        if self.encodings[col] == 'label':
+            return codes
+        return self.values[col][codes]
+
+    def transform(self, df):
+        """Fit edilen kolonları kodlanmış halleriyle değiştirir"""
+        columns = [col for col in self.columns if col in df.columns]
+        encoded = column_executor.map_columns(
+            lambda block: {col: self.transform_column(block[col], col) for col in block.columns},
+            df, columns, backend='thread'
+        )
+        return df.assign(**encoded)
+
+    def fit_transform(self, df, columns, y=None):
+        return self.fit(df, columns, y=y).transform(df)
+
+    def get_categorical_values(self, columns=None):
+        """Kolon -> kategori listesi"""
+        columns = self.columns if columns is None else columns
+        return {col: self.categories[col].tolist() for col in columns if col in self.categories}
+
+def _category_statistics(block, encoder, y):
+    """Bölümdeki kolonlar için (sıralı kategoriler, sayılar, hedef toplamları, kodlama türü)"""
+    stats = {}
+    for col in block.columns:
+        values = block[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) and not values.cat.ordered:
+            # Arrow sözlük kodlamasında kategoriler görünüm sırasındadır; kodlar
+            # parça parça fit ve LabelEncoder ile aynı olsun diye sözlük sırasına göre verilir
+            values = values.cat.reorder_categories(values.cat.categories.sort_values())
+        codes, uniques = pd.factorize(values, sort=True)
+        encoding = encoder.choose_encoding(len(uniques), has_target=y is not None)
+        if encoding == 'label':
+            stats[col] = (uniques, None, None, encoding)
+            continue
+
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        sums = None
+        if encoding == 'target':
+            sums = np.bincount(codes[valid], weights=y[valid], minlength=len(uniques))
+        stats[col] = (uniques, counts, sums, encoding)
+    return stats
+
+def _compact_categories(uniques):
+    """String kategorileri sabit genişlikli numpy dizisine çevirir (hızlı serileştirme)"""
+    values = np.asarray(uniques)
+    if values.dtype == object and len(values) and all(isinstance(value, str) for value in values):
+        return values.astype(str)
+    return values
+
+class PreprocessingPipeline:
+    """
+    Fit edilmiş ön işleme adımları: doldurma -> kırpma -> kategori kodlama -> ölçekleme
+
+    Eğitimde fit_transform, tahminde transform çağrılır; transform tüm batch'i
+    kolon blokları üzerinde vektörel işlemlerle matrise çevirir.
+
+    Adımlar DataFrame'i kopyalamaz: doldurma pandas copy-on-write ile sadece
+    değişen kolonları yeni buffer'a yazar, kırpma/kodlama/ölçekleme ise tek
+    seferde ayrılan özellik matrisi üzerinde yerinde yapılır.
+
+    Özellik matrisi dtype ile verilen hassasiyette (float64/float32) C-contiguous
+    üretilir; aynı dtype tahminde de kullanılır. Hedef dizisi float64 kalır.
+    """
+
+    def __init__(self, feature_columns, target_column=None, handle_missing='drop', dtype='float64'):
+        self.feature_columns = list(feature_columns)
+        self.target_column = target_column
+        self.handle_missing = handle_missing
+        self.dtype = np.dtype(dtype)
+        self.imputer = MissingValueImputer(handle_missing)
+        self.clipper = OutlierClipper()
+        self.encoder = CategoryEncoder()
+        self.target_encoder = None
+        self.scale_mean = None
+        self.scale_std = None
+
+    @property
+    def categorical_columns(self):
+        return [col for col in self.feature_columns if col in self.encoder.categories]
+
+    @property
+    def numeric_columns(self):
+        return [col for col in self.feature_columns if col not in self.encoder.categories]
+
+    def fit_transform(self, df, tracker=None):
+        """
+        Pipeline'ı eğitim verisi üzerinde fit eder ve veriyi dönüştürür
+
+        Args:
+            df: Hedef ve özellik kolonlarını içeren DataFrame (değiştirilmez)
+            tracker: Adım bazında bellek ölçümü için StageMemoryTracker (opsiyonel)
+
+        Returns:
+            tuple: (x, y) - ölçeklenmiş özellik matrisi ve hedef dizisi
+        """
+        tracker = tracker or StageMemoryTracker(enabled=False)
+        columns = self.feature_columns + [self.target_column]
+
+        with tracker.stage('impute'):
+            df = self.imputer.fit_transform(df[columns])
+
+        with tracker.stage('clip_fit'):
+            self.clipper.fit(df)
+
+        with tracker.stage('encode_fit'):
+            y = df[self.target_column]
+            if is_categorical_column(y):
+                # Hedef sınıfları her zaman ayrı kalmalı: kardinalite sınırı olmadan label encoding
+                self.target_encoder = CategoryEncoder(max_label_categories=float('inf')).fit(
+                    df, [self.target_column])
+                y = self.target_encoder.transform_column(y, self.target_column)
+            else:
+                # Tam sayı hedefler de float64 olarak kırpılır (eski DataFrame.clip davranışı)
+                y = self.clipper.clip_column(y.to_numpy(dtype=np.float64, na_value=np.nan, copy=True),
+                                             self.target_column)
+
+            categorical = [col for col in self.feature_columns if is_categorical_column(df[col])]
+            # Target encoding sadece sayısal hedefle yapılabilir
+            self.encoder.fit(df, categorical, y=None if self.target_encoder else y)
+
+        with tracker.stage('matrix'):
+            x = self._build_matrix(df)
+            # Matris oluştuktan sonra ara DataFrame'e ihtiyaç kalmaz
+            del df
+
+        with tracker.stage('scale'):
+            self._fit_scale(x)
+            x -= self.scale_mean
+            x /= self.scale_std
+        return x, y
+
+    def transform(self, df):
+        """
+        Yeni veriyi (tek satır veya batch) eğitimdeki adımlarla özellik matrisine çevirir
+
+        Args:
+            df: Özellik kolonlarını içeren DataFrame (değerler string olabilir)
+
+        Returns:
+            np.ndarray: (satır sayısı, özellik sayısı) boyutunda ölçeklenmiş matris
+        """
+        df = df[self.feature_columns]
+        numeric = self.numeric_columns
+        if numeric:
+            # Formdan gelen değerler string olabilir; boş/geçersiz değerler eksik sayılır
+            df = df.assign(**df[numeric].apply(pd.to_numeric, errors='coerce'))
+        df = self.imputer.transform(df)
+        x = self._build_matrix(df)
+        x -= self.scale_mean
+        x /= self.scale_std
+        return x
+
+    def _build_matrix(self, df):
+        """
+        Özellik matrisini bir kez ayırır ve kolonları doğrudan içine yazar;
+        sayısal kolonlar matrisin içinde yerinde kırpılır
+        """
+        # dtype özelliği olmadan kaydedilmiş pipeline'lar float64 ile çalışmaya devam eder
+        dtype = getattr(self, 'dtype', np.dtype(np.float64))
+        x = np.empty((len(df), len(self.feature_columns)), dtype=dtype)
+
+        def write_columns(positions):
+            for position in positions:
+                col = self.feature_columns[position]
+                if col in self.encoder.categories:
+                    x[:, position] = self.encoder.transform_column(df[col], col)
+                else:
+                    x[:, position] = df[col].to_numpy(dtype=dtype, na_value=np.nan)
+                    self.clipper.clip_column(x[:, position], col)
+
+        # Her bölüm matrisin ayrı kolonlarına yazar; thread'ler aynı matrisi paylaşır
+        column_executor.map_partitions(write_columns, range(len(self.feature_columns)), backend='thread')
+        return x
+
+    def _fit_scale(self, x):
+        """
+        StandardScaler ile aynı ortalama/standart sapma; varyans kolon kolon
+        hesaplanır ki geçici bellek tüm matris yerine tek kolon kadar olsun.
+        float32 matrislerde de istatistikler float64 biriktirilir, parametreler
+        ise matrisin dtype'ında tutulur ki yerinde ölçekleme tip yükseltmesin.
+        """
+        mean = x.mean(axis=0, dtype=np.float64)
+        std = np.array([x[:, position].std(dtype=np.float64) for position in range(x.shape[1])])
+        # Sabit kolonlar ölçeklenmez (StandardScaler ile aynı davranış)
+        std[std < 10 * np.finfo(x.dtype).eps] = 1.0
+        self.scale_mean = mean.astype(x.dtype)
+        self.scale_std = std.astype(x.dtype)
+
+    def get_categorical_values(self):
+        """Form seçenekleri için kategorik özelliklerin değerleri"""
+        return self.encoder.get_categorical_values(self.categorical_columns)
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
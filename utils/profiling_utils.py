@@ -0,0 +1,197 @@
+"""
+Parça parça (out-of-core) veri seti profilleme
+Her parça için hesaplanan istatistikler birleştirilir; dosyanın tamamı
+hiçbir zaman tek bir DataFrame olarak belleğe alınmaz.
+"""
+from collections import Counter
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.columnar_utils import iter_dataset_chunks
+from utils.sketch_utils import HyperLogLog
+
+PREVIEW_ROWS = 5
+
+class ColumnProfile:
+    """Tek bir kolonun birleştirilebilir istatistikleri"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        self.dtype_votes = Counter()
+        self.distinct = HyperLogLog()
+
+    def update(self, series):
+        non_null = series.dropna()
+        self.count += len(non_null)
+        self.null_count += len(series) - len(non_null)
+        if len(non_null) == 0:
+            return
+
+        kind = self._chunk_kind(series, non_null)
+        # Oy ağırlığı parçadaki dolu değer sayısıdır
+        self.dtype_votes[kind] += len(non_null)
+        if kind == 'sayısal' and pd.api.types.is_numeric_dtype(series.dtype):
+            chunk_min, chunk_max = non_null.min(), non_null.max()
+            self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+            self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        self.distinct.update(non_null)
+
+    @staticmethod
+    def _chunk_kind(series, non_null):
+        """AnalysisService.determine_column_types ile aynı kuralı parça üzerinde uygular"""
+        dtype = str(series.dtype)
+        if 'int' in dtype or 'float' in dtype:
+            return 'sayısal'
+        try:
+            pd.to_numeric(non_null.head(10), errors='raise')
+            return 'sayısal'
+        except (ValueError, TypeError):
+            return 'metin'
+
+    def merge(self, other):
+        self.count += other.count
+        self.null_count += other.null_count
+        for value in (other.min, other.max):
+            if value is None:
+                continue
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+        self.dtype_votes.update(other.dtype_votes)
+        self.distinct.merge(other.distinct)
+        return self
+
+    @property
+    def total(self):
+        return self.count + self.null_count
+
+    def column_type(self):
+        """Oy çoğunluğuna ve tahmini kardinaliteye göre kolon tipi"""
+        if not self.dtype_votes:
+            return 'kategorik'
+        if self.dtype_votes['sayısal'] >= self.dtype_votes['metin']:
+            return 'sayısal'
+        if self.distinct.estimate() < self.count * Config.CATEGORICAL_MAX_UNIQUE_RATIO:
+            return 'kategorik'
+        return 'metin'
+
+    def missing_info(self):
+        percentage = (self.null_count / self.total) * 100 if self.total else 0.0
+        return {
+            'count': int(self.null_count),
+            'percentage': round(percentage, 2)
+        }
+
+    def summary(self):
+        return {
+            'count': int(self.count),
+            'null_count': int(self.null_count),
+            'min': self.min,
+            'max': self.max,
+            'distinct_estimate': int(round(self.distinct.estimate())),
+            'distinct_relative_error': self.distinct.relative_error,
+            'column_type': self.column_type()
+        }
+
+class DatasetProfile:
+    """Tüm veri setinin birleştirilebilir profili ve reservoir örneklemeli önizlemesi"""
+
+    def __init__(self, preview_rows=PREVIEW_ROWS, random_state=42):
+        self.columns = []
+        self.column_profiles = {}
+        self.rows = 0
+        self.preview_rows = preview_rows
+        self._rng = np.random.default_rng(random_state)
+        self._reservoir = []   # (satır no, satır dict)
+
+    def update(self, chunk):
+        """Bir parçayı profile ekler"""
+        for col in chunk.columns:
+            if col not in self.column_profiles:
+                self.columns.append(col)
+                self.column_profiles[col] = ColumnProfile(col)
+            self.column_profiles[col].update(chunk[col])
+        self._sample_rows(chunk)
+        self.rows += len(chunk)
+
+    def _sample_rows(self, chunk):
+        """Algorithm R: her satır k / (i + 1) olasılıkla önizlemeye girer"""
+        if self.preview_rows <= 0 or len(chunk) == 0:
+            return
+        positions = np.arange(self.rows, self.rows + len(chunk))
+        slots = self._rng.integers(0, positions + 1)
+        fill = max(0, min(len(chunk), self.preview_rows - len(self._reservoir)))
+        slots[:fill] = np.arange(len(self._reservoir), len(self._reservoir) + fill)
+        accepted = np.flatnonzero(slots < self.preview_rows)
+        if len(accepted) == 0:
+            return
+
+        records = chunk.iloc[accepted].to_dict('records')
+        for offset, record in zip(accepted, records):
+            slot = int(slots[offset])
+            item = (int(positions[offset]), record)
+            if slot < len(self._reservoir):
+                self._reservoir[slot] = item
+            else:
+                self._reservoir.append(item)
+
+    def merge(self, other):
+        """Başka bir profil ile birleştirir (önizleme bu profilde kalır)"""
+        for col in other.columns:
+            if col in self.column_profiles:
+                self.column_profiles[col].merge(other.column_profiles[col])
+            else:
+                self.columns.append(col)
+                self.column_profiles[col] = other.column_profiles[col]
+        self.rows += other.rows
+        return self
+
+    def preview_frame(self):
+        """Önizleme satırlarını dosyadaki sıraya göre DataFrame olarak döner"""
+        rows = [record for _, record in sorted(self._reservoir, key=lambda item: item[0])]
+        return pd.DataFrame(rows, columns=self.columns)
+
+    def column_types(self):
+        return {col: self.column_profiles[col].column_type() for col in self.columns}
+
+    def missing_data(self, columns=None):
+        columns = self.columns if columns is None else columns
+        return {col: self.column_profiles[col].missing_info() for col in columns}
+
+    @property
+    def shape(self):
+        return (self.rows, len(self.columns))
+
+def profile_dataset_streaming(filepath, filename, columns=None, chunk_size=None,
+                              preview_rows=PREVIEW_ROWS, max_rows=None, profile=None, skip_rows=0):
+    """
+    Dosyayı parça parça okuyarak profilini çıkarır
+
+    Args:
+        filepath: Dosya yolu
+        filename: Dosya adı
+        columns: Profillenecek kolonlar (None ise tümü)
+        chunk_size: Parça başına satır sayısı
+        preview_rows: Önizleme için örneklenecek satır sayısı
+        max_rows: Verilirse sadece ilk max_rows satır profillenir (örneklem profili)
+        profile: Verilirse bu profil yeni satırlarla güncellenir
+        skip_rows: Baştan atlanacak satır sayısı (profile zaten eklenmiş satırlar)
+
+    Returns:
+        DatasetProfile
+    """
+    chunk_size = chunk_size or Config.STREAMING_CHUNK_ROWS
+    if max_rows is not None:
+        chunk_size = min(chunk_size, max_rows)
+    profile = profile if profile is not None else DatasetProfile(preview_rows=preview_rows)
+    for chunk in iter_dataset_chunks(filepath, filename, chunk_size, columns=columns,
+                                     skip_rows=skip_rows):
+        if max_rows is not None and profile.rows + len(chunk) > max_rows:
+            chunk = chunk.iloc[:max_rows - profile.rows]
+        profile.update(chunk)
+        if max_rows is not None and profile.rows >= max_rows:
+            break
+    return profile
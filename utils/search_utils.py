@@ -0,0 +1,398 @@
+"""
+Hiperparametre araması planlama (grid / successive halving / bayes)
+
+Successive halving: tüm kombinasyonlar önce verinin küçük bir örnekleminde
+değerlendirilir; her turda en iyi 1/factor kadarı kalır ve bir sonraki turda
+factor kat daha fazla satırla tekrar denenir. Son tur tüm veriyle yapılır.
+Grid çok büyükse model başına fit bütçesine sığacak kadar kombinasyon
+rastgele seçilir. Halving tüm grid'den daha fazla fit gerektiriyorsa (küçük
+grid'ler) tüm grid denenir. Tur hesapları sklearn.HalvingGridSearchCV ile aynıdır.
+
+Bayes: grid tanımı ayrık bir arama uzayı olarak okunur ve kombinasyonlar TPE
+(Tree-structured Parzen Estimator) ile tek tek seçilir; deneme sayısı veya süre
+bütçesi dolunca en iyi deneme kullanılır. Aynı veri setindeki önceki denemeler
+(TrialHistory) tekrar fit edilmez, modelin başlangıç gözlemleri olur.
+"""
+import json
+import math
+import os
+import time
+import uuid
+import numpy as np
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, HalvingGridSearchCV, ParameterGrid, cross_val_score
+from sklearn.utils import resample
+from config import Config
+
+SEARCH_STRATEGIES = ('grid', 'halving', 'bayes')
+
+class SearchPlan:
+    """Bir modelin arama planı: denenecek kombinasyonlar ve turlar"""
+
+    def __init__(self, param_list, rounds, n_samples, factor, strategy='grid', sampler=None,
+                 time_budget=None, warm_start=None):
+        """
+        Args:
+            param_list: Denenecek parametre kombinasyonları (grid sırasıyla); bayes'te arama uzayı
+            rounds: [(kombinasyon sayısı, satır sayısı), ...]; tek tur ise düz grid araması,
+                bayes'te tek tur ve kombinasyon sayısı deneme bütçesi
+            n_samples: Arama verisinin satır sayısı
+            factor: Turlar arası eleme oranı
+            strategy: 'grid', 'halving' veya 'bayes'
+            sampler: Bayes'te GridTPE
+            time_budget: Bayes'te yeni deneme başlatılabilecek süre (saniye, None ise sınırsız)
+            warm_start: Bayes'te önceki denemeler, {kombinasyon sırası: fold skorları}
+        """
+        self.param_list = param_list
+        self.rounds = rounds
+        self.n_samples = n_samples
+        self.factor = factor
+        self.strategy = strategy
+        self.sampler = sampler
+        self.time_budget = time_budget
+        self.warm_start = warm_start or {}
+
+    @property
+    def is_bayes(self):
+        return self.strategy == 'bayes'
+
+    @property
+    def is_halving(self):
+        return self.strategy == 'halving' and len(self.rounds) > 1
+
+    def n_fits(self, cv_folds):
+        return cv_folds * sum(n_candidates for n_candidates, _ in self.rounds)
+
+def halving_rounds(n_candidates, n_samples, factor, min_samples):
+    """
+    Successive halving turları (HalvingGridSearchCV, min_resources='exhaust' mantığı)
+
+    Returns:
+        list: [(kombinasyon sayısı, satır sayısı), ...]; son tur tüm satırlarla
+    """
+    min_samples = max(1, min(min_samples, n_samples))
+    n_required = 1 + math.floor(math.log(n_candidates, factor)) if n_candidates > 1 else 1
+    n_possible = 1 + math.floor(math.log(n_samples // min_samples, factor))
+    n_iterations = min(n_required, n_possible)
+    first = n_samples // factor ** (n_iterations - 1)
+    return [(math.ceil(n_candidates / factor ** i),
+             n_samples if i == n_iterations - 1 else first * factor ** i)
+            for i in range(n_iterations)]
+
+def plan_search(param_grid, n_samples, cv_folds, strategy=None, max_fits=None,
+                factor=None, min_samples=None, random_state=42, max_trials=None,
+                time_budget=None, trials=None):
+    """
+    Modelin arama planını çıkarır
+
+    Args:
+        param_grid: GridSearchCV parametre grid'i
+        n_samples: Arama verisinin satır sayısı
+        cv_folds: Fold sayısı
+        strategy: 'grid', 'halving' veya 'bayes' (None ise Config.HYPERPARAM_SEARCH)
+        max_fits: Halving'de model başına en fazla CV fit sayısı (None ise
+            Config.SEARCH_MAX_FITS, 0 ise sınırsız)
+        max_trials: Bayes'te yeni deneme sayısı (None ise Config.BAYES_MAX_TRIALS)
+        time_budget: Bayes'te arama süresi, saniye (None ise Config.BAYES_TIME_BUDGET)
+        trials: Bayes'te aynı veri setindeki önceki denemeler, [(parametreler, fold skorları)]
+
+    Returns:
+        SearchPlan
+    """
+    strategy = strategy or Config.HYPERPARAM_SEARCH
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f'Geçersiz arama stratejisi: {strategy}')
+    factor = factor or Config.HALVING_FACTOR
+    param_list = list(ParameterGrid(param_grid))
+    if strategy == 'grid':
+        return SearchPlan(param_list, [(len(param_list), n_samples)], n_samples, factor)
+    if strategy == 'bayes':
+        sampler = GridTPE(param_grid, random_state=random_state)
+        warm_start = sampler.match_trials(trials or [], cv_folds)
+        max_trials = Config.BAYES_MAX_TRIALS if max_trials is None else max_trials
+        max_trials = min(max_trials, len(param_list) - len(warm_start))
+        time_budget = time_budget if time_budget is not None else (Config.BAYES_TIME_BUDGET or None)
+        return SearchPlan(sampler.param_list, [(max_trials, n_samples)], n_samples, factor,
+                          strategy='bayes', sampler=sampler, time_budget=time_budget,
+                          warm_start=warm_start)
+
+    min_samples = min_samples or Config.HALVING_MIN_SAMPLES
+    max_fits = Config.SEARCH_MAX_FITS if max_fits is None else max_fits
+    n_candidates = len(param_list)
+    rounds = halving_rounds(n_candidates, n_samples, factor, min_samples)
+    if sum(n for n, _ in rounds) >= n_candidates and (not max_fits or cv_folds * n_candidates <= max_fits):
+        # Bütçeye sığan küçük grid'lerde halving fit sayısını azaltmaz
+        return SearchPlan(param_list, [(n_candidates, n_samples)], n_samples, factor)
+    if max_fits:
+        # Bütçeye sığan en büyük kombinasyon sayısı (en az 1)
+        while n_candidates > 1 and \
+                cv_folds * sum(n for n, _ in halving_rounds(n_candidates, n_samples, factor, min_samples)) > max_fits:
+            n_candidates -= 1
+    if n_candidates < len(param_list):
+        chosen = np.random.default_rng(random_state).choice(len(param_list), n_candidates, replace=False)
+        param_list = [param_list[index] for index in sorted(chosen)]
+    return SearchPlan(param_list, halving_rounds(n_candidates, n_samples, factor, min_samples),
+                      n_samples, factor)
+
+def subsample_fold(train_index, test_index, n_resources, n_samples, random_state=42):
+    """Halving turundaki fold örneklemi (HalvingGridSearchCV'nin alt örnekleme kuralı)"""
+    if n_resources is None or n_resources >= n_samples:
+        return train_index, test_index
+    fraction = n_resources / n_samples
+    train_index = resample(train_index, replace=False, random_state=random_state,
+                           n_samples=int(fraction * len(train_index)))
+    test_index = resample(test_index, replace=False, random_state=random_state,
+                          n_samples=int(fraction * len(test_index)))
+    return train_index, test_index
+
+def build_search_cv(estimator, param_grid, cv, n_samples, scoring='r2', n_jobs=None, strategy=None,
+                    history=None, model_type=None):
+    """
+    Plana göre GridSearchCV, HalvingGridSearchCV veya BayesSearchCV oluşturur
+
+    Args:
+        history: Bayes'te warm start ve yeni denemelerin kaydı için TrialHistory
+        model_type: TrialHistory'deki model adı
+
+    Returns:
+        Fit edilmemiş arama nesnesi
+    """
+    trials = history.for_model(model_type, cv) if history is not None else None
+    plan = plan_search(param_grid, n_samples, cv, strategy=strategy, trials=trials)
+    if plan.is_bayes:
+        return BayesSearchCV(estimator, plan, cv=cv, scoring=scoring, n_jobs=n_jobs,
+                             history=history, model_type=model_type)
+    if len(plan.param_list) < len(ParameterGrid(param_grid)):
+        # Bütçe için seçilen kombinasyonlar tek değerli grid listesi olarak verilir
+        param_grid = [{key: [value] for key, value in params.items()} for params in plan.param_list]
+    if not plan.is_halving:
+        return GridSearchCV(estimator, param_grid, cv=cv, scoring=scoring, n_jobs=n_jobs)
+    return HalvingGridSearchCV(estimator, param_grid, factor=plan.factor, resource='n_samples',
+                               min_resources=plan.rounds[0][1], cv=cv, scoring=scoring,
+                               n_jobs=n_jobs, random_state=42, return_train_score=False)
+
+def params_key(params):
+    """Parametre kombinasyonunun JSON anahtarı (kayıtlı denemeleri grid'le eşlemek için)"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+class TrialHistory:
+    """Bir veri setinde önceki çalıştırmaların denemeleri ve bu çalıştırmada eklenenler"""
+
+    def __init__(self, trials=None):
+        """
+        Args:
+            trials: [{'model_type', 'n_folds', 'params', 'fold_scores'}, ...]
+        """
+        self.trials = list(trials or [])
+        self.new_trials = []
+
+    def for_model(self, model_type, n_folds):
+        return [(trial['params'], trial['fold_scores']) for trial in self.trials + self.new_trials
+                if trial['model_type'] == model_type and trial['n_folds'] == n_folds]
+
+    def add(self, model_type, params, fold_scores):
+        self.new_trials.append({
+            'model_type': model_type,
+            'n_folds': len(fold_scores),
+            'params': params,
+            # Başarısız fold'lar None olarak saklanır
+            'fold_scores': [None if np.isnan(score) else float(score) for score in fold_scores]
+        })
+
+def get_trial_history_path(dataset_key, scope):
+    return os.path.join(str(Config.SEARCH_TRIALS_STORAGE_PATH), f'{scope}_{dataset_key}.json')
+
+def load_trial_history(dataset_key, scope):
+    """
+    Veri setinin kayıtlı denemeleri
+
+    Args:
+        dataset_key: Veri içeriği ve ön işleme ayarlarının anahtarı (None ise boş geçmiş)
+        scope: Arama verisini belirleyen bağlam ('grid' veya 'auto'); aynı veri setinde
+            farklı örneklemlerle alınan skorlar karışmaz
+    """
+    if dataset_key is None:
+        return TrialHistory()
+    try:
+        with open(get_trial_history_path(dataset_key, scope), encoding='utf-8') as f:
+            return TrialHistory(json.load(f))
+    except (OSError, ValueError):
+        return TrialHistory()
+
+def save_trial_history(dataset_key, scope, history):
+    """Yeni denemeleri kayıtlı olanlara ekleyerek yazar"""
+    if dataset_key is None or not history.new_trials:
+        return
+    path = get_trial_history_path(dataset_key, scope)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history.trials + history.new_trials, f, default=str)
+    os.replace(tmp_path, path)
+
+class GridTPE:
+    """
+    Grid tanımını ayrık arama uzayı olarak kullanan TPE örnekleyicisi
+
+    Her parametre grid'deki değer listesi üzerinde bir boyuttur. Gözlemler skora
+    göre iyi (en iyi gamma oranı) ve kötü olarak ayrılır; her boyut için iki
+    yumuşatılmış dağılım (l: iyi, g: kötü) kurulur ve l'den örneklenen adaylar
+    arasından l/g oranı en yüksek, henüz denenmemiş kombinasyon seçilir. Sayısal
+    değer listeleri sıralı kabul edilir; gözlem komşu değerlere de ağırlık verir.
+    """
+
+    def __init__(self, param_grid, n_startup=None, gamma=0.25, n_candidates=24, random_state=42):
+        self.param_list = list(ParameterGrid(param_grid))
+        self.keys = sorted(param_grid)
+        self.values = [list(param_grid[key]) for key in self.keys]
+        self.ordinal = [len(values) > 2 and all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                                                for value in values)
+                        for values in self.values]
+        # Sıralı boyutlarda değer sırası -> liste konumu
+        self.order = [np.argsort(values) if ordinal else np.arange(len(values))
+                      for values, ordinal in zip(self.values, self.ordinal)]
+        self.codes = np.array([[values.index(params[key]) for key, values in zip(self.keys, self.values)]
+                               for params in self.param_list], dtype=np.int64).reshape(len(self.param_list), -1)
+        self.index = {params_key(params): index for index, params in enumerate(self.param_list)}
+        self.n_startup = n_startup or Config.BAYES_STARTUP_TRIALS
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.random_state = random_state
+
+    def match_trials(self, trials, n_folds):
+        """Kayıtlı denemeleri grid'deki kombinasyonlarla eşler: {sıra: fold skorları}"""
+        matched = {}
+        for params, fold_scores in trials:
+            index = self.index.get(params_key(params))
+            if index is not None and len(fold_scores) == n_folds:
+                matched[index] = np.array([np.nan if score is None else score for score in fold_scores],
+                                          dtype=np.float64)
+        return matched
+
+    def _density(self, dim, indexes):
+        """Boyuttaki değerlerin yumuşatılmış olasılıkları (düzgün önsel + gözlemler)"""
+        n_values = len(self.values[dim])
+        weights = np.full(n_values, 1.0 / n_values)
+        if self.ordinal[dim]:
+            rank = np.empty(n_values, dtype=np.int64)
+            rank[self.order[dim]] = np.arange(n_values)
+            for position in rank[indexes]:
+                for offset, weight in ((-1, 0.25), (0, 0.5), (1, 0.25)):
+                    if 0 <= position + offset < n_values:
+                        weights[self.order[dim][position + offset]] += weight
+        else:
+            np.add.at(weights, indexes, 1.0)
+        return weights / weights.sum()
+
+    def suggest(self, observed, n=1):
+        """
+        Denenecek yeni kombinasyonları seçer
+
+        Args:
+            observed: {kombinasyon sırası: ortalama skor} (başarısızlar NaN)
+            n: Seçilecek kombinasyon sayısı
+
+        Returns:
+            list: Kombinasyon sıraları (denenmemiş kombinasyon kalmadıysa daha az)
+        """
+        unseen = np.setdiff1d(np.arange(len(self.param_list)), list(observed))
+        rng = np.random.default_rng(self.random_state + len(observed))
+        if len(unseen) <= n:
+            return unseen.tolist()
+        if len(observed) < self.n_startup:
+            return sorted(rng.choice(unseen, n, replace=False).tolist())
+
+        indexes = np.array(list(observed), dtype=np.int64)
+        scores = np.array([observed[index] for index in indexes], dtype=np.float64)
+        ranking = np.argsort(-np.where(np.isnan(scores), -np.inf, scores), kind='stable')
+        n_good = max(1, math.ceil(self.gamma * len(indexes)))
+        good, bad = indexes[ranking[:n_good]], indexes[ranking[n_good:]]
+
+        log_ratio = np.zeros(len(self.param_list))
+        good_densities = []
+        for dim in range(len(self.keys)):
+            good_density = self._density(dim, self.codes[good, dim])
+            bad_density = self._density(dim, self.codes[bad, dim])
+            good_densities.append(good_density)
+            log_ratio += np.log(good_density[self.codes[:, dim]]) - np.log(bad_density[self.codes[:, dim]])
+
+        chosen = []
+        available = np.zeros(len(self.param_list), dtype=bool)
+        available[unseen] = True
+        for _ in range(n):
+            # l'den örneklenen adaylar; hiçbiri denenmemiş değilse tüm denenmemişler
+            samples = np.column_stack([rng.choice(len(density), self.n_candidates, p=density)
+                                       for density in good_densities])
+            candidates = [self.index_of(sample) for sample in samples]
+            candidates = [index for index in candidates if index is not None and available[index]]
+            if not candidates:
+                candidates = np.flatnonzero(available)
+            best = max(candidates, key=lambda index: (log_ratio[index], -index))
+            chosen.append(int(best))
+            available[best] = False
+        return chosen
+
+    def index_of(self, codes):
+        """Değer konumlarından kombinasyon sırası (grid'de yoksa None)"""
+        params = {key: self.values[dim][code] for dim, (key, code) in enumerate(zip(self.keys, codes))}
+        return self.index.get(params_key(params))
+
+class BayesSearchCV:
+    """
+    GridTPE ile sıralı arama (GridSearchCV arayüzünün kullanılan kısmı)
+
+    Her deneme cross_val_score ile değerlendirilir (fold'lar n_jobs ile paralel).
+    Deneme bütçesi veya süre dolunca en iyi kombinasyon tüm veriyle yeniden eğitilir.
+    """
+
+    def __init__(self, estimator, plan, cv=5, scoring='r2', n_jobs=None, history=None, model_type=None):
+        self.estimator = estimator
+        self.plan = plan
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.history = history
+        self.model_type = model_type
+
+    def fit(self, x, y):
+        plan = self.plan
+        fold_scores = dict(plan.warm_start)
+        observed = {index: np.nanmean(scores) if not np.all(np.isnan(scores)) else np.nan
+                    for index, scores in fold_scores.items()}
+        max_trials = plan.rounds[0][0]
+        start = time.time()
+        n_trials = 0
+        while n_trials < max_trials:
+            if plan.time_budget is not None and time.time() - start >= plan.time_budget:
+                break
+            # İlk denemeler rastgele ve birlikte, sonrakiler tek tek seçilir
+            n = max(1, min(plan.sampler.n_startup - len(observed), max_trials - n_trials))
+            batch = plan.sampler.suggest(observed, n)
+            if not batch:
+                break
+            for index in batch:
+                params = plan.param_list[index]
+                scores = cross_val_score(clone(self.estimator).set_params(**params), x, y, cv=self.cv,
+                                         scoring=self.scoring, n_jobs=self.n_jobs, error_score=np.nan)
+                fold_scores[index] = scores
+                observed[index] = np.nanmean(scores) if not np.all(np.isnan(scores)) else np.nan
+                if self.history is not None:
+                    self.history.add(self.model_type, params, scores)
+                n_trials += 1
+
+        means = {index: score for index, score in observed.items() if not np.isnan(score)}
+        if not means:
+            raise ValueError('Tüm denemeler başarısız oldu')
+        # Eşitlikte grid sırasında önce gelen
+        best_index = max(means, key=lambda index: (means[index], -index))
+        self.n_trials_ = n_trials
+        self.best_index_ = best_index
+        self.best_params_ = plan.param_list[best_index]
+        self.best_score_ = means[best_index]
+        self.cv_results_ = {
+            'params': [plan.param_list[index] for index in fold_scores],
+            'mean_test_score': np.array([observed[index] for index in fold_scores])
+        }
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(x, y)
+        return self
@@ -0,0 +1,67 @@
+"""
+Veri seti sürümlerine bağlı birleştirilebilir istatistik durumları
+Profil (DatasetProfile) ve ön işleme istatistikleri (ChunkStatistics) içerik
+hash'i ile diskte saklanır. Satır eklenerek oluşan bir sürümün durumu, üst
+sürümün durumu sadece yeni satırlarla güncellenerek üretilir; eski satırlar
+tekrar taranmaz.
+"""
+import hashlib
+import os
+import uuid
+import joblib
+from config import Config
+
+def get_state_path(kind, key):
+    return os.path.join(str(Config.STATISTICS_STORAGE_PATH), f'{kind}_{key}.pkl')
+
+def save_state(kind, key, state):
+    path = get_state_path(kind, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+def load_state(kind, key):
+    """Kayıtlı durumu döner, yoksa veya okunamıyorsa None"""
+    path = get_state_path(kind, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return joblib.load(path)
+    except Exception:
+        return None
+
+def state_kind(name, *parts):
+    """Ayar kombinasyonuna özgü durum türü adı (ör. kolon listesi ve eksik veri yöntemi)"""
+    signature = hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:16]
+    return f'{name}-{signature}'
+
+def load_or_build_state(kind, content_hash, build, update, parent=None):
+    """
+    Sürümün durumunu kayıttan okur; yoksa üst sürümün durumunu yeni satırlarla
+    günceller, o da yoksa veriyi baştan tarayarak oluşturur ve kaydeder
+
+    Args:
+        kind: Durum türü
+        content_hash: Sürümün içerik hash'i
+        build: Tüm veriyi tarayıp durumu döndüren fonksiyon
+        update: (durum, atlanacak satır sayısı) alıp güncellenmiş durumu döndüren fonksiyon
+        parent: Sürüm eklemeyle oluştuysa (üst sürüm hash'i, üst sürüm satır sayısı)
+
+    Returns:
+        Durum nesnesi
+    """
+    state = load_state(kind, content_hash)
+    if state is not None:
+        return state
+
+    if parent is not None:
+        parent_hash, parent_rows = parent
+        state = load_state(kind, parent_hash)
+        if state is not None:
+            state = update(state, parent_rows)
+
+    if state is None:
+        state = build()
+    save_state(kind, content_hash, state)
+    return state
@@ -0,0 +1,689 @@
+"""
+Otomatik model seçimi için süreç tabanlı turnuva zamanlayıcısı
+
+Aday algoritmaların tüm CV fit'leri ve final eğitimleri tek bir iş kuyruğunda
+toplanır ve tek bir çekirdek bütçesi kadar worker sürecinde çalıştırılır. Her
+fit tek thread ile çalışır (n_jobs=1, BLAS/OpenMP sınırı); böylece ucuz lineer
+modeller uzun süren boosting işleriyle aynı anda ilerler ve toplam süre, toplam
+CPU işinin çekirdek sayısına bölümüne yaklaşır.
+
+Bir adayın aşamaları GridSearchCV + cross_val_score akışıyla aynıdır:
+    search: her parametre kombinasyonu x fold için bir fit (KFold, karıştırmasız);
+            successive halving planında turlar halinde, her turda kalan
+            kombinasyonlar daha büyük bir örneklemle; bayes planında her turda
+            önceki skorlara göre TPE'nin seçtiği yeni kombinasyonlar
+            (bkz. utils/search_utils.py)
+    final:  en iyi parametrelerle yeniden eğitim ve test tahmini
+    score:  en iyi parametrelerle cross_val_score fold'ları; arama aynı veride tam
+            satırlarla yapıldıysa en iyi kombinasyonun arama fold skorları aynı
+            split'lerle hesaplandığı için tekrar fit edilmez
+Matrisler worker'lara kopyalanmaz; .npy dosyalarından bellek eşlemeli açılır.
+
+Süre sınırı kesindir: süresi dolan veya iptal edilen adayın o an çalışan fit'leri
+worker süreci öldürülerek yarıda kesilir ve worker yenisiyle değiştirilir. Her
+worker'ın adres alanı RLIMIT_AS ile sınırlanır; sınırı aşan fit MemoryError ile
+başarısız olur. Tek bir aday, başka adayların bekleyen işi varken çekirdek
+payından fazlasını kullanamaz.
+
+Dağıtım sırası: çekirdek bütçesi aday sayısına yetiyorsa pahalı adaylar önce
+başlar (LPT). Yetmiyorsa adaylar verilen sırayla (erken durma kurallarının
+sırası) dağıtılır; böylece ucuz modeller önce biter ve erken durma kuyruktaki
+pahalı adayları hiç başlatmadan iptal edebilir.
+"""
+import heapq
+import itertools
+import multiprocessing
+import os
+import math
+import time
+from multiprocessing.connection import wait
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import KFold, ParameterGrid
+from config import Config
+from utils.memmap_utils import MatrixStore, get_memmap_path
+from utils.search_utils import subsample_fold
+
+try:
+    import resource
+except ImportError:     # Windows: bellek sınırı uygulanmaz
+    resource = None
+
+# Aday başına göreli maliyet tahmini: çekirdek bütçesi yettiğinde pahalı işler önce
+# dağıtılır (LPT sıralaması), ucuz işler boşta kalan çekirdekleri doldurur
+CANDIDATE_COSTS = {
+    'linear_regression': 1,
+    'ridge': 1,
+    'lasso': 2,
+    'elasticnet': 2,
+    'decision_tree': 3,
+    'knn': 5,
+    'lightgbm': 8,
+    'random_forest': 10,
+    'xgboost': 10,
+    'svr': 20
+}
+
+# Aşamaların dağıtım önceliği: sonucu bekleyen adayların işleri önce çalışır
+PHASE_PRIORITY = {'final': 0, 'score': 1, 'search': 2}
+
+# Otomatik bellek sınırının alt değeri: yorumlayıcı ve kütüphaneler tek başına
+# ~1 GB adres alanı ayırır
+MIN_WORKER_MEMORY_BYTES = 2 * 1024 * 1024 * 1024
+
+def _get_context():
+    """
+    Flask thread'leri varken fork güvenli değil; worker'lar forkserver'dan açılır.
+    Bu modül (sklearn dahil) forkserver'a bir kez yüklenir, worker başlatmak ucuzlar.
+    """
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['utils.tournament'])
+    return context
+
+def get_core_budget():
+    """Turnuvanın kullanacağı toplam çekirdek (worker süreç) sayısı"""
+    budget = Config.AUTO_SELECT_CORE_BUDGET
+    return budget if budget and budget > 0 else (os.cpu_count() or 1)
+
+def get_max_cores_per_candidate(core_budget):
+    """Bir adayın, başka adayların bekleyen işi varken kullanabileceği worker sayısı"""
+    limit = Config.AUTO_SELECT_MAX_CORES_PER_MODEL
+    return limit if limit and limit > 0 else max(1, math.ceil(core_budget / 2))
+
+def get_worker_memory_limit(core_budget, data_paths):
+    """
+    Worker başına adres alanı sınırı (bayt). Bellek eşlemeli matrisler adres
+    alanında yer kapladığı için dosya boyutları sınıra eklenir.
+
+    Returns:
+        int veya None: None ise sınır uygulanmaz
+    """
+    limit = Config.AUTO_SELECT_WORKER_MEMORY_BYTES
+    if limit is None or resource is None:
+        return None
+    if limit <= 0:
+        try:
+            total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+        except (ValueError, OSError, AttributeError):
+            return None
+        limit = max(total // core_budget, MIN_WORKER_MEMORY_BYTES)
+    return limit + sum(os.path.getsize(path) for path in set(data_paths.values()))
+
+def _single_threaded(estimator):
+    """Çekirdek bütçesini aşmamak için modelin kendi paralelliği kapatılır"""
+    params = estimator.get_params()
+    if 'n_jobs' in params:
+        estimator = estimator.set_params(n_jobs=1)
+    return estimator
+
+def _mapped_path(array):
+    """Dizi bir .npy dosyasının tamamına eşlenmişse dosya yolu, değilse None"""
+    path = get_memmap_path(array)
+    if path is None or not array.flags.c_contiguous:
+        return None
+    # Bitişik ve dosyayla aynı boyutta bir görünüm dosyanın tamamıdır (dilim değildir)
+    mapped = np.load(path, mmap_mode='r')
+    return path if mapped.shape == array.shape and mapped.dtype == array.dtype else None
+
+class Candidate:
+    """Turnuvadaki tek bir algoritmanın durumu"""
+
+    def __init__(self, name, estimator, param_grid, cv_folds, search_data, final_data,
+                 score_data, columns=None, time_budget=None, plan=None):
+        """
+        Args:
+            name: Algoritma adı
+            estimator: Fit edilmemiş model
+            param_grid: GridSearchCV parametre grid'i
+            cv_folds: Fold sayısı
+            search_data: Parametre araması verisi, (X adı, y adı)
+            final_data: Final eğitimlerinin sırayla yapılacağı veriler, [(X adı, y adı), ...]
+            score_data: cross_val_score verisi, (X adı, y adı)
+            columns: Verilirse matrisler bu kolon adlarıyla DataFrame'e çevrilir (LightGBM)
+            time_budget: Saniye cinsinden süre sınırı (None ise sınırsız)
+            plan: SearchPlan (None ise tüm grid tam veriyle denenir)
+        """
+        self.name = name
+        self.estimator = _single_threaded(clone(estimator))
+        self.param_list = plan.param_list if plan is not None else list(ParameterGrid(param_grid))
+        # Halving turları: [(kombinasyon sayısı, satır sayısı)]; None satır tam veri demektir
+        self.rounds = plan.rounds if plan is not None else [(len(self.param_list), None)]
+        self.n_samples = plan.n_samples if plan is not None else None
+        self.round = 0
+        self.active = list(range(len(self.param_list)))
+        self.plan = plan if plan is not None and plan.is_bayes else None
+        self.cv_folds = cv_folds
+        self.search_data = search_data
+        self.final_data = final_data
+        self.score_data = score_data
+        self.columns = columns
+        self.time_budget = time_budget
+        self.cost = CANDIDATE_COSTS.get(name, 5)
+
+        self.search_scores = np.full((len(self.param_list), cv_folds), np.nan)
+        self.search_done = np.zeros((len(self.param_list), cv_folds), dtype=bool)
+        self.search_resources = np.zeros(len(self.param_list), dtype=np.int64)
+        self.search_fits = 0
+        self.previous_means = {}    # önceki turu geçen kombinasyon -> (ortalama skor, satır sayısı)
+        # Bayes: skoru bilinen kombinasyonlar (önceki çalıştırmalar dahil) ve bu aramadaki denemeler
+        self.observed = {}
+        self.trials = []
+        self.score_scores = np.full(cv_folds, np.nan)
+        # Arama sonuçları yeniden kullanıldığı için çalıştırılmayan fit'ler
+        self.fits_saved = 0
+        self.best_index = None
+        self.final = None
+        self.outstanding = 0
+        self.running = 0
+        self.fits = 0
+        self.started_at = None
+        self.finished_at = None
+        self.cpu_seconds = 0.0
+        self.status = 'pending'     # pending | queued | running | done | failed | cancelled
+        self.error = None
+        self.timed_out = False
+
+        if self.plan is not None:
+            # Önceki çalıştırmaların denemeleri tekrar fit edilmez, TPE'nin başlangıç gözlemleri olur
+            for index, scores in self.plan.warm_start.items():
+                self.search_scores[index] = scores
+                self.search_done[index] = True
+                self.observed[index] = _mean_score(scores)
+            self.active = self._suggest()
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+    @property
+    def best_params(self):
+        return self.param_list[self.best_index] if self.best_index is not None else None
+
+    @property
+    def deadline(self):
+        if self.time_budget is None or self.started_at is None:
+            return None
+        return self.started_at + self.time_budget
+
+    def _task(self, phase, params, fold=None):
+        return {
+            'candidate': self.name,
+            'phase': phase,
+            'estimator': self.estimator,
+            'params': params,
+            'fold': fold,
+            'n_folds': self.cv_folds,
+            'n_resources': self.rounds[self.round][1] if phase == 'search' else None,
+            'n_samples': self.n_samples,
+            'data': self.search_data if phase == 'search' else self.score_data,
+            'final_data': self.final_data,
+            'columns': self.columns
+        }
+
+    def search_tasks(self):
+        """Mevcut turda kalan kombinasyonların fold fit'leri"""
+        return [(self._task('search', self.param_list[index], fold), (index, fold))
+                for index in self.active for fold in range(self.cv_folds)]
+
+    def _suggest(self):
+        """Bayes: denenecek sonraki kombinasyonlar; ilk denemeler rastgele ve birlikte seçilir"""
+        remaining = self.plan.rounds[0][0] - len(self.trials)
+        if remaining <= 0:
+            return []
+        if self.plan.time_budget is not None and self.started_at is not None and \
+                time.time() - self.started_at >= self.plan.time_budget:
+            return []
+        n = max(1, min(self.plan.sampler.n_startup - len(self.observed), remaining))
+        return sorted(self.plan.sampler.suggest(self.observed, n))
+
+    def record_search(self, key, score):
+        index, _ = key
+        self.search_done[key] = True
+        self.search_scores[key] = score
+        self.search_fits += 1
+        self.search_resources[index] = self.rounds[self.round][1] or 0
+
+    def next_round(self):
+        """
+        Successive halving: biten turun en iyi kombinasyonları bir sonraki tura
+        geçer (skor eşitliğinde grid sırasında önce gelen)
+
+        Bayes planında biten denemeler gözlemlere eklenir ve TPE yeni
+        kombinasyonlar seçer; bütçe dolunca arama biter.
+
+        Returns:
+            bool: Yeni tur başladıysa True, arama bittiyse False
+        """
+        if self.plan is not None:
+            for index in self.active:
+                self.observed[index] = _mean_score(self.search_scores[index])
+                self.trials.append((self.param_list[index], self.search_scores[index].copy()))
+            self.active = self._suggest()
+            return bool(self.active)
+        if self.round + 1 >= len(self.rounds):
+            return False
+        means = self.search_scores[self.active].mean(axis=1)
+        keep = np.argsort(-np.where(np.isnan(means), -np.inf, means), kind='stable')
+        keep = keep[:self.rounds[self.round + 1][0]]
+        resources = int(self.rounds[self.round][1] or 0)
+        self.previous_means = {self.active[position]: (means[position], resources) for position in keep}
+        self.active = sorted(self.active[position] for position in keep)
+        # Yeni turun skorları önceki turunkilerle karışmasın
+        self.search_scores[self.active] = np.nan
+        self.search_done[self.active] = False
+        self.round += 1
+        return True
+
+    def select_best(self):
+        """
+        GridSearchCV ile aynı seçim: son turdaki kombinasyonlardan ortalama skoru
+        en yüksek olan, eşitlikte grid sırasında önce gelen. Başarısız fit'ler NaN sayılır.
+        Bayes planında skoru bilinen tüm kombinasyonlar arasından seçilir.
+        """
+        indexes = sorted(self.observed) if self.plan is not None else self.active
+        means = self.search_scores[indexes].mean(axis=1) if indexes else np.array([np.nan])
+        if np.all(np.isnan(means)):
+            raise ValueError(f'Tüm {self.search_scores[indexes].size} fit başarısız oldu')
+        self.best_index = indexes[int(np.nanargmax(means))]
+
+    def partial_results(self):
+        """
+        Yarıda kalan aramanın tamamlanan fit'leri: her kombinasyonun biten
+        fold'larının ortalaması ve bunlar içinde en iyisi
+
+        Returns:
+            dict: {'completed_fits', 'total_fits', 'cv_results', 'best_params', 'best_score'}
+        """
+        cv_results = []
+        for index, params in enumerate(self.param_list):
+            done = self.search_done[index]
+            scores = self.search_scores[index][done]
+            scores = scores[~np.isnan(scores)]
+            if len(scores):
+                cv_results.append({'params': params, 'mean_score': float(scores.mean()),
+                                   'completed_folds': int(done.sum()),
+                                   # Halving turunda kullanılan satır sayısı (0: tam veri)
+                                   'n_samples': int(self.search_resources[index])})
+            elif index in self.previous_means and not np.isnan(self.previous_means[index][0]):
+                # Yeni turda henüz fold'u bitmeyen kombinasyon için önceki turun sonucu
+                mean, resources = self.previous_means[index]
+                cv_results.append({'params': params, 'mean_score': float(mean),
+                                   'completed_folds': self.cv_folds, 'n_samples': resources})
+        best = max(cv_results, key=lambda result: result['mean_score'], default=None)
+        return {
+            'completed_fits': self.search_fits,
+            'total_fits': self.cv_folds * sum(n_candidates for n_candidates, _ in self.rounds),
+            'cv_results': cv_results,
+            'best_params': best['params'] if best else None,
+            'best_score': best['mean_score'] if best else None
+        }
+
+    def new_trials(self):
+        """Bayes: bu aramada tüm fold'ları biten denemeler, [(parametreler, fold skorları)]"""
+        return list(self.trials)
+
+    def search_scores_reusable(self):
+        """
+        En iyi kombinasyonun arama skorları cross_val_score yerine kullanılabilir mi:
+        skor verisi arama verisiyle aynı, tüm fold'lar bitmiş ve tur tam veriyle
+        yapılmış olmalı (halving'in alt örneklem turları sayılmaz)
+        """
+        if self.score_data != self.search_data or not self.search_done[self.best_index].all():
+            return False
+        # 0: tam veri (bayes warm start denemeleri dahil)
+        resources = self.search_resources[self.best_index]
+        return resources == 0 or self.n_samples is None or resources >= self.n_samples
+
+    def result_tasks(self):
+        """
+        Final eğitimi ve gerekiyorsa cross_val_score fold'ları. Arama skorları
+        kullanılabiliyorsa score_scores doğrudan onlardan doldurulur.
+        """
+        params = self.best_params
+        tasks = [(self._task('final', params), None)]
+        if self.search_scores_reusable():
+            self.score_scores = self.search_scores[self.best_index].copy()
+            self.fits_saved += self.cv_folds
+        else:
+            tasks += [(self._task('score', params, fold), fold) for fold in range(self.cv_folds)]
+        return tasks
+
+class _Worker:
+    """Tek bir worker süreci ve üzerinde çalışan iş"""
+
+    def __init__(self, context, data_paths, memory_limit=None):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn, data_paths, memory_limit),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job = None     # (aday, aşama, anahtar)
+        self.started = None
+
+    def submit(self, job, task):
+        self.job = job
+        self.started = time.time()
+        try:
+            self.conn.send(task)
+        except (OSError, BrokenPipeError):
+            # Ölü worker'ın sentinel'i hazır olur; iş çöken worker gibi ele alınır
+            pass
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        """Çalışan fit'i (C/C++ kodunda olsa da) anında keser"""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+class TournamentScheduler:
+    """Adayların tüm fit'lerini tek çekirdek bütçesi altında worker süreçlerinde çalıştırır"""
+
+    def __init__(self, arrays, core_budget=None):
+        """
+        Args:
+            arrays: {ad: dizi} eğitim/test matrisleri; bir .npy dosyasına eşlenmemiş
+                diziler bir kez geçici klasöre yazılır
+            core_budget: Worker süreç sayısı (None ise Config.AUTO_SELECT_CORE_BUDGET)
+        """
+        self.core_budget = core_budget or get_core_budget()
+        self._store = None
+        self.data_paths = {}
+        for name, array in arrays.items():
+            path = _mapped_path(array) if isinstance(array, np.ndarray) else None
+            if path is None:
+                if self._store is None:
+                    self._store = MatrixStore(Config.MATRIX_STORAGE_PATH)
+                path = get_memmap_path(self._store.put(name, array))
+            self.data_paths[name] = path
+        self.max_cores_per_candidate = get_max_cores_per_candidate(self.core_budget)
+        self.memory_limit = get_worker_memory_limit(self.core_budget, self.data_paths)
+        self._context = _get_context()
+        self._queue = []
+        self._counter = itertools.count()
+        self._by_cost = True
+        self._is_rejected = None
+        self.stats = {}
+
+    def _push(self, candidate, phase, task, key):
+        order = -candidate.cost if self._by_cost else self._candidates.index(candidate)
+        priority = (PHASE_PRIORITY[phase], order, next(self._counter))
+        heapq.heappush(self._queue, (priority, candidate, phase, key, task))
+        candidate.outstanding += 1
+
+    def _next_job(self):
+        """
+        Öncelikli işi seçer. Çekirdek payını dolduran adayın işleri, başka adayın
+        bekleyen işi varken ertelenir; başka iş yoksa boştaki worker yine ona verilir.
+        """
+        chosen, deferred = None, []
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            candidate = entry[1]
+            if candidate.is_finished:
+                continue
+            if candidate.running >= self.max_cores_per_candidate:
+                deferred.append(entry)
+                continue
+            chosen = entry
+            break
+        if chosen is None and deferred:
+            chosen = deferred.pop(0)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        if chosen is None:
+            return None, None
+
+        _, candidate, phase, key, task = chosen
+        if candidate.started_at is None:
+            candidate.started_at = time.time()
+            candidate.status = 'running'
+        candidate.running += 1
+        return (candidate, phase, key), task
+
+    def _admit(self, candidate):
+        candidate.status = 'queued'
+        tasks = candidate.search_tasks()
+        if not tasks:
+            # Tüm kombinasyonlar önceki çalıştırmalarda denenmiş (bayes warm start)
+            self._start_results(candidate)
+            return
+        for task, key in tasks:
+            self._push(candidate, 'search', task, key)
+
+    def _start_results(self, candidate):
+        try:
+            candidate.select_best()
+        except ValueError as e:
+            self._finish(candidate, 'failed', f'{e}: {candidate.error}')
+            return
+        for task, task_key in candidate.result_tasks():
+            self._push(candidate, 'final' if task_key is None else 'score', task, task_key)
+
+    def _finish(self, candidate, status, error=None):
+        candidate.status = status
+        candidate.error = error
+        candidate.finished_at = time.time()
+        rejected = status == 'done' and self._is_rejected is not None and self._is_rejected(candidate)
+        if status == 'failed' or rejected:
+            # Başarısız veya sonucu kabul edilmeyen adayın yerine sıradaki aday turnuvaya alınır
+            waiting = [other for other in self._candidates if other.status == 'pending']
+            if waiting:
+                self._admit(waiting[0])
+
+    def _handle_result(self, job, ok, payload, cpu_seconds):
+        candidate, phase, key = job
+        candidate.outstanding -= 1
+        candidate.running -= 1
+        candidate.cpu_seconds += cpu_seconds
+        candidate.fits += len(candidate.final_data) if phase == 'final' else 1
+        if candidate.is_finished:
+            return
+
+        if phase == 'search':
+            # Başarısız fit GridSearchCV'deki gibi NaN skor sayılır
+            candidate.record_search(key, payload if ok else np.nan)
+            if not ok:
+                candidate.error = payload
+            if candidate.outstanding == 0:
+                if candidate.next_round():
+                    for task, task_key in candidate.search_tasks():
+                        self._push(candidate, 'search', task, task_key)
+                    return
+                self._start_results(candidate)
+            return
+
+        if phase == 'final':
+            if not ok:
+                self._finish(candidate, 'failed', payload)
+                return
+            candidate.final = payload
+        elif ok:
+            # cross_val_score'da olduğu gibi başarısız fold NaN kalır
+            candidate.score_scores[key] = payload
+        if candidate.outstanding == 0:
+            self._finish(candidate, 'done')
+
+    def _check_deadlines(self, now):
+        """Süresi dolan adaylar başarısız sayılır; bekleyen işleri dağıtılmaz"""
+        for candidate in self._candidates:
+            deadline = candidate.deadline
+            if deadline is not None and not candidate.is_finished and now >= deadline:
+                candidate.timed_out = True
+                self._finish(candidate, 'failed', f'Süre sınırı aşıldı ({candidate.time_budget} sn)')
+
+    def _reap(self, workers):
+        """Biten (süresi dolan veya iptal edilen) adayların çalışan fit'leri öldürülür"""
+        for index, worker in enumerate(workers):
+            if worker.job is None or not worker.job[0].is_finished:
+                continue
+            candidate = worker.job[0]
+            worker.kill()
+            candidate.running -= 1
+            # Worker tek thread çalıştığı için CPU süresi geçen süreye yakındır
+            candidate.cpu_seconds += time.time() - worker.started
+            workers[index] = self._new_worker()
+
+    def _new_worker(self):
+        return _Worker(self._context, self.data_paths, self.memory_limit)
+
+    def _wait_timeout(self, now):
+        deadlines = [candidate.deadline for candidate in self._candidates
+                     if candidate.deadline is not None and not candidate.is_finished]
+        return max(min(deadlines) - now, 0) if deadlines else None
+
+    def run(self, candidates, should_stop=None, max_admitted=None, is_rejected=None):
+        """
+        Adayları çalıştırır
+
+        Args:
+            candidates: Candidate listesi (öncelik sırasıyla)
+            should_stop: Her aday bittiğinde adaylar listesiyle çağrılır; True dönerse
+                bitmemiş adaylar iptal edilir (erken durma)
+            max_admitted: Aynı anda turnuvada olabilecek aday sayısı; başarısız olan
+                adayın yerine sıradaki alınır (None ise hepsi)
+            is_rejected: Başarıyla biten aday için çağrılır; True dönerse sonucu sayılmaz
+                ve başarısız aday gibi yerine sıradaki aday alınır
+
+        Returns:
+            list: Candidate listesi (durumları güncellenmiş)
+        """
+        self._candidates = list(candidates)
+        self._is_rejected = is_rejected
+        # Her aday bir çekirdek bulamıyorsa LPT yerine aday sırası (bkz. modül açıklaması)
+        self._by_cost = self.core_budget >= len(self._candidates[:max_admitted])
+        start = time.time()
+        for candidate in self._candidates[:max_admitted]:
+            self._admit(candidate)
+
+        workers = [self._new_worker() for _ in range(min(self.core_budget, max(len(self._queue), 1)))]
+        n_finished = 0
+        try:
+            while True:
+                for worker in workers:
+                    if worker.job is None:
+                        job, task = self._next_job()
+                        if job is None:
+                            break
+                        worker.submit(job, task)
+
+                busy = [worker for worker in workers if worker.job is not None]
+                if not busy:
+                    break
+
+                ready = wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy],
+                             timeout=self._wait_timeout(time.time()))
+                for worker in busy:
+                    if worker.conn in ready:
+                        try:
+                            ok, payload, cpu_seconds = worker.conn.recv()
+                        except (EOFError, OSError):
+                            ok, payload, cpu_seconds = False, 'Worker süreci beklenmedik şekilde sonlandı', 0.0
+                    elif worker.process.sentinel in ready:
+                        ok, payload, cpu_seconds = False, 'Worker süreci beklenmedik şekilde sonlandı', 0.0
+                    else:
+                        continue
+                    job, worker.job = worker.job, None
+                    self._handle_result(job, ok, payload, cpu_seconds)
+                    if not worker.process.is_alive():
+                        # Çöken worker yenisiyle değiştirilir
+                        workers[workers.index(worker)] = self._new_worker()
+
+                self._check_deadlines(time.time())
+                finished = sum(candidate.is_finished for candidate in self._candidates)
+                if finished > n_finished and should_stop is not None and should_stop(self._candidates):
+                    for other in self._candidates:
+                        if not other.is_finished:
+                            self._finish(other, 'cancelled')
+                n_finished = finished
+                self._reap(workers)
+        finally:
+            for worker in workers:
+                worker.stop()
+            if self._store is not None:
+                self._store.cleanup()
+
+        wall_seconds = time.time() - start
+        cpu_seconds = sum(candidate.cpu_seconds for candidate in self._candidates)
+        self.stats = {
+            'core_budget': self.core_budget,
+            # Arama skorlarının yeniden kullanılmasıyla çalıştırılmayan CV fit'leri
+            'fits_saved': sum(candidate.fits_saved for candidate in self._candidates),
+            'wall_seconds': wall_seconds,
+            'cpu_seconds': cpu_seconds,
+            # 1'e yakınsa çekirdekler boş kalmadan kullanılmış demektir
+            'efficiency': cpu_seconds / (wall_seconds * self.core_budget) if wall_seconds > 0 else 0.0
+        }
+        return self._candidates
+
+def _worker_loop(conn, data_paths, memory_limit=None):
+    """Worker süreci: işleri sırayla alır, sonucu (başarılı mı, sonuç, süre) olarak döner"""
+    from threadpoolctl import threadpool_limits
+    # BLAS ve OpenMP havuzları tek thread'e sınırlanır; paralellik süreç sayısıyla sağlanır
+    threadpool_limits(1)
+    if memory_limit is not None:
+        # Sınırı aşan ayırmalar MemoryError verir; tek bir fit makinenin belleğini tüketemez
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+    arrays = {}
+    splits = {}
+
+    def load(name):
+        if name not in arrays:
+            arrays[name] = np.load(data_paths[name], mmap_mode='r')
+        return arrays[name]
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        start = time.process_time()
+        try:
+            result = _run_task(task, load, splits)
+            conn.send((True, result, time.process_time() - start))
+        except Exception as e:
+            conn.send((False, f'{type(e).__name__}: {e}', time.process_time() - start))
+
+def _mean_score(scores):
+    """Denemenin ortalama skoru; tüm fold'lar başarısızsa NaN"""
+    return np.nanmean(scores) if not np.all(np.isnan(scores)) else np.nan
+
+def _as_input(x, columns):
+    return pd.DataFrame(x, columns=columns, copy=False) if columns is not None else x
+
+def _run_task(task, load, splits):
+    estimator = clone(task['estimator']).set_params(**task['params'])
+    columns = task['columns']
+
+    if task['phase'] == 'final':
+        for x_name, y_name in task['final_data']:
+            estimator.fit(_as_input(load(x_name), columns), load(y_name))
+        return {'model': estimator, 'predictions': estimator.predict(_as_input(load('X_test'), columns))}
+
+    x_name, y_name = task['data']
+    x, y = load(x_name), load(y_name)
+    split_key = (x_name, task['n_folds'])
+    if split_key not in splits:
+        # GridSearchCV ve cross_val_score regresyonda cv=int için karıştırmasız KFold kullanır
+        splits[split_key] = list(KFold(n_splits=task['n_folds']).split(x))
+    train_index, test_index = splits[split_key][task['fold']]
+    train_index, test_index = subsample_fold(train_index, test_index, task['n_resources'], task['n_samples'])
+    estimator.fit(_as_input(x[train_index], columns), y[train_index])
+    return float(get_scorer('r2')(estimator, _as_input(x[test_index], columns), y[test_index]))